@@ -1,15 +1,35 @@
 from __future__ import annotations
 
+from typing import Any
+
 from fastapi import APIRouter, Depends
-from sqlalchemy import text
+from fastapi.responses import JSONResponse
 from sqlmodel import Session
 
 from app.core.db import get_session
+from app.services import readiness
 
 router = APIRouter()
 
 
+# The Session dependency is lazy: no pool connection is checked out unless
+# the cached database check has expired and is refreshed.
 @router.get("/health")
-def health(session: Session = Depends(get_session)) -> dict[str, str]:
-    session.exec(text("SELECT 1"))
+def health(session: Session = Depends(get_session)) -> Any:
+    check = readiness.check_database(session)
+    if not check.ok:
+        return JSONResponse(status_code=503, content={"status": "unavailable", "db": "error"})
     return {"status": "ok", "db": "ok"}
+
+
+@router.get("/health/live")
+def health_live() -> dict[str, str]:
+    return {"status": "ok"}
+
+
+@router.get("/health/ready")
+def health_ready(session: Session = Depends(get_session)) -> Any:
+    report = readiness.readiness_report(session)
+    if report["status"] != "ok":
+        return JSONResponse(status_code=503, content=report)
+    return report
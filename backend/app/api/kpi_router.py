@@ -5,10 +5,12 @@ from typing import Any, Dict
 from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlmodel import Session
 
-from app.core.db import get_session
+from app.config.llm_config import LLMCostConfig
+from app.core.db import get_read_session
 from app.repositories import session_repository
 from app.schemas.kpi_edit_ratio_schema import EditRatioItem, EditRatioResponse, EditRatioSummary
-from app.utils.kpi_metrics import compute_edit_ratio_summary
+from app.schemas.kpi_llm_usage_schema import LLMUsageResponse
+from app.utils.kpi_metrics import compute_edit_ratio_summary, compute_llm_usage_summary
 
 router = APIRouter(prefix="/api/v1/kpi", tags=["kpi"])
 
@@ -22,7 +24,7 @@ def _validate_user_id(user_id: Any) -> int:
 @router.get("/edit-ratio", response_model=EditRatioResponse)
 def get_edit_ratio_kpi(
     user_id: int = Query(...),
-    session: Session = Depends(get_session),
+    session: Session = Depends(get_read_session),
 ) -> EditRatioResponse:
     user_id = _validate_user_id(user_id)
     sessions = session_repository.list_phase3_sessions(session, user_id)
@@ -59,3 +61,16 @@ def get_edit_ratio_kpi(
     summary = EditRatioSummary(**summary_dict)
 
     return EditRatioResponse(user_id=user_id, items=items, summary=summary)
+
+
+@router.get("/llm-usage", response_model=LLMUsageResponse)
+def get_llm_usage_kpi(
+    user_id: int = Query(...),
+    phase: int | None = Query(None),
+    session: Session = Depends(get_read_session),
+) -> LLMUsageResponse:
+    user_id = _validate_user_id(user_id)
+    rows = session_repository.list_session_meta(session, user_id)
+    meta_data_list = [meta_data for row_phase, meta_data in rows if phase is None or row_phase == phase]
+    summary = compute_llm_usage_summary(meta_data_list, LLMCostConfig.from_env())
+    return LLMUsageResponse(user_id=user_id, **summary)
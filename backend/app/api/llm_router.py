@@ -0,0 +1,14 @@
+from __future__ import annotations
+
+from typing import Any
+
+from fastapi import APIRouter
+
+from app.llm.scheduler import get_llm_scheduler
+
+router = APIRouter(prefix="/api/v1/llm", tags=["llm"])
+
+
+@router.get("/scheduler")
+def get_llm_scheduler_stats() -> dict[str, Any]:
+    return get_llm_scheduler().snapshot()
@@ -0,0 +1,40 @@
+from __future__ import annotations
+
+from fastapi import APIRouter
+from fastapi.responses import PlainTextResponse
+
+from app.llm.scheduler import get_llm_scheduler
+from app.utils.stage_timer import render_stage_histograms
+
+router = APIRouter(tags=["metrics"])
+
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+def _render_scheduler_gauges() -> str:
+    snapshot = get_llm_scheduler().snapshot()
+    lines = [
+        "# HELP t2ai_llm_in_flight LLM calls currently admitted by the scheduler.",
+        "# TYPE t2ai_llm_in_flight gauge",
+        f"t2ai_llm_in_flight {snapshot['in_flight']}",
+        "# HELP t2ai_llm_queue_depth LLM calls waiting for admission.",
+        "# TYPE t2ai_llm_queue_depth gauge",
+    ]
+    for priority, depth in snapshot["queue_depth_by_priority"].items():
+        lines.append(f't2ai_llm_queue_depth{{priority="{priority}"}} {depth}')
+    lines.extend(
+        [
+            "# HELP t2ai_llm_wait_seconds Time spent waiting for LLM admission.",
+            "# TYPE t2ai_llm_wait_seconds summary",
+        ]
+    )
+    for priority, stats in snapshot["wait_time_by_priority"].items():
+        lines.append(f't2ai_llm_wait_seconds_sum{{priority="{priority}"}} {stats["total_seconds"]!r}')
+        lines.append(f't2ai_llm_wait_seconds_count{{priority="{priority}"}} {stats["count"]}')
+    return "\n".join(lines) + "\n"
+
+
+@router.get("/metrics", response_class=PlainTextResponse)
+def get_metrics() -> PlainTextResponse:
+    body = render_stage_histograms() + _render_scheduler_gauges()
+    return PlainTextResponse(body, media_type=PROMETHEUS_CONTENT_TYPE)
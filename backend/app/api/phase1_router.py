@@ -4,7 +4,7 @@ from typing import Any
 
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Request, Response
 from sqlmodel import Session
 
 from app.core.db import get_session
@@ -20,7 +20,10 @@ from app.schemas.phase1_schema import (
     Phase1SessionCreateRequest,
     Phase1SessionCreateResponse,
 )
-from app.services import phase1_chat_service, phase1_goal_service, phase1_service
+from app.schemas.session_turns_schema import SessionTurnsResponse
+from app.services import phase1_chat_service, phase1_goal_service, phase1_service, session_log_service
+from app.services.turn_coalescer import MAX_IDEMPOTENCY_KEY_LENGTH
+from app.utils.disconnect import CLIENT_CLOSED_REQUEST, ClientDisconnectedError, cancel_on_disconnect
 
 router = APIRouter(prefix="/api/v1/phase1", tags=["phase1"])
 
@@ -54,22 +57,36 @@ def create_phase1_session(
 async def add_phase1_chat_turn(
     session_id: UUID,
     payload: Phase1ChatTurnRequest,
+    request: Request,
+    idempotency_key: str | None = Header(default=None, max_length=MAX_IDEMPOTENCY_KEY_LENGTH),
     session: Session = Depends(get_session),
 ) -> Phase1ChatTurnResponse:
     try:
-        assistant_message, turn_index, emergency = await phase1_chat_service.append_phase1_turn(
-            session=session,
-            session_id=session_id,
-            message=payload.message,
+        assistant_message, turn_index, emergency = await cancel_on_disconnect(
+            request.receive,
+            phase1_chat_service.append_phase1_turn(
+                session=session,
+                session_id=session_id,
+                message=payload.message,
+                idempotency_key=idempotency_key,
+            ),
         )
+    except ClientDisconnectedError as exc:
+        raise HTTPException(status_code=CLIENT_CLOSED_REQUEST, detail=str(exc)) from exc
     except phase1_chat_service.InvalidMessageError as exc:
         raise HTTPException(status_code=400, detail=str(exc)) from exc
+    except phase1_chat_service.IdempotencyKeyReuseError as exc:
+        raise HTTPException(status_code=422, detail=str(exc)) from exc
     except phase1_chat_service.SessionNotFoundError as exc:
         raise HTTPException(status_code=404, detail=str(exc)) from exc
     except phase1_chat_service.PhaseMismatchError as exc:
         raise HTTPException(status_code=400, detail=str(exc)) from exc
+    except phase1_chat_service.LLMUnavailableError as exc:
+        raise HTTPException(status_code=503, detail=str(exc)) from exc
     except phase1_chat_service.LLMGenerateError as exc:
         raise HTTPException(status_code=500, detail=str(exc)) from exc
+    except phase1_chat_service.SessionConflictError as exc:
+        raise HTTPException(status_code=409, detail=str(exc)) from exc
     except phase1_chat_service.SessionUpdateError as exc:
         raise HTTPException(status_code=500, detail=str(exc)) from exc
 
@@ -81,6 +98,32 @@ async def add_phase1_chat_turn(
     )
 
 
+@router.get("/session/{session_id}/turns", response_model=SessionTurnsResponse)
+def get_phase1_turns(
+    session_id: UUID,
+    response: Response,
+    after: int | None = Query(None, ge=0),
+    limit: int = Query(
+        session_log_service.DEFAULT_TURNS_PAGE_SIZE, ge=1, le=session_log_service.MAX_TURNS_PAGE_SIZE
+    ),
+    if_none_match: str | None = Header(default=None),
+    session: Session = Depends(get_session),
+) -> SessionTurnsResponse | Response:
+    try:
+        etag = session_log_service.current_turns_etag(session, session_id, 1, after, limit)
+        headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
+        if session_log_service.etag_matches(if_none_match, etag):
+            return Response(status_code=304, headers=headers)
+        body, etag = session_log_service.get_turns(session, session_id, 1, after, limit)
+    except session_log_service.SessionNotFoundError as exc:
+        raise HTTPException(status_code=404, detail=str(exc)) from exc
+    except session_log_service.PhaseMismatchError as exc:
+        raise HTTPException(status_code=400, detail=str(exc)) from exc
+
+    response.headers.update({"ETag": etag, "Cache-Control": "private, no-cache"})
+    return body
+
+
 @router.post("/session/{session_id}/confirm", response_model=Phase1GoalConfirmResponse)
 def confirm_phase1_goal(
     session_id: UUID,
@@ -4,7 +4,7 @@ from typing import Any
 
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Request, Response
 from sqlmodel import Session
 
 from app.core.db import get_session
@@ -17,7 +17,10 @@ from app.schemas.phase3_report_schema import (
     Phase3ReportFinalSaveResponse,
 )
 from app.schemas.phase3_schema import Phase3SessionCreateRequest, Phase3SessionCreateResponse
-from app.services import phase3_chat_service, phase3_report_service, phase3_service
+from app.schemas.session_turns_schema import SessionTurnsResponse
+from app.services import phase3_chat_service, phase3_report_service, phase3_service, session_log_service
+from app.services.turn_coalescer import MAX_IDEMPOTENCY_KEY_LENGTH
+from app.utils.disconnect import CLIENT_CLOSED_REQUEST, ClientDisconnectedError, cancel_on_disconnect
 
 router = APIRouter(prefix="/api/v1/phase3", tags=["phase3"])
 
@@ -52,24 +55,38 @@ def create_phase3_session(
 async def add_phase3_chat_turn(
     session_id: UUID,
     payload: Phase3ChatTurnRequest,
+    request: Request,
+    idempotency_key: str | None = Header(default=None, max_length=MAX_IDEMPOTENCY_KEY_LENGTH),
     session: Session = Depends(get_session),
 ) -> Phase3ChatTurnResponse:
     try:
-        assistant_message, turn_index, emergency = await phase3_chat_service.append_phase3_turn(
-            session=session,
-            session_id=session_id,
-            message=payload.message,
+        assistant_message, turn_index, emergency = await cancel_on_disconnect(
+            request.receive,
+            phase3_chat_service.append_phase3_turn(
+                session=session,
+                session_id=session_id,
+                message=payload.message,
+                idempotency_key=idempotency_key,
+            ),
         )
+    except ClientDisconnectedError as exc:
+        raise HTTPException(status_code=CLIENT_CLOSED_REQUEST, detail=str(exc)) from exc
     except phase3_chat_service.InvalidMessageError as exc:
         raise HTTPException(status_code=400, detail=str(exc)) from exc
+    except phase3_chat_service.IdempotencyKeyReuseError as exc:
+        raise HTTPException(status_code=422, detail=str(exc)) from exc
     except phase3_chat_service.SessionNotFoundError as exc:
         raise HTTPException(status_code=404, detail=str(exc)) from exc
     except phase3_chat_service.PhaseMismatchError as exc:
         raise HTTPException(status_code=400, detail=str(exc)) from exc
     except phase3_chat_service.InvalidSessionLogError as exc:
         raise HTTPException(status_code=400, detail=str(exc)) from exc
+    except phase3_chat_service.LLMUnavailableError as exc:
+        raise HTTPException(status_code=503, detail=str(exc)) from exc
     except phase3_chat_service.LLMGenerateError as exc:
         raise HTTPException(status_code=500, detail=str(exc)) from exc
+    except phase3_chat_service.SessionConflictError as exc:
+        raise HTTPException(status_code=409, detail=str(exc)) from exc
     except phase3_chat_service.SessionUpdateError as exc:
         raise HTTPException(status_code=500, detail=str(exc)) from exc
 
@@ -81,16 +98,48 @@ async def add_phase3_chat_turn(
     )
 
 
+@router.get("/session/{session_id}/turns", response_model=SessionTurnsResponse)
+def get_phase3_turns(
+    session_id: UUID,
+    response: Response,
+    after: int | None = Query(None, ge=0),
+    limit: int = Query(
+        session_log_service.DEFAULT_TURNS_PAGE_SIZE, ge=1, le=session_log_service.MAX_TURNS_PAGE_SIZE
+    ),
+    if_none_match: str | None = Header(default=None),
+    session: Session = Depends(get_session),
+) -> SessionTurnsResponse | Response:
+    try:
+        etag = session_log_service.current_turns_etag(session, session_id, 3, after, limit)
+        headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
+        if session_log_service.etag_matches(if_none_match, etag):
+            return Response(status_code=304, headers=headers)
+        body, etag = session_log_service.get_turns(session, session_id, 3, after, limit)
+    except session_log_service.SessionNotFoundError as exc:
+        raise HTTPException(status_code=404, detail=str(exc)) from exc
+    except session_log_service.PhaseMismatchError as exc:
+        raise HTTPException(status_code=400, detail=str(exc)) from exc
+
+    response.headers.update({"ETag": etag, "Cache-Control": "private, no-cache"})
+    return body
+
+
 @router.post("/session/{session_id}/report/draft")
 async def generate_phase3_report_draft(
     session_id: UUID,
+    request: Request,
     session: Session = Depends(get_session),
 ) -> dict[str, object]:
     try:
-        report_draft = await phase3_report_service.generate_phase3_report_draft(
-            session=session,
-            session_id=session_id,
+        report_draft = await cancel_on_disconnect(
+            request.receive,
+            phase3_report_service.generate_phase3_report_draft(
+                session=session,
+                session_id=session_id,
+            ),
         )
+    except ClientDisconnectedError as exc:
+        raise HTTPException(status_code=CLIENT_CLOSED_REQUEST, detail=str(exc)) from exc
     except phase3_report_service.SessionNotFoundError as exc:
         raise HTTPException(status_code=404, detail=str(exc)) from exc
     except phase3_report_service.PhaseMismatchError as exc:
@@ -99,8 +148,12 @@ async def generate_phase3_report_draft(
         raise HTTPException(status_code=400, detail=str(exc)) from exc
     except phase3_report_service.PromptLoadError as exc:
         raise HTTPException(status_code=500, detail=str(exc)) from exc
+    except phase3_report_service.LLMUnavailableError as exc:
+        raise HTTPException(status_code=503, detail=str(exc)) from exc
     except phase3_report_service.LLMGenerateError as exc:
         raise HTTPException(status_code=500, detail=str(exc)) from exc
+    except phase3_report_service.SessionConflictError as exc:
+        raise HTTPException(status_code=409, detail=str(exc)) from exc
     except phase3_report_service.SessionUpdateError as exc:
         raise HTTPException(status_code=500, detail=str(exc)) from exc
 
@@ -132,6 +185,8 @@ def save_phase3_report_final(
         raise HTTPException(status_code=404, detail=str(exc)) from exc
     except phase3_report_service.PhaseMismatchError as exc:
         raise HTTPException(status_code=400, detail=str(exc)) from exc
+    except phase3_report_service.SessionConflictError as exc:
+        raise HTTPException(status_code=409, detail=str(exc)) from exc
     except phase3_report_service.SessionUpdateError as exc:
         raise HTTPException(status_code=500, detail=str(exc)) from exc
 
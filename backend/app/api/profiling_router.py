@@ -0,0 +1,50 @@
+from __future__ import annotations
+
+import hmac
+
+from fastapi import APIRouter, Depends, Header, HTTPException
+from fastapi.responses import FileResponse
+
+from app.config.profiling_config import ProfilingConfig
+from app.utils.request_profiler import ProfileStore
+
+router = APIRouter(prefix="/api/v1/admin/profiles", tags=["admin"])
+
+
+def get_profiling_config() -> ProfilingConfig:
+    return ProfilingConfig.from_env()
+
+
+def _get_store(
+    config: ProfilingConfig = Depends(get_profiling_config),
+    x_admin_token: str | None = Header(default=None),
+) -> ProfileStore:
+    # Profiles expose code paths and timings: without a configured token nobody may read them.
+    if not config.admin_token:
+        raise HTTPException(status_code=403, detail="profile access is disabled (PROFILING_ADMIN_TOKEN is not set)")
+    if not hmac.compare_digest(x_admin_token or "", config.admin_token):
+        raise HTTPException(status_code=403, detail="invalid admin token")
+    return ProfileStore(config.directory, config.max_files)
+
+
+@router.get("")
+def list_profiles(store: ProfileStore = Depends(_get_store)) -> dict[str, list[dict]]:
+    return {
+        "items": [
+            {
+                "name": item.name,
+                "size": item.size,
+                "created_at": item.created_at.isoformat(),
+                "kind": item.kind,
+            }
+            for item in store.list()
+        ]
+    }
+
+
+@router.get("/{name}")
+def download_profile(name: str, store: ProfileStore = Depends(_get_store)) -> FileResponse:
+    target = store.resolve(name)
+    if target is None:
+        raise HTTPException(status_code=404, detail="profile not found")
+    return FileResponse(target, media_type="application/octet-stream", filename=name)
@@ -0,0 +1,80 @@
+from __future__ import annotations
+
+import base64
+import binascii
+import hashlib
+import json
+from datetime import date, datetime
+from typing import Any
+from uuid import UUID
+
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Response
+from sqlmodel import Session
+
+from app.core.db import get_read_session
+from app.repositories import session_repository
+from app.schemas.session_list_schema import SessionListResponse, SessionSummary
+
+router = APIRouter(prefix="/api/v1/sessions", tags=["sessions"])
+
+DEFAULT_PAGE_SIZE = 20
+MAX_PAGE_SIZE = 100
+
+
+def _validate_user_id(user_id: Any) -> int:
+    if not isinstance(user_id, int) or isinstance(user_id, bool):
+        raise HTTPException(status_code=400, detail="user_id must be an integer")
+    return user_id
+
+
+def encode_cursor(session_date: date, created_at: datetime, session_id: UUID) -> str:
+    raw = json.dumps([session_date.isoformat(), created_at.isoformat(), session_id.hex], separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple[date, datetime, UUID]:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        session_date, created_at, session_id = json.loads(raw)
+        return date.fromisoformat(session_date), datetime.fromisoformat(created_at), UUID(session_id)
+    except (binascii.Error, UnicodeDecodeError, TypeError, ValueError) as exc:
+        raise HTTPException(status_code=400, detail="invalid cursor") from exc
+
+
+def _etag(body: SessionListResponse) -> str:
+    digest = hashlib.sha256(body.model_dump_json().encode("utf-8")).hexdigest()[:32]
+    return f'W/"{digest}"'
+
+
+@router.get("", response_model=SessionListResponse)
+def list_sessions(
+    response: Response,
+    user_id: int = Query(...),
+    phase: int | None = Query(None),
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: str | None = Query(None),
+    if_none_match: str | None = Header(default=None),
+    session: Session = Depends(get_read_session),
+) -> SessionListResponse | Response:
+    user_id = _validate_user_id(user_id)
+    before = decode_cursor(cursor) if cursor else None
+
+    page, has_more = session_repository.list_session_summaries(
+        session, user_id, phase=phase, before=before, limit=limit
+    )
+    next_cursor = None
+    if has_more:
+        last = page[-1]
+        next_cursor = encode_cursor(last["session_date"], last["created_at"], last["id"])
+
+    body = SessionListResponse(
+        user_id=user_id,
+        items=[SessionSummary(**row) for row in page],
+        next_cursor=next_cursor,
+    )
+    etag = _etag(body)
+    headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
+    if if_none_match is not None and etag in {tag.strip() for tag in if_none_match.split(",")}:
+        return Response(status_code=304, headers=headers)
+    response.headers.update(headers)
+    return body
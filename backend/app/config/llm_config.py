@@ -10,21 +10,152 @@ class LLMConfig:
     model: str = "mock-v1"
     temperature: float = 0.7
     max_tokens: int = 2048
+    request_timeout: float = 30.0
 
     @classmethod
     def from_env(cls) -> "LLMConfig":
-        provider = os.getenv("LLM_PROVIDER", cls.provider)
-        model = os.getenv("LLM_MODEL", cls.model)
-        temperature = _parse_float(os.getenv("LLM_TEMPERATURE"), cls.temperature)
-        max_tokens = _parse_int(os.getenv("LLM_MAX_TOKENS"), cls.max_tokens)
+        defaults = cls()
+        provider = os.getenv("LLM_PROVIDER", defaults.provider)
+        model = os.getenv("LLM_MODEL", defaults.model)
+        temperature = _parse_float(os.getenv("LLM_TEMPERATURE"), defaults.temperature)
+        max_tokens = _parse_int(os.getenv("LLM_MAX_TOKENS"), defaults.max_tokens)
+        request_timeout = _parse_float(os.getenv("LLM_TIMEOUT_SECONDS"), defaults.request_timeout)
         return cls(
             provider=provider,
             model=model,
             temperature=temperature,
             max_tokens=max_tokens,
+            request_timeout=request_timeout,
         )
 
 
+@dataclass(slots=True)
+class LLMSchedulerConfig:
+    max_concurrency: int = 8
+    max_concurrency_per_user: int = 2
+    requests_per_minute: int = 0
+    tokens_per_minute: int = 0
+
+    @classmethod
+    def from_env(cls) -> "LLMSchedulerConfig":
+        defaults = cls()
+        max_concurrency = _parse_int(os.getenv("LLM_MAX_CONCURRENCY"), defaults.max_concurrency)
+        max_concurrency_per_user = _parse_int(
+            os.getenv("LLM_MAX_CONCURRENCY_PER_USER"),
+            defaults.max_concurrency_per_user,
+        )
+        requests_per_minute = _parse_int(os.getenv("LLM_RPM"), defaults.requests_per_minute)
+        tokens_per_minute = _parse_int(os.getenv("LLM_TPM"), defaults.tokens_per_minute)
+        return cls(
+            max_concurrency=max(1, max_concurrency),
+            max_concurrency_per_user=max(1, max_concurrency_per_user),
+            requests_per_minute=max(0, requests_per_minute),
+            tokens_per_minute=max(0, tokens_per_minute),
+        )
+
+
+@dataclass(slots=True)
+class LLMResilienceConfig:
+    attempt_timeout: float = 30.0
+    max_attempts: int = 3
+    backoff_base: float = 0.25
+    backoff_max: float = 4.0
+    hedge_enabled: bool = False
+    hedge_after: float | None = None
+    hedge_min_samples: int = 20
+    breaker_failure_threshold: int = 5
+    breaker_reset_timeout: float = 30.0
+
+    @classmethod
+    def from_env(cls) -> "LLMResilienceConfig":
+        defaults = cls()
+        hedge_after_ms = os.getenv("LLM_HEDGE_AFTER_MS")
+        hedge_after = _parse_float(hedge_after_ms, 0.0) / 1000 if hedge_after_ms else None
+        return cls(
+            attempt_timeout=_parse_float(os.getenv("LLM_ATTEMPT_TIMEOUT_SECONDS"), defaults.attempt_timeout),
+            max_attempts=max(1, _parse_int(os.getenv("LLM_MAX_ATTEMPTS"), defaults.max_attempts)),
+            backoff_base=_parse_float(os.getenv("LLM_BACKOFF_BASE_SECONDS"), defaults.backoff_base),
+            backoff_max=_parse_float(os.getenv("LLM_BACKOFF_MAX_SECONDS"), defaults.backoff_max),
+            hedge_enabled=_parse_bool(os.getenv("LLM_HEDGE"), defaults.hedge_enabled),
+            hedge_after=hedge_after or None,
+            hedge_min_samples=_parse_int(os.getenv("LLM_HEDGE_MIN_SAMPLES"), defaults.hedge_min_samples),
+            breaker_failure_threshold=max(
+                1,
+                _parse_int(os.getenv("LLM_BREAKER_THRESHOLD"), defaults.breaker_failure_threshold),
+            ),
+            breaker_reset_timeout=_parse_float(
+                os.getenv("LLM_BREAKER_RESET_SECONDS"),
+                defaults.breaker_reset_timeout,
+            ),
+        )
+
+
+MOCK_LATENCY_PROFILES = ("none", "fixed", "normal", "longtail")
+
+
+@dataclass(slots=True)
+class MockLLMProfile:
+    latency: str = "none"
+    latency_ms: float = 0.0
+    latency_stddev_ms: float = 0.0
+    tail_sigma: float = 0.75
+    tokens_per_second: float = 0.0
+    response_tokens: int = 0
+    error_rate: float = 0.0
+    seed: int | None = None
+
+    def __post_init__(self) -> None:
+        if self.latency not in MOCK_LATENCY_PROFILES:
+            raise ValueError(
+                f"Unknown LLM_MOCK_LATENCY {self.latency!r}; expected one of {', '.join(MOCK_LATENCY_PROFILES)}"
+            )
+
+    @classmethod
+    def from_env(cls) -> "MockLLMProfile":
+        defaults = cls()
+        seed = os.getenv("LLM_MOCK_SEED")
+        return cls(
+            latency=(os.getenv("LLM_MOCK_LATENCY") or defaults.latency).strip().lower(),
+            latency_ms=max(0.0, _parse_float(os.getenv("LLM_MOCK_LATENCY_MS"), defaults.latency_ms)),
+            latency_stddev_ms=max(
+                0.0,
+                _parse_float(os.getenv("LLM_MOCK_LATENCY_STDDEV_MS"), defaults.latency_stddev_ms),
+            ),
+            tail_sigma=max(0.0, _parse_float(os.getenv("LLM_MOCK_TAIL_SIGMA"), defaults.tail_sigma)),
+            tokens_per_second=max(
+                0.0,
+                _parse_float(os.getenv("LLM_MOCK_TOKENS_PER_SECOND"), defaults.tokens_per_second),
+            ),
+            response_tokens=max(0, _parse_int(os.getenv("LLM_MOCK_RESPONSE_TOKENS"), defaults.response_tokens)),
+            error_rate=min(1.0, max(0.0, _parse_float(os.getenv("LLM_MOCK_ERROR_RATE"), defaults.error_rate))),
+            seed=_parse_int(seed, 0) if seed else None,
+        )
+
+
+@dataclass(slots=True)
+class LLMCostConfig:
+    """Prices per 1K tokens used to estimate LLM spend in KPIs."""
+
+    prompt_per_1k: float = 0.0
+    completion_per_1k: float = 0.0
+    currency: str = "USD"
+
+    @classmethod
+    def from_env(cls) -> "LLMCostConfig":
+        defaults = cls()
+        return cls(
+            prompt_per_1k=max(0.0, _parse_float(os.getenv("LLM_COST_PROMPT_PER_1K"), defaults.prompt_per_1k)),
+            completion_per_1k=max(
+                0.0,
+                _parse_float(os.getenv("LLM_COST_COMPLETION_PER_1K"), defaults.completion_per_1k),
+            ),
+            currency=os.getenv("LLM_COST_CURRENCY", defaults.currency),
+        )
+
+    def cost(self, prompt_tokens: int, completion_tokens: int) -> float:
+        return prompt_tokens / 1000 * self.prompt_per_1k + completion_tokens / 1000 * self.completion_per_1k
+
+
 def _parse_float(value: str | None, default: float) -> float:
     if value is None:
         return default
@@ -41,3 +172,14 @@ def _parse_int(value: str | None, default: int) -> int:
         return int(value)
     except (TypeError, ValueError):
         return default
+
+
+def _parse_bool(value: str | None, default: bool) -> bool:
+    if value is None:
+        return default
+    normalized = value.strip().lower()
+    if normalized in {"1", "true", "yes", "on"}:
+        return True
+    if normalized in {"0", "false", "no", "off"}:
+        return False
+    return default
@@ -0,0 +1,44 @@
+from __future__ import annotations
+
+import os
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from app.config.llm_config import _parse_bool, _parse_float, _parse_int
+
+DEFAULT_PROFILE_DIR = Path(__file__).resolve().parents[2] / "profiles"
+DEFAULT_PATH_PREFIXES = ("/api/v1/phase1", "/api/v1/phase3", "/api/v1/kpi")
+
+
+@dataclass(slots=True)
+class ProfilingConfig:
+    enabled: bool = False
+    sample_rate: float = 0.0
+    slow_threshold_ms: float = 1000.0
+    sampler_interval_ms: float = 10.0
+    directory: Path = DEFAULT_PROFILE_DIR
+    max_files: int = 200
+    path_prefixes: tuple[str, ...] = field(default=DEFAULT_PATH_PREFIXES)
+    admin_token: str | None = None
+
+    @classmethod
+    def from_env(cls) -> "ProfilingConfig":
+        defaults = cls()
+        prefixes = os.getenv("PROFILING_PATH_PREFIXES")
+        return cls(
+            enabled=_parse_bool(os.getenv("PROFILING_ENABLED"), defaults.enabled),
+            sample_rate=min(1.0, max(0.0, _parse_float(os.getenv("PROFILING_SAMPLE_RATE"), defaults.sample_rate))),
+            slow_threshold_ms=max(0.0, _parse_float(os.getenv("PROFILING_SLOW_MS"), defaults.slow_threshold_ms)),
+            sampler_interval_ms=max(
+                1.0,
+                _parse_float(os.getenv("PROFILING_SAMPLER_INTERVAL_MS"), defaults.sampler_interval_ms),
+            ),
+            directory=Path(os.getenv("PROFILING_DIR") or defaults.directory),
+            max_files=max(1, _parse_int(os.getenv("PROFILING_MAX_FILES"), defaults.max_files)),
+            path_prefixes=(
+                tuple(prefix.strip() for prefix in prefixes.split(",") if prefix.strip())
+                if prefixes
+                else defaults.path_prefixes
+            ),
+            admin_token=os.getenv("PROFILING_ADMIN_TOKEN") or None,
+        )
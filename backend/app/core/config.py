@@ -7,3 +7,57 @@ BASE_DIR = Path(__file__).resolve().parents[2]
 DEFAULT_SQLITE_PATH = BASE_DIR / "app.db"
 
 DATABASE_URL = os.getenv("DATABASE_URL", f"sqlite:///{DEFAULT_SQLITE_PATH}")
+
+
+def _env_flag(name: str, default: bool = False) -> bool:
+    value = os.getenv(name)
+    if value is None:
+        return default
+    return value.strip().lower() in {"1", "true", "yes", "on"}
+
+
+# Optional read-only database for KPI and session-list queries (e.g. a replica); empty uses DATABASE_URL.
+DATABASE_READ_URL = os.getenv("DATABASE_READ_URL", "")
+# Without DATABASE_READ_URL on a SQLite file: serve those reads from a separate mode=ro pool (database in WAL mode).
+SQLITE_READ_POOL = _env_flag("SQLITE_READ_POOL")
+
+# Persist per-turn stage timings into sessions.meta_data["stage_timings"].
+STAGE_TIMINGS_IN_META = _env_flag("STAGE_TIMINGS_IN_META")
+STAGE_TIMINGS_MAX_ENTRIES = int(os.getenv("STAGE_TIMINGS_MAX_ENTRIES", "50"))
+
+# Most recent LLM calls kept in sessions.meta_data["llm_usage"] (totals are kept separately).
+LLM_USAGE_MAX_ENTRIES = int(os.getenv("LLM_USAGE_MAX_ENTRIES", "100"))
+
+# Active goal cache lifetime; 0 disables the cache.
+GOAL_CACHE_TTL_SECONDS = float(os.getenv("GOAL_CACHE_TTL_SECONDS", "30"))
+
+# Optional compression of sessions.log_json / report text: "none" (default), "zlib" or "zstd".
+DB_COMPRESSION = os.getenv("DB_COMPRESSION", "none")
+DB_COMPRESSION_MIN_BYTES = int(os.getenv("DB_COMPRESSION_MIN_BYTES", "1024"))
+
+# Resolved system prompts kept in memory per database (LRU); 0 disables the cache.
+SYSTEM_PROMPT_CACHE_SIZE = int(os.getenv("SYSTEM_PROMPT_CACHE_SIZE", "256"))
+
+# Cancelled (client disconnected) pipeline runs kept in sessions.meta_data["cancellations"].
+CANCELLATIONS_MAX_ENTRIES = int(os.getenv("CANCELLATIONS_MAX_ENTRIES", "20"))
+
+# Attempts for versioned session writes before giving up with a conflict (409).
+SESSION_WRITE_MAX_ATTEMPTS = int(os.getenv("SESSION_WRITE_MAX_ATTEMPTS", "3"))
+
+# Chat turns sent with an Idempotency-Key: how long the response is replayed to retries, and how many are kept.
+IDEMPOTENCY_TTL_SECONDS = float(os.getenv("IDEMPOTENCY_TTL_SECONDS", "300"))
+IDEMPOTENCY_CACHE_MAX_ENTRIES = int(os.getenv("IDEMPOTENCY_CACHE_MAX_ENTRIES", "1024"))
+
+# Compress responses of at least RESPONSE_COMPRESSION_MIN_BYTES (br if the brotli package is installed, else gzip).
+RESPONSE_COMPRESSION = _env_flag("RESPONSE_COMPRESSION", default=True)
+RESPONSE_COMPRESSION_MIN_BYTES = int(os.getenv("RESPONSE_COMPRESSION_MIN_BYTES", "1024"))
+RESPONSE_GZIP_LEVEL = int(os.getenv("RESPONSE_GZIP_LEVEL", "6"))
+RESPONSE_BROTLI_QUALITY = int(os.getenv("RESPONSE_BROTLI_QUALITY", "4"))
+
+# /health and /health/ready reuse the last database check for this long; /health/live does no I/O.
+HEALTH_READY_CACHE_SECONDS = float(os.getenv("HEALTH_READY_CACHE_SECONDS", "2"))
+
+# Queue non-critical meta_data timestamps (report_final_saved_at) and patch them in batches.
+META_WRITE_BEHIND = _env_flag("META_WRITE_BEHIND")
+META_WRITE_BEHIND_FLUSH_SECONDS = float(os.getenv("META_WRITE_BEHIND_FLUSH_SECONDS", "1.0"))
+META_WRITE_BEHIND_MAX_PENDING = int(os.getenv("META_WRITE_BEHIND_MAX_PENDING", "500"))
@@ -1,16 +1,83 @@
 from __future__ import annotations
 
+from typing import Any
+from urllib.parse import quote
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine, make_url
 from sqlmodel import Session, create_engine
 
-from app.core.config import DATABASE_URL
+from app.core.config import DATABASE_READ_URL, DATABASE_URL, SQLITE_READ_POOL
+
+
+def _connect_args(url: str) -> dict[str, Any]:
+    if url.startswith("sqlite"):
+        return {"check_same_thread": False}
+    return {}
+
+
+def _sqlite_file(url: str) -> str | None:
+    parsed = make_url(url)
+    if parsed.get_backend_name() != "sqlite" or parsed.database in (None, "", ":memory:"):
+        return None
+    if parsed.query.get("uri") or parsed.database.startswith("file:"):
+        return None
+    return parsed.database
+
+
+def read_engine_url(database_url: str, read_url: str = "", sqlite_read_pool: bool = False) -> str | None:
+    """URL of the read-only engine, or None when reads share the write engine.
+
+    ``read_url`` wins; otherwise a file-backed SQLite ``database_url`` gets a
+    ``mode=ro`` URI when ``sqlite_read_pool`` is set.
+    """
+
+    if read_url:
+        return read_url
+    if not sqlite_read_pool:
+        return None
+    path = _sqlite_file(database_url)
+    if path is None:
+        return None
+    return f"sqlite:///file:{quote(path)}?mode=ro&uri=true"
+
 
-connect_args: dict[str, bool] = {}
-if DATABASE_URL.startswith("sqlite"):
-    connect_args = {"check_same_thread": False}
+def enable_sqlite_wal(engine: Engine) -> None:
+    """Put every new connection of ``engine`` in WAL mode so readers and the writer do not block each other."""
 
-engine = create_engine(DATABASE_URL, echo=False, connect_args=connect_args)
+    @event.listens_for(engine, "connect")
+    def _set_wal(dbapi_connection: Any, _connection_record: Any) -> None:
+        cursor = dbapi_connection.cursor()
+        try:
+            cursor.execute("PRAGMA journal_mode=WAL")
+        finally:
+            cursor.close()
+
+
+def build_read_engine(url: str | None) -> Engine | None:
+    if url is None:
+        return None
+    return create_engine(url, echo=False, connect_args=_connect_args(url))
+
+
+engine = create_engine(DATABASE_URL, echo=False, connect_args=_connect_args(DATABASE_URL))
+
+_read_url = read_engine_url(DATABASE_URL, DATABASE_READ_URL, SQLITE_READ_POOL)
+if _read_url is not None and not DATABASE_READ_URL:
+    enable_sqlite_wal(engine)
+read_engine = build_read_engine(_read_url)
 
 
 def get_session():
     with Session(engine) as session:
         yield session
+
+
+def _get_read_only_session():
+    with Session(read_engine) as session:
+        yield session
+
+
+# Read-only traffic (KPIs, session lists). Without a read engine this is get_session itself,
+# so reads share the write pool and dependency overrides of get_session keep applying.
+get_read_session = get_session if read_engine is None else _get_read_only_session
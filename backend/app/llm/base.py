@@ -1,44 +1,191 @@
 from __future__ import annotations
 
+import asyncio
+import time
 from abc import ABC, abstractmethod
+from contextvars import ContextVar
+from dataclasses import dataclass, field
 from functools import wraps
-from typing import Any, Awaitable, Callable, TypeVar
+from typing import Any, AsyncIterator, Awaitable, Callable, Sequence, TypeVar
 
 from app.config.llm_config import LLMConfig
-from app.services.llm_metadata_builder import build_llm_metadata
+from app.services.llm_metadata_builder import build_llm_metadata, build_llm_usage
 
 
 class LLMClientError(Exception):
     """Base error for LLM client failures."""
 
 
-class LLMTimeoutError(LLMClientError):
+class LLMRetryableError(LLMClientError):
+    """Raised for transient LLM failures that are safe to retry."""
+
+
+class LLMTimeoutError(LLMRetryableError):
     """Raised when an LLM request times out."""
 
 
+class LLMRateLimitError(LLMRetryableError):
+    """Raised when the provider rejects a request due to rate limits."""
+
+
+class LLMCircuitOpenError(LLMClientError):
+    """Raised when the circuit breaker is open and calls are short-circuited."""
+
+
+@dataclass(slots=True)
+class LLMRequest:
+    system_prompt: str
+    user_prompt: str
+    options: dict[str, Any] = field(default_factory=dict)
+
+
+@dataclass(slots=True)
+class LLMResult:
+    """Text plus per-call metadata returned by ``BaseLLMClient.generate_result``."""
+
+    text: str
+    meta_data: dict[str, Any] = field(default_factory=dict)
+
+    @property
+    def timings(self) -> dict[str, float | None]:
+        return {"latency_ms": self.meta_data.get("latency_ms"), "ttft_ms": self.meta_data.get("ttft_ms")}
+
+    @property
+    def usage(self) -> dict[str, Any]:
+        return {
+            "prompt_tokens": self.meta_data.get("prompt_tokens"),
+            "completion_tokens": self.meta_data.get("completion_tokens"),
+            "total_tokens": self.meta_data.get("total_tokens"),
+            "usage_source": self.meta_data.get("usage_source"),
+        }
+
+
+DEFAULT_BATCH_CONCURRENCY = 4
+
+# Provider-reported token usage for the outermost generate()/stream() call in
+# flight. Nested clients (e.g. ResilientLLMClient -> provider) share the holder.
+_usage_holder: ContextVar[dict[str, int] | None] = ContextVar("llm_usage_holder", default=None)
+
+
+def report_usage(prompt_tokens: int | None, completion_tokens: int | None) -> None:
+    """Record token usage returned by the provider for the current call."""
+
+    holder = _usage_holder.get()
+    if holder is None:
+        return
+    if prompt_tokens is not None:
+        holder["prompt_tokens"] = int(prompt_tokens)
+    if completion_tokens is not None:
+        holder["completion_tokens"] = int(completion_tokens)
+
+
+def _enter_usage_scope():
+    holder = _usage_holder.get()
+    if holder is not None:
+        return holder, None
+    holder = {}
+    return holder, _usage_holder.set(holder)
+
+
+def _exit_usage_scope(token) -> None:
+    if token is None:
+        return
+    try:
+        _usage_holder.reset(token)
+    except ValueError:
+        # An async generator closed from another context (e.g. by GC) cannot reset.
+        pass
+
+
 GenerateCallable = TypeVar("GenerateCallable", bound=Callable[..., Awaitable[str]])
 
 
+async def _generate_with_metadata(
+    client: "BaseLLMClient",
+    original_generate: Callable[..., Awaitable[str]],
+    system_prompt: str,
+    user_prompt: str,
+    kwargs: dict[str, Any],
+) -> LLMResult:
+    config = getattr(client, "config", None) or LLMConfig()
+    meta_data = build_llm_metadata(config, system_prompt, extra=kwargs.get("meta_data"))
+    holder, token = _enter_usage_scope()
+    started_at = time.perf_counter()
+    try:
+        response = await original_generate(client, system_prompt, user_prompt, **kwargs)
+    finally:
+        _exit_usage_scope(token)
+    meta_data.update(
+        build_llm_usage(
+            system_prompt,
+            user_prompt,
+            response,
+            latency_seconds=time.perf_counter() - started_at,
+            provider_usage=holder,
+        )
+    )
+    return LLMResult(text=response, meta_data=meta_data)
+
+
+def _wrap_generate(original_generate):
+    @wraps(original_generate)
+    async def _wrapped_generate(self, system_prompt: str, user_prompt: str, **kwargs):
+        result = await _generate_with_metadata(self, original_generate, system_prompt, user_prompt, kwargs)
+        self.last_meta_data = result.meta_data
+        return result.text
+
+    _wrapped_generate._metadata_wrapped = True  # type: ignore[attr-defined]
+    return _wrapped_generate
+
+
+def _wrap_stream(original_stream):
+    @wraps(original_stream)
+    async def _wrapped_stream(self, system_prompt: str, user_prompt: str, **kwargs):
+        config = getattr(self, "config", None) or LLMConfig()
+        meta_data = build_llm_metadata(config, system_prompt, extra=kwargs.get("meta_data"))
+        self.last_meta_data = meta_data
+        holder, token = _enter_usage_scope()
+        started_at = time.perf_counter()
+        first_chunk_at: float | None = None
+        chunks: list[str] = []
+        try:
+            async for chunk in original_stream(self, system_prompt, user_prompt, **kwargs):
+                if first_chunk_at is None:
+                    first_chunk_at = time.perf_counter()
+                chunks.append(chunk)
+                yield chunk
+        finally:
+            _exit_usage_scope(token)
+        meta_data.update(
+            build_llm_usage(
+                system_prompt,
+                user_prompt,
+                "".join(chunks),
+                latency_seconds=time.perf_counter() - started_at,
+                ttft_seconds=first_chunk_at - started_at if first_chunk_at is not None else None,
+                provider_usage=holder,
+            )
+        )
+
+    _wrapped_stream._metadata_wrapped = True  # type: ignore[attr-defined]
+    return _wrapped_stream
+
+
 class BaseLLMClient(ABC):
+    # Metadata of the most recent call on this instance. Kept for compatibility;
+    # it is overwritten by concurrent calls, so shared clients should use
+    # generate_result() instead.
     last_meta_data: dict[str, Any] | None = None
 
     def __init_subclass__(cls, **kwargs: Any) -> None:
         super().__init_subclass__(**kwargs)
         original_generate = cls.__dict__.get("generate")
-        if original_generate is None:
-            return
-        if getattr(original_generate, "_metadata_wrapped", False):
-            return
-
-        @wraps(original_generate)
-        async def _wrapped_generate(self, system_prompt: str, user_prompt: str, **kwargs):
-            config = getattr(self, "config", None) or LLMConfig()
-            extra = kwargs.get("meta_data")
-            self.last_meta_data = build_llm_metadata(config, system_prompt, extra=extra)
-            return await original_generate(self, system_prompt, user_prompt, **kwargs)
-
-        _wrapped_generate._metadata_wrapped = True  # type: ignore[attr-defined]
-        cls.generate = _wrapped_generate  # type: ignore[assignment]
+        if original_generate is not None and not getattr(original_generate, "_metadata_wrapped", False):
+            cls.generate = _wrap_generate(original_generate)  # type: ignore[assignment]
+        original_stream = cls.__dict__.get("stream")
+        if original_stream is not None and not getattr(original_stream, "_metadata_wrapped", False):
+            cls.stream = _wrap_stream(original_stream)  # type: ignore[assignment]
+
     @abstractmethod
     async def generate(
         self,
@@ -48,3 +195,53 @@ class BaseLLMClient(ABC):
     ) -> str:
         """Generate a response from the LLM."""
         raise NotImplementedError
+
+    async def generate_result(
+        self,
+        system_prompt: str,
+        user_prompt: str,
+        **kwargs,
+    ) -> LLMResult:
+        """Generate a response and return it with this call's own metadata.
+
+        Unlike ``generate`` + ``last_meta_data`` this does not touch instance
+        state, so one client can safely serve concurrent requests.
+        """
+
+        generate = type(self).generate
+        original_generate = getattr(generate, "__wrapped__", generate)
+        return await _generate_with_metadata(self, original_generate, system_prompt, user_prompt, kwargs)
+
+    async def stream(
+        self,
+        system_prompt: str,
+        user_prompt: str,
+        **kwargs,
+    ) -> AsyncIterator[str]:
+        """Stream a response in chunks; clients without streaming yield a single chunk."""
+        yield await self.generate(system_prompt, user_prompt, **kwargs)
+
+    async def generate_many(
+        self,
+        requests: Sequence[LLMRequest],
+        concurrency: int = DEFAULT_BATCH_CONCURRENCY,
+        return_exceptions: bool = False,
+    ) -> list[str | BaseException]:
+        """Generate responses for ``requests`` with at most ``concurrency`` in flight.
+
+        Results are returned in request order. With ``return_exceptions`` a
+        failed item yields its exception instead of aborting the batch.
+        """
+
+        semaphore = asyncio.Semaphore(max(1, concurrency))
+
+        async def _generate_one(request: LLMRequest) -> str:
+            async with semaphore:
+                return await self.generate(request.system_prompt, request.user_prompt, **request.options)
+
+        return list(
+            await asyncio.gather(
+                *(_generate_one(request) for request in requests),
+                return_exceptions=return_exceptions,
+            )
+        )
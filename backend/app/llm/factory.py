@@ -1,19 +1,42 @@
 from __future__ import annotations
 
+import importlib
 import os
+from functools import lru_cache
 
-from app.config.llm_config import LLMConfig
+from app.config.llm_config import LLMConfig, MockLLMProfile
 from app.llm.base import BaseLLMClient
-from app.llm.mock_client import MockLLMClient
-from app.llm.openai_client import OpenAIClient
+
+# Provider modules are imported on first use so workers only load the configured one.
+_PROVIDERS: dict[str, tuple[str, str]] = {
+    "mock": ("app.llm.mock_client", "MockLLMClient"),
+    "openai": ("app.llm.openai_client", "OpenAIClient"),
+}
+DEFAULT_PROVIDER = "mock"
+
+
+@lru_cache(maxsize=None)
+def _load_provider(provider: str) -> type[BaseLLMClient]:
+    module_name, class_name = _PROVIDERS[provider]
+    return getattr(importlib.import_module(module_name), class_name)
+
+
+def _resolve_provider(config: LLMConfig) -> str:
+    provider = os.getenv("LLM_PROVIDER") or config.provider or DEFAULT_PROVIDER
+    provider = provider.lower()
+
+    if provider not in _PROVIDERS:
+        provider = DEFAULT_PROVIDER
+    return provider
 
 
 def get_llm_client(config: LLMConfig | None = None) -> BaseLLMClient:
     config = config or LLMConfig()
-    provider = os.getenv("LLM_PROVIDER") or config.provider or "mock"
-    provider = provider.lower()
+    return _load_provider(_resolve_provider(config))(config)
+
 
-    if provider == "openai":
-        return OpenAIClient(config)
+def validate_llm_settings(config: LLMConfig | None = None) -> None:
+    """Parse the configured provider's settings so a bad value fails startup, not every request."""
 
-    return MockLLMClient(config)
+    if _resolve_provider(config or LLMConfig()) == "mock":
+        MockLLMProfile.from_env()
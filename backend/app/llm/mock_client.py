@@ -1,16 +1,83 @@
 from __future__ import annotations
 
+import asyncio
 import logging
+import random
+import threading
+from typing import AsyncIterator
 
-from app.config.llm_config import LLMConfig
-from app.llm.base import BaseLLMClient
+from app.config.llm_config import MOCK_LATENCY_PROFILES, LLMConfig, MockLLMProfile
+from app.llm.base import BaseLLMClient, LLMRetryableError
+from app.utils.token_estimator import estimate_tokens
 
 logger = logging.getLogger(__name__)
 
+LATENCY_PROFILES = MOCK_LATENCY_PROFILES
+
+_rng: random.Random | None = None
+_rng_seed: int | None = None
+_rng_lock = threading.Lock()
+
+
+def _shared_rng(seed: int | None) -> random.Random:
+    # Clients are created per request, so the RNG must outlive them for a
+    # seeded run to produce one reproducible sequence rather than one value.
+    global _rng, _rng_seed
+    with _rng_lock:
+        if _rng is None or seed != _rng_seed:
+            _rng = random.Random(seed)
+            _rng_seed = seed
+        return _rng
+
+
+def reset_mock_rng() -> None:
+    global _rng
+    with _rng_lock:
+        _rng = None
+
 
 class MockLLMClient(BaseLLMClient):
-    def __init__(self, config: LLMConfig | None = None) -> None:
+    def __init__(self, config: LLMConfig | None = None, profile: MockLLMProfile | None = None) -> None:
         self.config = config or LLMConfig()
+        self.profile = profile or MockLLMProfile.from_env()
+
+    def _sample_latency(self, rng: random.Random) -> float:
+        """Return the simulated time to first token in seconds."""
+
+        profile = self.profile
+        base = profile.latency_ms
+        if profile.latency == "fixed":
+            latency_ms = base
+        elif profile.latency == "normal":
+            latency_ms = rng.gauss(base, profile.latency_stddev_ms)
+        elif profile.latency == "longtail":
+            # Log-normal around the configured median: most calls are close to
+            # latency_ms, a few are several times slower.
+            latency_ms = base * rng.lognormvariate(0.0, profile.tail_sigma)
+        else:  # "none"
+            latency_ms = 0.0
+        return max(0.0, latency_ms) / 1000
+
+    def _build_response(self, user_prompt: str) -> str:
+        try:
+            snippet = (user_prompt or "")[:200]
+            response = f"[MOCK RESPONSE]\nUser: {snippet}"
+        except Exception:
+            response = "[MOCK RESPONSE]\nUser: "
+        missing_tokens = self.profile.response_tokens - estimate_tokens(response)
+        if missing_tokens > 0:
+            response = f"{response}\n{'lorem ' * missing_tokens}".rstrip()
+        return response
+
+    def _prepare(self, system_prompt: str, user_prompt: str) -> tuple[random.Random, str]:
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("MockLLMClient system_prompt=%s", system_prompt)
+            logger.debug("MockLLMClient user_prompt=%s", user_prompt)
+
+        rng = _shared_rng(self.profile.seed)
+        if self.profile.error_rate > 0 and rng.random() < self.profile.error_rate:
+            raise LLMRetryableError("mock injected error")
+        return rng, self._build_response(user_prompt)
 
     async def generate(
         self,
@@ -18,14 +85,29 @@ class MockLLMClient(BaseLLMClient):
         user_prompt: str,
         **kwargs,
     ) -> str:
-        try:
-            logger.info("MockLLMClient system_prompt=%s", system_prompt)
-            logger.info("MockLLMClient user_prompt=%s", user_prompt)
-        except Exception:
-            pass
+        rng, response = self._prepare(system_prompt, user_prompt)
+        delay = self._sample_latency(rng)
+        if self.profile.tokens_per_second > 0:
+            delay += estimate_tokens(response) / self.profile.tokens_per_second
+        if delay > 0:
+            await asyncio.sleep(delay)
+        return response
 
-        try:
-            snippet = (user_prompt or "")[:200]
-            return f"[MOCK RESPONSE]\nUser: {snippet}"
-        except Exception:
-            return "[MOCK RESPONSE]\nUser: "
+    async def stream(
+        self,
+        system_prompt: str,
+        user_prompt: str,
+        **kwargs,
+    ) -> AsyncIterator[str]:
+        rng, response = self._prepare(system_prompt, user_prompt)
+        first_token_delay = self._sample_latency(rng)
+        if first_token_delay > 0:
+            await asyncio.sleep(first_token_delay)
+
+        token_count = max(1, estimate_tokens(response))
+        chunk_size = max(1, -(-len(response) // token_count))
+        token_delay = 1 / self.profile.tokens_per_second if self.profile.tokens_per_second > 0 else 0.0
+        for start in range(0, len(response), chunk_size):
+            if start and token_delay:
+                await asyncio.sleep(token_delay)
+            yield response[start : start + chunk_size]
@@ -1,35 +1,47 @@
 from __future__ import annotations
 
+import asyncio
 import os
+from typing import Sequence
 
 from app.config.llm_config import LLMConfig
-from app.llm.base import BaseLLMClient, LLMClientError, LLMTimeoutError
+from app.llm.base import (
+    DEFAULT_BATCH_CONCURRENCY,
+    BaseLLMClient,
+    LLMRequest,
+    LLMClientError,
+    LLMRateLimitError,
+    LLMRetryableError,
+    LLMTimeoutError,
+    report_usage,
+)
+
+_RETRYABLE_STATUS_CODES = {408, 409, 429, 500, 502, 503, 504}
+_RETRYABLE_ERROR_NAMES = {"APIConnectionError", "InternalServerError"}
 
 
 class OpenAIClient(BaseLLMClient):
     def __init__(self, config: LLMConfig | None = None) -> None:
         self.config = config or LLMConfig()
 
-    async def generate(
-        self,
-        system_prompt: str,
-        user_prompt: str,
-        **kwargs,
-    ) -> str:
+    def _build_client(self):
         api_key = os.getenv("OPENAI_API_KEY")
         if not api_key:
             raise LLMClientError("OPENAI_API_KEY is not set")
 
-        model = kwargs.get("model", self.config.model)
-        temperature = kwargs.get("temperature", self.config.temperature)
-        max_tokens = kwargs.get("max_tokens", self.config.max_tokens)
-
         try:
-            from openai import OpenAI  # type: ignore[import-not-found]
+            from openai import AsyncOpenAI  # type: ignore[import-not-found]
         except Exception as exc:  # pragma: no cover - optional dependency
             raise LLMClientError("openai SDK is not installed") from exc
 
-        client = OpenAI(api_key=api_key)
+        # Retries are owned by ResilientLLMClient; the SDK must fail fast within the deadline.
+        # The async client lets task cancellation (client disconnect) abort the HTTP request.
+        return AsyncOpenAI(api_key=api_key, timeout=self.config.request_timeout, max_retries=0)
+
+    async def _complete(self, client, system_prompt: str, user_prompt: str, **kwargs) -> str:
+        model = kwargs.get("model", self.config.model)
+        temperature = kwargs.get("temperature", self.config.temperature)
+        max_tokens = kwargs.get("max_tokens", self.config.max_tokens)
         messages = [
             {"role": "system", "content": system_prompt},
             {"role": "user", "content": user_prompt},
@@ -43,14 +55,57 @@ class OpenAIClient(BaseLLMClient):
                 temperature=temperature,
                 max_tokens=max_tokens,
             )
-            return (response.choices[0].message.content or "").strip()
-        except TimeoutError as exc:
-            raise LLMTimeoutError("OpenAI request timed out") from exc
+            content = (response.choices[0].message.content or "").strip()
         except Exception as exc:
-            raise LLMClientError("OpenAI request failed") from exc
+            raise _classify_openai_error(exc) from exc
+        usage = getattr(response, "usage", None)
+        if usage is not None:
+            report_usage(getattr(usage, "prompt_tokens", None), getattr(usage, "completion_tokens", None))
+        return content
 
+    async def generate(
+        self,
+        system_prompt: str,
+        user_prompt: str,
+        **kwargs,
+    ) -> str:
+        async with self._build_client() as client:
+            return await self._complete(client, system_prompt, user_prompt, **kwargs)
 
-async def _run_openai_request(client, **kwargs):
-    import asyncio
+    async def generate_many(
+        self,
+        requests: Sequence[LLMRequest],
+        concurrency: int = DEFAULT_BATCH_CONCURRENCY,
+        return_exceptions: bool = False,
+    ) -> list[str | BaseException]:
+        # One SDK client (and its HTTP connection pool) is shared by the whole batch.
+        semaphore = asyncio.Semaphore(max(1, concurrency))
+
+        async with self._build_client() as client:
 
-    return await asyncio.to_thread(client.chat.completions.create, **kwargs)
+            async def _complete_one(request: LLMRequest) -> str:
+                async with semaphore:
+                    return await self._complete(client, request.system_prompt, request.user_prompt, **request.options)
+
+            return list(
+                await asyncio.gather(
+                    *(_complete_one(request) for request in requests),
+                    return_exceptions=return_exceptions,
+                )
+            )
+
+
+def _classify_openai_error(exc: Exception) -> LLMClientError:
+    name = type(exc).__name__
+    if isinstance(exc, TimeoutError) or name == "APITimeoutError":
+        return LLMTimeoutError("OpenAI request timed out")
+    status_code = getattr(exc, "status_code", None)
+    if name == "RateLimitError" or status_code == 429:
+        return LLMRateLimitError("OpenAI request was rate limited")
+    if name in _RETRYABLE_ERROR_NAMES or status_code in _RETRYABLE_STATUS_CODES:
+        return LLMRetryableError("OpenAI request failed transiently")
+    return LLMClientError("OpenAI request failed")
+
+
+async def _run_openai_request(client, **kwargs):
+    return await client.chat.completions.create(**kwargs)
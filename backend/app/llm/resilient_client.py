@@ -0,0 +1,297 @@
+"""Retry, hedging, deadline and circuit-breaker wrapper for LLM clients."""
+
+from __future__ import annotations
+
+import asyncio
+import random
+import threading
+import time
+from collections import deque
+from typing import Any, Awaitable, Callable, Sequence
+
+from app.config.llm_config import LLMConfig, LLMResilienceConfig
+from app.llm.base import (
+    DEFAULT_BATCH_CONCURRENCY,
+    BaseLLMClient,
+    LLMCircuitOpenError,
+    LLMClientError,
+    LLMRequest,
+    LLMRetryableError,
+    LLMTimeoutError,
+)
+
+
+class CircuitBreaker:
+    """Consecutive-failure breaker with a single half-open probe."""
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(
+        self,
+        failure_threshold: int,
+        reset_timeout: float,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._state = self.CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._probe_in_flight = False
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            if self._state == self.OPEN and self._clock() - self._opened_at >= self.reset_timeout:
+                return self.HALF_OPEN
+            return self._state
+
+    def allow(self) -> bool:
+        with self._lock:
+            if self._state == self.CLOSED:
+                return True
+            if self._state == self.OPEN:
+                if self._clock() - self._opened_at < self.reset_timeout:
+                    return False
+                self._state = self.HALF_OPEN
+                self._probe_in_flight = False
+            if self._probe_in_flight:
+                return False
+            self._probe_in_flight = True
+            return True
+
+    def record_success(self) -> None:
+        with self._lock:
+            self._state = self.CLOSED
+            self._failures = 0
+            self._probe_in_flight = False
+
+    def release_probe(self) -> None:
+        with self._lock:
+            self._probe_in_flight = False
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self._failures += 1
+            if self._state == self.HALF_OPEN or self._failures >= self.failure_threshold:
+                self._state = self.OPEN
+                self._opened_at = self._clock()
+                self._probe_in_flight = False
+
+
+class LatencyTracker:
+    """Sliding window of successful call latencies."""
+
+    def __init__(self, window: int = 200) -> None:
+        self._samples: deque[float] = deque(maxlen=window)
+        self._lock = threading.Lock()
+
+    def observe(self, seconds: float) -> None:
+        with self._lock:
+            self._samples.append(seconds)
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._samples)
+
+    def percentile(self, q: float) -> float | None:
+        with self._lock:
+            if not self._samples:
+                return None
+            ordered = sorted(self._samples)
+        index = min(len(ordered) - 1, max(0, int(round(q * (len(ordered) - 1)))))
+        return ordered[index]
+
+
+class ResilienceState:
+    """Breaker and latency window shared by every client of one provider."""
+
+    def __init__(self, config: LLMResilienceConfig) -> None:
+        self.breaker = CircuitBreaker(config.breaker_failure_threshold, config.breaker_reset_timeout)
+        self.latency = LatencyTracker()
+
+
+_states: dict[str, ResilienceState] = {}
+_states_lock = threading.Lock()
+
+
+def get_resilience_state(key: str, config: LLMResilienceConfig) -> ResilienceState:
+    with _states_lock:
+        state = _states.get(key)
+        if state is None:
+            state = ResilienceState(config)
+            _states[key] = state
+        return state
+
+
+def reset_resilience_states() -> None:
+    with _states_lock:
+        _states.clear()
+
+
+class ResilientLLMClient(BaseLLMClient):
+    """Wrap a client with per-attempt deadlines, jittered retries, hedging and a breaker.
+
+    Only ``LLMRetryableError`` (timeouts, rate limits, transient provider
+    errors) is retried and counts against the breaker; other client errors
+    such as a missing API key propagate immediately.
+    """
+
+    def __init__(
+        self,
+        inner: BaseLLMClient,
+        resilience: LLMResilienceConfig | None = None,
+        state: ResilienceState | None = None,
+        rng: Callable[[], float] = random.random,
+        sleep: Callable[[float], Awaitable[Any]] = asyncio.sleep,
+    ) -> None:
+        self.inner = inner
+        self.config = getattr(inner, "config", None) or LLMConfig()
+        self.resilience = resilience or LLMResilienceConfig.from_env()
+        key = f"{self.config.provider}:{type(inner).__qualname__}"
+        self.state = state or get_resilience_state(key, self.resilience)
+        self._rng = rng
+        self._sleep = sleep
+
+    def _backoff(self, attempt: int) -> float:
+        ceiling = min(self.resilience.backoff_max, self.resilience.backoff_base * (2 ** (attempt - 1)))
+        return self._rng() * ceiling
+
+    def _hedge_delay(self) -> float | None:
+        if not self.resilience.hedge_enabled:
+            return None
+        if self.resilience.hedge_after is not None:
+            return self.resilience.hedge_after
+        if len(self.state.latency) < self.resilience.hedge_min_samples:
+            return None
+        return self.state.latency.percentile(0.95)
+
+    async def _call_with_deadline(self, system_prompt: str, user_prompt: str, kwargs: dict[str, Any]) -> str:
+        try:
+            return await asyncio.wait_for(
+                self.inner.generate(system_prompt, user_prompt, **kwargs),
+                timeout=self.resilience.attempt_timeout,
+            )
+        except asyncio.TimeoutError as exc:
+            raise LLMTimeoutError("LLM attempt exceeded deadline") from exc
+
+    async def _attempt(self, system_prompt: str, user_prompt: str, kwargs: dict[str, Any]) -> str:
+        started_at = time.perf_counter()
+        primary = asyncio.ensure_future(self._call_with_deadline(system_prompt, user_prompt, kwargs))
+        tasks = {primary}
+        try:
+            hedge_delay = self._hedge_delay()
+            if hedge_delay is not None:
+                done, _pending = await asyncio.wait(tasks, timeout=hedge_delay)
+                if not done:
+                    tasks.add(asyncio.ensure_future(self._call_with_deadline(system_prompt, user_prompt, kwargs)))
+
+            first_error: BaseException | None = None
+            while tasks:
+                done, tasks = await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    error = task.exception()
+                    if error is None:
+                        self.state.latency.observe(time.perf_counter() - started_at)
+                        return task.result()
+                    if first_error is None:
+                        first_error = error
+            assert first_error is not None
+            raise first_error
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    async def generate(
+        self,
+        system_prompt: str,
+        user_prompt: str,
+        **kwargs,
+    ) -> str:
+        breaker = self.state.breaker
+        last_error: LLMClientError | None = None
+        for attempt in range(1, self.resilience.max_attempts + 1):
+            if not breaker.allow():
+                raise LLMCircuitOpenError("LLM circuit breaker is open") from last_error
+            try:
+                result = await self._attempt(system_prompt, user_prompt, kwargs)
+            except LLMRetryableError as exc:
+                breaker.record_failure()
+                last_error = exc
+                if attempt < self.resilience.max_attempts:
+                    await self._sleep(self._backoff(attempt))
+                continue
+            except LLMClientError:
+                # The provider answered; a non-retryable error says nothing about its health.
+                breaker.record_success()
+                raise
+            except BaseException:
+                breaker.release_probe()
+                raise
+            breaker.record_success()
+            return result
+
+        assert last_error is not None
+        raise last_error
+
+    async def generate_many(
+        self,
+        requests: Sequence[LLMRequest],
+        concurrency: int = DEFAULT_BATCH_CONCURRENCY,
+        return_exceptions: bool = False,
+    ) -> list[str | BaseException]:
+        """Run the batch through the inner client's ``generate_many``, retrying transient failures.
+
+        The inner batch method is kept so providers can share one connection
+        pool across the batch. Each round sends the still-pending requests in
+        one inner batch; items that failed with ``LLMRetryableError`` go to
+        the next round after a backoff, up to ``max_attempts`` rounds. The
+        breaker is checked before every round and updated per item. Hedging
+        and the per-attempt deadline apply to single calls only.
+        """
+
+        breaker = self.state.breaker
+        results: list[str | BaseException | None] = [None] * len(requests)
+        pending = list(range(len(requests)))
+        for attempt in range(1, self.resilience.max_attempts + 1):
+            if not pending:
+                break
+            if not breaker.allow():
+                for index in pending:
+                    results[index] = LLMCircuitOpenError("LLM circuit breaker is open")
+                pending = []
+                break
+            batch = await self.inner.generate_many(
+                [requests[index] for index in pending],
+                concurrency=concurrency,
+                return_exceptions=True,
+            )
+            retry: list[int] = []
+            for index, result in zip(pending, batch):
+                results[index] = result
+                if isinstance(result, LLMRetryableError):
+                    breaker.record_failure()
+                    retry.append(index)
+                elif not isinstance(result, BaseException) or isinstance(result, LLMClientError):
+                    breaker.record_success()
+                else:
+                    breaker.release_probe()
+            pending = retry
+            if pending and attempt < self.resilience.max_attempts:
+                await self._sleep(self._backoff(attempt))
+
+        if not return_exceptions:
+            for result in results:
+                if isinstance(result, BaseException):
+                    raise result
+        return results  # type: ignore[return-value]
+
+
+def with_resilience(client: BaseLLMClient, resilience: LLMResilienceConfig | None = None) -> BaseLLMClient:
+    if isinstance(client, ResilientLLMClient):
+        return client
+    return ResilientLLMClient(client, resilience)
@@ -0,0 +1,293 @@
+"""Admission control and rate limiting for outbound LLM calls."""
+
+from __future__ import annotations
+
+import asyncio
+import heapq
+import itertools
+import threading
+import time
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+from enum import IntEnum
+from typing import Any, AsyncIterator, Callable, Hashable
+
+from app.config.llm_config import LLMSchedulerConfig
+from app.utils.token_estimator import estimate_tokens
+
+
+class LLMPriority(IntEnum):
+    """Lower values are admitted first."""
+
+    INTERACTIVE = 0
+    REPORT = 1
+
+
+class TokenBucket:
+    """Reservation-based token bucket refilled continuously per minute.
+
+    ``reserve`` always succeeds and returns how long the caller must wait
+    before its reservation is covered, so callers are served in order.
+    """
+
+    def __init__(
+        self,
+        rate_per_minute: int,
+        capacity: int | None = None,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.rate_per_second = rate_per_minute / 60.0
+        self.capacity = float(capacity if capacity is not None else rate_per_minute)
+        self._clock = clock
+        self._tokens = self.capacity
+        self._updated_at = clock()
+        self._lock = threading.Lock()
+
+    def _refill(self) -> None:
+        now = self._clock()
+        elapsed = max(0.0, now - self._updated_at)
+        self._tokens = min(self.capacity, self._tokens + elapsed * self.rate_per_second)
+        self._updated_at = now
+
+    def reserve(self, amount: float) -> float:
+        with self._lock:
+            self._refill()
+            self._tokens -= amount
+            if self._tokens >= 0:
+                return 0.0
+            return -self._tokens / self.rate_per_second
+
+    @property
+    def available(self) -> float:
+        with self._lock:
+            self._refill()
+            return self._tokens
+
+
+@dataclass(slots=True)
+class LLMTicket:
+    user_key: Hashable
+    priority: LLMPriority
+    prompt_tokens: int
+    wait_seconds: float = 0.0
+    completion_tokens: int = 0
+
+    def record_completion(self, text: str | None) -> None:
+        self.completion_tokens += estimate_tokens(text)
+
+
+@dataclass(slots=True)
+class _Waiter:
+    user_key: Hashable
+    priority: LLMPriority
+    loop: asyncio.AbstractEventLoop
+    future: asyncio.Future
+    granted: bool = False
+    cancelled: bool = False
+
+
+@dataclass(slots=True)
+class _WaitStats:
+    count: int = 0
+    total_seconds: float = 0.0
+    max_seconds: float = 0.0
+
+    def observe(self, seconds: float) -> None:
+        self.count += 1
+        self.total_seconds += seconds
+        self.max_seconds = max(self.max_seconds, seconds)
+
+    def as_dict(self) -> dict[str, float | int]:
+        avg = self.total_seconds / self.count if self.count else 0.0
+        return {
+            "count": self.count,
+            "total_seconds": self.total_seconds,
+            "avg_seconds": avg,
+            "max_seconds": self.max_seconds,
+        }
+
+
+def _wake(future: asyncio.Future) -> None:
+    if not future.done():
+        future.set_result(None)
+
+
+class LLMScheduler:
+    """Priority admission queue with global/per-user caps and RPM/TPM buckets.
+
+    State is guarded by a thread lock and waiters are woken through their own
+    event loop, so one scheduler can be shared by requests running on
+    different loops (e.g. sync and async endpoints, test clients).
+    """
+
+    def __init__(
+        self,
+        config: LLMSchedulerConfig | None = None,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.config = config or LLMSchedulerConfig()
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._queue: list[tuple[int, int, _Waiter]] = []
+        self._seq = itertools.count()
+        self._in_flight = 0
+        self._per_user: dict[Hashable, int] = {}
+        self._queued = {priority: 0 for priority in LLMPriority}
+        self._wait_stats = {priority: _WaitStats() for priority in LLMPriority}
+        self._admitted_total = 0
+        self._request_bucket = (
+            TokenBucket(self.config.requests_per_minute, clock=clock)
+            if self.config.requests_per_minute > 0
+            else None
+        )
+        self._token_bucket = (
+            TokenBucket(self.config.tokens_per_minute, clock=clock)
+            if self.config.tokens_per_minute > 0
+            else None
+        )
+
+    def _user_blocked(self, user_key: Hashable) -> bool:
+        if user_key is None:
+            return False
+        return self._per_user.get(user_key, 0) >= self.config.max_concurrency_per_user
+
+    def _dispatch_locked(self) -> None:
+        blocked: list[tuple[int, int, _Waiter]] = []
+        while self._queue and self._in_flight < self.config.max_concurrency:
+            entry = heapq.heappop(self._queue)
+            waiter = entry[2]
+            if waiter.cancelled:
+                continue
+            if self._user_blocked(waiter.user_key):
+                blocked.append(entry)
+                continue
+            self._queued[waiter.priority] -= 1
+            self._in_flight += 1
+            self._admitted_total += 1
+            if waiter.user_key is not None:
+                self._per_user[waiter.user_key] = self._per_user.get(waiter.user_key, 0) + 1
+            waiter.granted = True
+            waiter.loop.call_soon_threadsafe(_wake, waiter.future)
+        for entry in blocked:
+            heapq.heappush(self._queue, entry)
+
+    def _release_locked(self, user_key: Hashable) -> None:
+        self._in_flight = max(0, self._in_flight - 1)
+        if user_key is not None:
+            remaining = self._per_user.get(user_key, 0) - 1
+            if remaining > 0:
+                self._per_user[user_key] = remaining
+            else:
+                self._per_user.pop(user_key, None)
+        self._dispatch_locked()
+
+    def _rate_limit_delay(self, tokens: int) -> float:
+        delay = 0.0
+        if self._request_bucket is not None:
+            delay = max(delay, self._request_bucket.reserve(1))
+        if self._token_bucket is not None and tokens > 0:
+            delay = max(delay, self._token_bucket.reserve(tokens))
+        return delay
+
+    async def acquire(
+        self,
+        user_id: Hashable = None,
+        priority: LLMPriority = LLMPriority.INTERACTIVE,
+        tokens: int = 0,
+    ) -> LLMTicket:
+        loop = asyncio.get_running_loop()
+        started_at = self._clock()
+        waiter = _Waiter(
+            user_key=user_id,
+            priority=priority,
+            loop=loop,
+            future=loop.create_future(),
+        )
+        with self._lock:
+            heapq.heappush(self._queue, (int(priority), next(self._seq), waiter))
+            self._queued[priority] += 1
+            self._dispatch_locked()
+
+        try:
+            if not waiter.granted:
+                await waiter.future
+            delay = self._rate_limit_delay(tokens)
+            if delay > 0:
+                await asyncio.sleep(delay)
+        except BaseException:
+            with self._lock:
+                if waiter.granted:
+                    self._release_locked(user_id)
+                elif not waiter.cancelled:
+                    waiter.cancelled = True
+                    self._queued[priority] -= 1
+            raise
+
+        wait_seconds = self._clock() - started_at
+        with self._lock:
+            self._wait_stats[priority].observe(wait_seconds)
+        return LLMTicket(
+            user_key=user_id,
+            priority=priority,
+            prompt_tokens=tokens,
+            wait_seconds=wait_seconds,
+        )
+
+    def release(self, ticket: LLMTicket) -> None:
+        if self._token_bucket is not None and ticket.completion_tokens > 0:
+            self._token_bucket.reserve(ticket.completion_tokens)
+        with self._lock:
+            self._release_locked(ticket.user_key)
+
+    @asynccontextmanager
+    async def slot(
+        self,
+        user_id: Hashable = None,
+        priority: LLMPriority = LLMPriority.INTERACTIVE,
+        tokens: int = 0,
+    ) -> AsyncIterator[LLMTicket]:
+        ticket = await self.acquire(user_id=user_id, priority=priority, tokens=tokens)
+        try:
+            yield ticket
+        finally:
+            self.release(ticket)
+
+    def snapshot(self) -> dict[str, Any]:
+        with self._lock:
+            queue_depth = {priority.name.lower(): count for priority, count in self._queued.items()}
+            wait_time = {
+                priority.name.lower(): stats.as_dict() for priority, stats in self._wait_stats.items()
+            }
+            return {
+                "in_flight": self._in_flight,
+                "max_concurrency": self.config.max_concurrency,
+                "max_concurrency_per_user": self.config.max_concurrency_per_user,
+                "queue_depth": sum(queue_depth.values()),
+                "queue_depth_by_priority": queue_depth,
+                "wait_time_by_priority": wait_time,
+                "admitted_total": self._admitted_total,
+                "requests_per_minute": self.config.requests_per_minute,
+                "tokens_per_minute": self.config.tokens_per_minute,
+            }
+
+
+_scheduler: LLMScheduler | None = None
+_scheduler_lock = threading.Lock()
+
+
+def get_llm_scheduler() -> LLMScheduler:
+    global _scheduler
+    if _scheduler is None:
+        with _scheduler_lock:
+            if _scheduler is None:
+                _scheduler = LLMScheduler(LLMSchedulerConfig.from_env())
+    return _scheduler
+
+
+def reset_llm_scheduler(config: LLMSchedulerConfig | None = None) -> LLMScheduler:
+    """Replace the process-wide scheduler (used by tests and config reloads)."""
+
+    global _scheduler
+    with _scheduler_lock:
+        _scheduler = LLMScheduler(config or LLMSchedulerConfig.from_env())
+    return _scheduler
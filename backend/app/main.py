@@ -1,10 +1,53 @@
+import asyncio
+import contextlib
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
 from app.api import health
 from app.api.kpi_router import router as kpi_router
+from app.api.llm_router import router as llm_router
+from app.api.metrics_router import router as metrics_router
+from app.api.phase1_router import router as phase1_router
+from app.api.phase3_router import router as phase3_router
+from app.api.profiling_router import router as profiling_router
+from app.api.sessions_router import router as sessions_router
+from app.config.profiling_config import ProfilingConfig
+from app.core import config as app_config
+from app.llm.factory import validate_llm_settings
+from app.services.meta_write_buffer import get_meta_write_buffer
+from app.utils.compression import CompressionMiddleware
+from app.utils.json_response import FastJSONResponse
+from app.utils.request_profiler import ProfilingMiddleware
+
+
+@asynccontextmanager
+async def lifespan(_app: FastAPI):
+    validate_llm_settings()
+    flusher = None
+    if app_config.META_WRITE_BEHIND:
+        flusher = asyncio.create_task(get_meta_write_buffer().run(app_config.META_WRITE_BEHIND_FLUSH_SECONDS))
+    try:
+        yield
+    finally:
+        if flusher is not None:
+            flusher.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await flusher
+        # Persist whatever is still queued before the process exits.
+        get_meta_write_buffer().flush()
 
-app = FastAPI()
+
+app = FastAPI(default_response_class=FastJSONResponse, lifespan=lifespan)
+
+if app_config.RESPONSE_COMPRESSION:
+    app.add_middleware(
+        CompressionMiddleware,
+        minimum_size=app_config.RESPONSE_COMPRESSION_MIN_BYTES,
+        gzip_level=app_config.RESPONSE_GZIP_LEVEL,
+        brotli_quality=app_config.RESPONSE_BROTLI_QUALITY,
+    )
 
 app.add_middleware(
     CORSMiddleware,
@@ -14,5 +57,15 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+profiling_config = ProfilingConfig.from_env()
+if profiling_config.enabled:
+    app.add_middleware(ProfilingMiddleware, config=profiling_config)
+    app.include_router(profiling_router)
+
 app.include_router(health.router)
 app.include_router(kpi_router)
+app.include_router(llm_router)
+app.include_router(metrics_router)
+app.include_router(phase1_router)
+app.include_router(phase3_router)
+app.include_router(sessions_router)
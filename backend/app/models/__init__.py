@@ -1,6 +1,6 @@
-
 from app.models.goal import Goal
 from app.models.session import Session
+from app.models.system_prompt import SystemPrompt
 from app.models.user import User
 
-__all__ = ["Goal", "Session", "User"]
+__all__ = ["Goal", "Session", "SystemPrompt", "User"]
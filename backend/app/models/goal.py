@@ -16,6 +16,7 @@ class Goal(SQLModel, table=True):
             sqlite_where=sa.text("is_active = 1"),
             postgresql_where=sa.text("is_active IS TRUE"),
         ),
+        sa.Index("ix_goals_user_version", "user_id", "version"),
     )
 
     id: int | None = Field(default=None, primary_key=True)
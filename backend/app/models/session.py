@@ -7,9 +7,17 @@ from uuid import UUID, uuid4
 import sqlalchemy as sa
 from sqlmodel import Field, SQLModel
 
+from app.models.types import CompressedJSON, CompressedText
+
+
+# Optimistic concurrency: every ORM UPDATE checks and bumps this column (StaleDataError on mismatch).
+_version_column = sa.Column("version", sa.Integer, nullable=False, server_default=sa.text("1"))
+
 
 class Session(SQLModel, table=True):
     __tablename__ = "sessions"
+    __table_args__ = (sa.Index("ix_sessions_user_listing", "user_id", "session_date", "created_at", "id"),)
+    __mapper_args__ = {"version_id_col": _version_column}
 
     id: UUID = Field(default_factory=uuid4, primary_key=True)
     user_id: int = Field(foreign_key="users.id", nullable=False)
@@ -17,10 +25,10 @@ class Session(SQLModel, table=True):
     phase: int
     log_json: dict[str, Any] = Field(
         default_factory=dict,
-        sa_column=sa.Column(sa.JSON, nullable=False),
+        sa_column=sa.Column(CompressedJSON, nullable=False),
     )
-    report_draft: str | None = Field(default=None)
-    report_final: str | None = Field(default=None)
+    report_draft: str | None = Field(default=None, sa_column=sa.Column(CompressedText, nullable=True))
+    report_final: str | None = Field(default=None, sa_column=sa.Column(CompressedText, nullable=True))
     edit_metrics: dict[str, Any] | None = Field(
         default=None,
         sa_column=sa.Column(sa.JSON, nullable=True),
@@ -33,3 +41,4 @@ class Session(SQLModel, table=True):
         default_factory=lambda: datetime.now(timezone.utc),
         nullable=False,
     )
+    version: int = Field(default=1, sa_column=_version_column)
@@ -0,0 +1,19 @@
+from __future__ import annotations
+
+from datetime import datetime, timezone
+
+import sqlalchemy as sa
+from sqlmodel import Field, SQLModel
+
+
+class SystemPrompt(SQLModel, table=True):
+    """Content-addressed system prompt, referenced from ``sessions.log_json[0]`` by hash."""
+
+    __tablename__ = "system_prompts"
+
+    prompt_hash: str = Field(primary_key=True, max_length=64)
+    content: str = Field(sa_column=sa.Column(sa.Text, nullable=False))
+    created_at: datetime = Field(
+        default_factory=lambda: datetime.now(timezone.utc),
+        nullable=False,
+    )
@@ -0,0 +1,126 @@
+"""Column types with optional transparent compression.
+
+Compressed values are wrapped in an envelope that still fits the declared
+column type (a JSON object for JSON columns, a marked string for text), so
+enabling or disabling ``DB_COMPRESSION`` needs no schema change and old
+uncompressed rows keep loading as before. Values smaller than
+``DB_COMPRESSION_MIN_BYTES`` are stored as is.
+
+Compressed values are opaque to SQL JSON functions (``json_extract`` etc.).
+"""
+
+from __future__ import annotations
+
+import base64
+import json
+import logging
+import zlib
+from typing import Any
+
+import sqlalchemy as sa
+from sqlalchemy.types import TypeDecorator
+
+from app.core import config as app_config
+
+logger = logging.getLogger(__name__)
+
+ENVELOPE_KEY = "__compressed__"
+TEXT_PREFIX = "\x01z:"
+CODECS = ("zlib", "zstd")
+
+
+def _zstd():
+    try:
+        import zstandard  # type: ignore[import-not-found]
+    except Exception:  # pragma: no cover - optional dependency
+        return None
+    return zstandard
+
+
+def _active_codec() -> str | None:
+    codec = (app_config.DB_COMPRESSION or "none").strip().lower()
+    if codec not in CODECS:
+        return None
+    if codec == "zstd" and _zstd() is None:
+        logger.warning("DB_COMPRESSION=zstd but zstandard is not installed; using zlib")
+        return "zlib"
+    return codec
+
+
+def compression_active() -> bool:
+    """Whether new values may be stored compressed (and so cannot be patched with SQL JSON functions)."""
+
+    return _active_codec() is not None
+
+
+def compress_bytes(codec: str, raw: bytes) -> bytes:
+    if codec == "zstd":
+        return _zstd().ZstdCompressor(level=3).compress(raw)
+    return zlib.compress(raw, 6)
+
+
+def decompress_bytes(codec: str, data: bytes) -> bytes:
+    if codec == "zstd":
+        zstandard = _zstd()
+        if zstandard is None:
+            raise RuntimeError("zstandard is required to read zstd-compressed columns")
+        return zstandard.ZstdDecompressor().decompress(data)
+    if codec == "zlib":
+        return zlib.decompress(data)
+    raise ValueError(f"unknown compression codec: {codec}")
+
+
+def _maybe_compress(raw: bytes) -> tuple[str, str] | None:
+    codec = _active_codec()
+    if codec is None or len(raw) < app_config.DB_COMPRESSION_MIN_BYTES:
+        return None
+    compressed = compress_bytes(codec, raw)
+    encoded = base64.b64encode(compressed).decode("ascii")
+    if len(encoded) >= len(raw):
+        return None
+    return codec, encoded
+
+
+class CompressedJSON(TypeDecorator):
+    """JSON column that stores large values as a compressed envelope."""
+
+    impl = sa.JSON
+    cache_ok = True
+
+    def process_bind_param(self, value: Any, dialect) -> Any:
+        if value is None:
+            return None
+        raw = json.dumps(value, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+        compressed = _maybe_compress(raw)
+        if compressed is None:
+            return value
+        codec, encoded = compressed
+        return {ENVELOPE_KEY: codec, "data": encoded}
+
+    def process_result_value(self, value: Any, dialect) -> Any:
+        if isinstance(value, dict) and ENVELOPE_KEY in value and len(value) == 2:
+            raw = decompress_bytes(value[ENVELOPE_KEY], base64.b64decode(value["data"]))
+            return json.loads(raw)
+        return value
+
+
+class CompressedText(TypeDecorator):
+    """Text column that stores large values as a marked, compressed string."""
+
+    impl = sa.Text
+    cache_ok = True
+
+    def process_bind_param(self, value: Any, dialect) -> Any:
+        if value is None:
+            return None
+        compressed = _maybe_compress(str(value).encode("utf-8"))
+        if compressed is None:
+            return value
+        codec, encoded = compressed
+        return f"{TEXT_PREFIX}{codec}:{encoded}"
+
+    def process_result_value(self, value: Any, dialect) -> Any:
+        if isinstance(value, str) and value.startswith(TEXT_PREFIX):
+            codec, _, encoded = value[len(TEXT_PREFIX) :].partition(":")
+            return decompress_bytes(codec, base64.b64decode(encoded)).decode("utf-8")
+        return value
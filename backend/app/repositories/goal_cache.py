@@ -0,0 +1,83 @@
+"""Read-through cache of each user's active goal content.
+
+Entries are keyed by (engine, user_id) so separate databases (e.g. test
+engines) never share state. Goal writes in ``goals_repository`` invalidate
+the user's entry, and ``confirm_phase1_goal`` invalidates again after commit
+so a reader that raced the open transaction cannot keep a stale value. The
+TTL bounds staleness across processes, which do not see each other's
+invalidations.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+import weakref
+from dataclasses import dataclass
+from typing import Any, Dict
+
+from sqlmodel import Session, select
+
+from app.core import config as app_config
+from app.models.goal import Goal
+
+
+@dataclass(frozen=True, slots=True)
+class GoalState:
+    active_content: str | None
+    loaded_at: float
+
+
+_cache: "weakref.WeakKeyDictionary[Any, Dict[int, GoalState]]" = weakref.WeakKeyDictionary()
+_lock = threading.Lock()
+
+
+def _engine_key(session: Session) -> Any:
+    bind = session.get_bind()
+    return getattr(bind, "engine", bind)
+
+
+def _load(session: Session, user_id: int) -> GoalState:
+    statement = (
+        select(Goal.content)
+        .where(Goal.user_id == user_id)
+        .where(Goal.is_active.is_(True))
+        .limit(1)
+    )
+    return GoalState(session.exec(statement).first(), time.monotonic())
+
+
+def get_goal_state(session: Session, user_id: int) -> GoalState:
+    """Return the cached goal state for ``user_id``, loading it on miss or expiry."""
+
+    ttl = app_config.GOAL_CACHE_TTL_SECONDS
+    if ttl <= 0:
+        return _load(session, user_id)
+
+    key = _engine_key(session)
+    with _lock:
+        cached = _cache.get(key, {}).get(user_id)
+    if cached is not None and time.monotonic() - cached.loaded_at < ttl:
+        return cached
+
+    state = _load(session, user_id)
+    with _lock:
+        _cache.setdefault(key, {})[user_id] = state
+    return state
+
+
+def get_active_goal_content(session: Session, user_id: int) -> str | None:
+    return get_goal_state(session, user_id).active_content
+
+
+def invalidate(session: Session, user_id: int) -> None:
+    key = _engine_key(session)
+    with _lock:
+        entries = _cache.get(key)
+        if entries is not None:
+            entries.pop(user_id, None)
+
+
+def clear() -> None:
+    with _lock:
+        _cache.clear()
@@ -6,6 +6,7 @@ import sqlalchemy as sa
 from sqlmodel import Session, select
 
 from app.models.goal import Goal
+from app.repositories import goal_cache
 
 
 def deactivate_active_goals(session: Session, user_id: int) -> None:
@@ -16,6 +17,7 @@ def deactivate_active_goals(session: Session, user_id: int) -> None:
         .values(is_active=False)
     )
     session.exec(statement)
+    goal_cache.invalidate(session, user_id)
 
 
 def get_next_goal_version(session: Session, user_id: int) -> int:
@@ -31,4 +33,5 @@ def get_next_goal_version(session: Session, user_id: int) -> int:
 def add_goal(session: Session, goal: Goal) -> Goal:
     session.add(goal)
     session.flush()
+    goal_cache.invalidate(session, goal.user_id)
     return goal
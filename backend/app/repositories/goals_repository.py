@@ -1,11 +1,14 @@
 from __future__ import annotations
 
+from datetime import datetime, timezone
 from typing import Any
 
 import sqlalchemy as sa
+from sqlalchemy.orm import make_transient_to_detached
 from sqlmodel import Session, select
 
 from app.models.goal import Goal
+from app.repositories import goal_cache
 
 
 def get_active_goal(session: Session, user_id: int) -> Goal | None:
@@ -38,15 +41,29 @@ def deactivate_active_goal(session: Session, user_id: int) -> None:
         .values(is_active=False)
     )
     session.exec(statement)
+    goal_cache.invalidate(session, user_id)
 
 
 def insert_goal(
     session: Session,
     user_id: int,
     content: str,
-    version: int,
+    version: int | None = None,
     is_active: bool = True,
 ) -> Goal:
+    """Insert a goal; with ``version=None`` the next version is computed in SQL.
+
+    Where the dialect supports RETURNING, the version is assigned by a single
+    INSERT ... SELECT max(version) + 1 and the returned Goal is built from
+    the RETURNING row, detached from ``session`` so a later commit does not
+    expire it and no refresh round trip is needed.
+    """
+
+    if version is None and session.get_bind().dialect.insert_returning:
+        return _insert_next_version(session, user_id, content, is_active)
+    if version is None:
+        version = (get_max_goal_version(session, user_id) or 0) + 1
+
     goal = Goal(
         user_id=user_id,
         content=content,
@@ -55,4 +72,35 @@ def insert_goal(
     )
     session.add(goal)
     session.flush()
+    goal_cache.invalidate(session, user_id)
+    return goal
+
+
+def _insert_next_version(session: Session, user_id: int, content: str, is_active: bool) -> Goal:
+    created_at = datetime.now(timezone.utc)
+    next_version = sa.func.coalesce(sa.func.max(Goal.version), 0) + 1
+    source = sa.select(
+        sa.literal(user_id, sa.Integer),
+        sa.literal(content, sa.String),
+        next_version,
+        sa.literal(is_active, sa.Boolean),
+        sa.literal(created_at, sa.DateTime),
+    ).where(Goal.user_id == user_id)
+    statement = (
+        sa.insert(Goal)
+        .from_select(["user_id", "content", "version", "is_active", "created_at"], source)
+        .returning(Goal.id, Goal.version)
+    )
+    goal_id, version = session.exec(statement).one()
+    goal_cache.invalidate(session, user_id)
+
+    goal = Goal(
+        id=goal_id,
+        user_id=user_id,
+        content=content,
+        version=version,
+        is_active=is_active,
+        created_at=created_at,
+    )
+    make_transient_to_detached(goal)
     return goal
@@ -1,12 +1,22 @@
 from __future__ import annotations
 
+import json
+import re
 from datetime import date, datetime, timezone
-from typing import Any
+from typing import Any, Callable
 from uuid import UUID
 
+import sqlalchemy as sa
+from sqlalchemy.dialects.postgresql import ARRAY, JSONB
+from sqlalchemy.orm.attributes import set_committed_value
+from sqlalchemy.orm.exc import StaleDataError
 from sqlmodel import Session, select
 
 from app.models.session import Session as SessionModel
+from app.models.types import compression_active
+
+# Top-level meta_data keys written in SQL; kept plain so they are valid JSON paths on every dialect.
+_META_KEY = re.compile(r"[A-Za-z0-9_]+")
 
 
 def create_phase1_session(
@@ -53,6 +63,107 @@ def get_session_by_id(session: Session, session_id: UUID) -> SessionModel | None
     return session.get(SessionModel, session_id)
 
 
+def _json_array_check(dialect_name: str, column: Any) -> Any:
+    if dialect_name == "postgresql":
+        return sa.func.json_typeof(column) == "array"
+    return sa.func.json_type(column) == "array"
+
+
+def log_append_expression(dialect_name: str, entries: list[dict[str, Any]]) -> Any:
+    """SQL expression appending ``entries`` to ``sessions.log_json`` without resending the log.
+
+    ``json_insert(log, '$[#]', ...)`` on SQLite, ``jsonb ||`` on Postgres;
+    None for other dialects.
+    """
+
+    column = SessionModel.__table__.c.log_json
+    if dialect_name == "sqlite":
+        args: list[Any] = []
+        for entry in entries:
+            args.extend(["$[#]", sa.func.json(_json_param(entry))])
+        return sa.func.json_insert(column, *args)
+    if dialect_name == "postgresql":
+        return sa.cast(sa.cast(column, JSONB).op("||")(sa.cast(_json_param(entries), JSONB)), sa.JSON)
+    return None
+
+
+def _partial_values(dialect_name: str, existing: SessionModel, fields: dict[str, Any]) -> dict[str, Any] | None:
+    """Column values for an in-place UPDATE of ``fields``, or None when a full ORM write is needed.
+
+    Appends to ``log_json`` become ``json_insert``/``||`` and changed
+    top-level ``meta_data`` keys become ``json_set``/``jsonb_set``; other
+    fields are bound as usual. Only used while compression is off, since a
+    compressed envelope cannot be patched in SQL.
+    """
+
+    if dialect_name not in ("sqlite", "postgresql") or compression_active():
+        return None
+    values: dict[str, Any] = {}
+    for key, value in fields.items():
+        current = getattr(existing, key)
+        if key == "log_json" and isinstance(value, list) and isinstance(current, list):
+            if len(value) < len(current) or value[: len(current)] != current:
+                return None
+            if len(value) > len(current):
+                values[key] = log_append_expression(dialect_name, value[len(current) :])
+        elif key == "meta_data" and isinstance(value, dict) and isinstance(current, dict):
+            if current.keys() - value.keys() or not all(_META_KEY.fullmatch(name) for name in value):
+                return None
+            changed = {name: item for name, item in value.items() if name not in current or current[name] != item}
+            if changed:
+                values[key] = meta_patch_expression(dialect_name, changed)
+        elif key in ("log_json", "meta_data"):
+            return None
+        else:
+            values[key] = value
+    return values
+
+
+def _apply_fields(session: Session, existing: SessionModel, fields: dict[str, Any]) -> None:
+    """Write ``fields`` to ``existing`` as a compare-and-swap on ``version``, then flush.
+
+    Log appends and metadata key changes are sent as in-place JSON updates
+    when possible; everything else goes through the ORM. Either way a
+    concurrent write raises StaleDataError.
+    """
+
+    if not fields:
+        return
+    dialect_name = session.get_bind().dialect.name
+    values = None if session.is_modified(existing) else _partial_values(dialect_name, existing, fields)
+    if values is None:
+        for key, value in fields.items():
+            setattr(existing, key, value)
+        session.add(existing)
+        session.flush()
+        return
+
+    table = SessionModel.__table__
+    statement = (
+        sa.update(table)
+        .where(table.c.id == existing.id)
+        .where(table.c.version == existing.version)
+        .values(**values, version=table.c.version + 1)
+    )
+    if "log_json" in values:
+        statement = statement.where(_json_array_check(dialect_name, table.c.log_json))
+    if session.exec(statement).rowcount == 1:
+        # Mirror the new state on the loaded row without marking it dirty.
+        for key, value in fields.items():
+            set_committed_value(existing, key, value)
+        set_committed_value(existing, "version", existing.version + 1)
+        return
+
+    stored_version = session.exec(select(SessionModel.version).where(SessionModel.id == existing.id)).first()
+    if stored_version != existing.version:
+        raise StaleDataError(f"session {existing.id} was modified concurrently")
+    # The stored log is a compressed envelope from an earlier configuration; rewrite it whole.
+    for key, value in fields.items():
+        setattr(existing, key, value)
+    session.add(existing)
+    session.flush()
+
+
 def update_session_log(
     session: Session,
     session_id: UUID,
@@ -61,9 +172,7 @@ def update_session_log(
     existing = session.get(SessionModel, session_id)
     if existing is None:
         return None
-    existing.log_json = log_json
-    session.add(existing)
-    session.flush()
+    _apply_fields(session, existing, {"log_json": log_json})
     return existing
 
 
@@ -75,14 +184,127 @@ def update_session(session: Session, session_id: UUID, **fields: Any) -> Session
     existing = session.get(SessionModel, session_id)
     if existing is None:
         return None
-    for key, value in fields.items():
-        if hasattr(existing, key):
-            setattr(existing, key, value)
-    session.add(existing)
-    session.flush()
+    _apply_fields(session, existing, {key: value for key, value in fields.items() if hasattr(existing, key)})
     return existing
 
 
+class SessionConflictError(RuntimeError):
+    """Raised when a session keeps changing underneath a versioned update."""
+
+
+def update_session_with_retry(
+    session: Session,
+    session_id: UUID,
+    build_fields: Callable[[SessionModel], dict[str, Any]],
+    max_attempts: int = 3,
+) -> SessionModel | None:
+    """Set ``build_fields(current_row)`` on the session and flush, retrying on version conflicts.
+
+    Every ORM UPDATE of a session is a compare-and-swap on its ``version``.
+    When another writer committed since the row was read, the flush raises
+    StaleDataError; the transaction is rolled back, the row re-read and
+    ``build_fields`` re-applied to the fresh state, up to ``max_attempts``
+    times. Returns None if the session does not exist; the caller commits.
+    """
+
+    for _attempt in range(max(1, max_attempts)):
+        existing = session.get(SessionModel, session_id)
+        if existing is None:
+            return None
+        try:
+            _apply_fields(session, existing, build_fields(existing))
+            return existing
+        except StaleDataError:
+            session.rollback()
+    raise SessionConflictError(f"session {session_id} was modified concurrently")
+
+
+def _check_meta_key(key: str) -> str:
+    if not _META_KEY.fullmatch(key):
+        raise ValueError(f"unsupported meta_data key: {key!r}")
+    return key
+
+
+def _json_param(value: Any) -> Any:
+    return sa.bindparam(None, json.dumps(value, ensure_ascii=False), type_=sa.String())
+
+
+def meta_patch_expression(
+    dialect_name: str,
+    set_keys: dict[str, Any],
+    default_keys: dict[str, Any] | None = None,
+) -> Any:
+    """SQL expression applying top-level key writes to ``sessions.meta_data``.
+
+    ``set_keys`` overwrite (``json_set`` / ``jsonb_set``); ``default_keys``
+    are only written when absent (``json_insert`` / ``jsonb ||`` with the
+    existing document winning). Returns None for dialects without JSON
+    functions.
+    """
+
+    column = SessionModel.__table__.c.meta_data
+    default_keys = default_keys or {}
+    if dialect_name == "sqlite":
+        expression: Any = sa.func.coalesce(column, sa.literal_column("'{}'"))
+        if default_keys:
+            args: list[Any] = []
+            for key, value in default_keys.items():
+                args.extend([f"$.{_check_meta_key(key)}", sa.func.json(_json_param(value))])
+            expression = sa.func.json_insert(expression, *args)
+        if set_keys:
+            args = []
+            for key, value in set_keys.items():
+                args.extend([f"$.{_check_meta_key(key)}", sa.func.json(_json_param(value))])
+            expression = sa.func.json_set(expression, *args)
+        return expression
+    if dialect_name == "postgresql":
+        expression = sa.func.coalesce(sa.cast(column, JSONB), sa.literal_column("'{}'::jsonb"))
+        if default_keys:
+            for key in default_keys:
+                _check_meta_key(key)
+            expression = sa.cast(_json_param(default_keys), JSONB).op("||")(expression)
+        for key, value in set_keys.items():
+            expression = sa.func.jsonb_set(
+                expression,
+                sa.cast(sa.literal(f"{{{_check_meta_key(key)}}}", sa.String()), ARRAY(sa.Text())),
+                sa.cast(_json_param(value), JSONB),
+                sa.true(),
+            )
+        return sa.cast(expression, sa.JSON)
+    return None
+
+
+def patch_meta_data(
+    session: Session,
+    session_id: UUID,
+    set_keys: dict[str, Any],
+    default_keys: dict[str, Any] | None = None,
+) -> bool:
+    """Write top-level ``meta_data`` keys in place, without rewriting the document from Python.
+
+    Bumps ``version`` like any other write so concurrent versioned updates
+    re-read the row. Falls back to a read-modify-write on dialects without
+    JSON functions. Returns False if the session does not exist; the caller
+    commits.
+    """
+
+    table = SessionModel.__table__
+    expression = meta_patch_expression(session.get_bind().dialect.name, set_keys, default_keys)
+    if expression is not None:
+        statement = (
+            sa.update(table)
+            .where(table.c.id == session_id)
+            .values(meta_data=expression, version=table.c.version + 1)
+        )
+        return session.exec(statement).rowcount > 0
+
+    def _patched(current: SessionModel) -> dict[str, Any]:
+        meta_data = {**(default_keys or {}), **(current.meta_data or {}), **set_keys}
+        return {"meta_data": meta_data}
+
+    return update_session_with_retry(session, session_id, _patched) is not None
+
+
 def update_report_final(
     session: Session,
     session_id: UUID,
@@ -93,11 +315,8 @@ def update_report_final(
     existing = session.get(SessionModel, session_id)
     if existing is None:
         return None
-    existing.report_final = report_final
-    existing.edit_metrics = edit_metrics
-    existing.meta_data = meta_data
-    session.add(existing)
-    session.flush()
+    fields = {"report_final": report_final, "edit_metrics": edit_metrics, "meta_data": meta_data}
+    _apply_fields(session, existing, fields)
     return existing
 
 
@@ -109,3 +328,205 @@ def list_phase3_sessions(session: Session, user_id: int) -> list[SessionModel]:
         .order_by(SessionModel.session_date.desc(), SessionModel.created_at.desc())
     )
     return list(session.exec(statement).all())
+
+
+def list_session_meta(session: Session, user_id: int) -> list[tuple[int, dict[str, Any]]]:
+    """Return (phase, meta_data) for every session of the user, without loading logs."""
+
+    statement = select(SessionModel.phase, SessionModel.meta_data).where(SessionModel.user_id == user_id)
+    return [(int(phase), meta_data or {}) for phase, meta_data in session.exec(statement).all()]
+
+
+def list_phase3_sessions_between(
+    session: Session,
+    start_date: date,
+    end_date: date,
+    after: tuple[date, UUID] | None = None,
+    limit: int = 100,
+) -> list[SessionModel]:
+    """Page through Phase3 sessions in [start_date, end_date] ordered by (session_date, id)."""
+
+    statement = (
+        select(SessionModel)
+        .where(SessionModel.phase == 3)
+        .where(SessionModel.session_date >= start_date)
+        .where(SessionModel.session_date <= end_date)
+    )
+    if after is not None:
+        after_date, after_id = after
+        statement = statement.where(
+            sa.or_(
+                SessionModel.session_date > after_date,
+                sa.and_(SessionModel.session_date == after_date, SessionModel.id > after_id),
+            )
+        )
+    statement = statement.order_by(SessionModel.session_date.asc(), SessionModel.id.asc()).limit(limit)
+    return list(session.exec(statement).all())
+
+
+def count_turns(log_json: Any) -> int:
+    """Number of user messages in a session log."""
+
+    if not isinstance(log_json, list):
+        return 0
+    return sum(1 for entry in log_json if isinstance(entry, dict) and entry.get("role") == "user")
+
+
+def list_session_summaries(
+    session: Session,
+    user_id: int,
+    phase: int | None = None,
+    before: tuple[date, datetime, UUID] | None = None,
+    limit: int = 20,
+) -> tuple[list[dict[str, Any]], bool]:
+    """Page through a user's sessions, newest first, keyed on (session_date, created_at, id).
+
+    Returns (items, has_more). Only summary columns are selected; the turn
+    count comes from ``meta_data["turn_count"]`` and logs are loaded only for
+    page rows written before that key existed.
+    """
+
+    sort_key = (SessionModel.session_date, SessionModel.created_at, SessionModel.id)
+    statement = select(
+        SessionModel.id,
+        SessionModel.phase,
+        SessionModel.session_date,
+        SessionModel.created_at,
+        SessionModel.report_draft.is_not(None),
+        SessionModel.report_final.is_not(None),
+        SessionModel.meta_data["turn_count"].as_integer(),
+    ).where(SessionModel.user_id == user_id)
+    if phase is not None:
+        statement = statement.where(SessionModel.phase == phase)
+    if before is not None:
+        statement = statement.where(sa.tuple_(*sort_key) < tuple(before))
+    # One extra row tells whether another page exists without a COUNT query.
+    statement = statement.order_by(*(column.desc() for column in sort_key)).limit(limit + 1)
+
+    rows = session.exec(statement).all()
+    items = [
+        {
+            "id": row_id,
+            "phase": int(row_phase),
+            "session_date": session_date,
+            "created_at": created_at,
+            "has_draft": bool(has_draft),
+            "has_final": bool(has_final),
+            "turn_count": turn_count,
+        }
+        for row_id, row_phase, session_date, created_at, has_draft, has_final, turn_count in rows
+    ]
+    has_more = len(items) > limit
+    items = items[:limit]
+
+    missing = [item["id"] for item in items if item["turn_count"] is None]
+    if missing:
+        log_statement = select(SessionModel.id, SessionModel.log_json).where(SessionModel.id.in_(missing))
+        logs = {row_id: log_json for row_id, log_json in session.exec(log_statement).all()}
+        for item in items:
+            if item["turn_count"] is None:
+                item["turn_count"] = count_turns(logs.get(item["id"]))
+    return items, has_more
+
+
+def get_session_version(session: Session, session_id: UUID) -> tuple[int, int] | None:
+    """Return (phase, version) of a session without loading its log."""
+
+    row = session.exec(
+        select(SessionModel.phase, SessionModel.version).where(SessionModel.id == session_id)
+    ).first()
+    if row is None:
+        return None
+    return int(row[0]), int(row[1])
+
+
+def _chat_entries(log_json: Any) -> list[dict[str, Any]]:
+    if not isinstance(log_json, list):
+        return []
+    return [
+        {"index": index, "role": entry["role"], "content": entry["content"]}
+        for index, entry in enumerate(log_json)
+        if isinstance(entry, dict)
+        and isinstance(entry.get("role"), str)
+        and entry["role"] != "system"
+        and isinstance(entry.get("content"), str)
+    ]
+
+
+def _slice_entries_sql(
+    session: Session,
+    session_id: UUID,
+    after: int | None,
+    limit: int,
+) -> list[dict[str, Any]]:
+    entries = sa.func.json_each(SessionModel.log_json).table_valued("key", "value").alias("entries")
+    role = sa.func.json_extract(entries.c.value, "$.role")
+    statement = (
+        select(entries.c.key, role, sa.func.json_extract(entries.c.value, "$.content"))
+        .select_from(SessionModel)
+        .join(entries, sa.true())
+        .where(SessionModel.id == session_id)
+        .where(sa.func.json_type(entries.c.value, "$.role") == "text")
+        .where(role != "system")
+        .where(sa.func.json_type(entries.c.value, "$.content") == "text")
+    )
+    if after is None:
+        statement = statement.order_by(entries.c.key.desc())
+    else:
+        statement = statement.where(entries.c.key > after).order_by(entries.c.key)
+    rows = session.exec(statement.limit(limit)).all()
+    items = [{"index": int(index), "role": row_role, "content": content} for index, row_role, content in rows]
+    return items[::-1] if after is None else items
+
+
+def get_log_page(
+    session: Session,
+    session_id: UUID,
+    after: int | None = None,
+    limit: int = 50,
+) -> dict[str, Any] | None:
+    """Return a page of a session's chat entries (system prompt excluded), oldest first.
+
+    With ``after`` the page holds the entries whose log index is greater;
+    without it, the last ``limit`` entries (the tail shown when a session is
+    reopened). On SQLite the slice is taken in SQL with ``json_each`` so only
+    the page leaves the database; compressed logs and other dialects are
+    sliced in Python. Returns None if the session does not exist.
+    """
+
+    use_sql = session.get_bind().dialect.name == "sqlite"
+    columns = [SessionModel.phase, SessionModel.version]
+    if use_sql:
+        columns.append(sa.func.json_type(SessionModel.log_json))
+    else:
+        columns.append(SessionModel.log_json)
+    row = session.exec(select(*columns).where(SessionModel.id == session_id)).first()
+    if row is None:
+        return None
+    phase, version, log_info = row
+
+    # One extra entry tells whether more exist beyond the page.
+    if use_sql and log_info == "array":
+        items = _slice_entries_sql(session, session_id, after, limit + 1)
+    else:
+        if use_sql:
+            # Compressed envelope: opaque to json_each, decode through the column type.
+            log_info = session.exec(select(SessionModel.log_json).where(SessionModel.id == session_id)).first()
+        entries = _chat_entries(log_info)
+        if after is None:
+            items = entries[-(limit + 1) :]
+        else:
+            items = [entry for entry in entries if entry["index"] > after][: limit + 1]
+
+    overflow = len(items) > limit
+    if after is None:
+        items = items[1:] if overflow else items
+    else:
+        items = items[:limit]
+    return {
+        "phase": int(phase),
+        "version": int(version),
+        "items": items,
+        "has_more": overflow if after is not None else False,
+        "has_earlier": overflow if after is None else after > 0,
+    }
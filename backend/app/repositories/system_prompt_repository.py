@@ -0,0 +1,28 @@
+from __future__ import annotations
+
+from datetime import datetime, timezone
+
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlmodel import Session
+
+from app.models.system_prompt import SystemPrompt
+
+
+def get_prompt_content(session: Session, prompt_hash: str) -> str | None:
+    prompt = session.get(SystemPrompt, prompt_hash)
+    return prompt.content if prompt is not None else None
+
+
+def ensure_prompt(session: Session, prompt_hash: str, content: str) -> None:
+    """Insert the prompt unless a row with the same hash already exists."""
+
+    dialect = session.get_bind().dialect.name
+    values = {"prompt_hash": prompt_hash, "content": content, "created_at": datetime.now(timezone.utc)}
+    if dialect in ("sqlite", "postgresql"):
+        insert = sqlite.insert if dialect == "sqlite" else postgresql.insert
+        statement = insert(SystemPrompt).values(**values).on_conflict_do_nothing(index_elements=["prompt_hash"])
+        session.exec(statement)
+        return
+    if session.get(SystemPrompt, prompt_hash) is None:
+        session.add(SystemPrompt(**values))
+        session.flush()
@@ -0,0 +1,36 @@
+from __future__ import annotations
+
+from typing import Optional
+
+from pydantic import BaseModel
+
+
+class LLMLatencySummary(BaseModel):
+    count: int
+    avg: Optional[float] = None
+    p50: Optional[float] = None
+    p95: Optional[float] = None
+    max: Optional[float] = None
+
+
+class LLMUsageByModel(BaseModel):
+    model_name: str
+    calls: int
+    prompt_tokens: int
+    completion_tokens: int
+    total_tokens: int
+    estimated_cost: float
+    latency_ms_avg: Optional[float] = None
+
+
+class LLMUsageResponse(BaseModel):
+    user_id: int
+    calls: int
+    prompt_tokens: int
+    completion_tokens: int
+    total_tokens: int
+    estimated_cost: float
+    currency: str
+    latency_ms: LLMLatencySummary
+    ttft_ms: LLMLatencySummary
+    by_model: list[LLMUsageByModel]
@@ -0,0 +1,23 @@
+from __future__ import annotations
+
+from datetime import date, datetime
+from typing import Optional
+from uuid import UUID
+
+from pydantic import BaseModel
+
+
+class SessionSummary(BaseModel):
+    id: UUID
+    phase: int
+    session_date: date
+    created_at: datetime
+    has_draft: bool
+    has_final: bool
+    turn_count: int
+
+
+class SessionListResponse(BaseModel):
+    user_id: int
+    items: list[SessionSummary]
+    next_cursor: Optional[str] = None
@@ -0,0 +1,19 @@
+from __future__ import annotations
+
+from uuid import UUID
+
+from pydantic import BaseModel
+
+
+class SessionTurnEntry(BaseModel):
+    index: int
+    role: str
+    content: str
+
+
+class SessionTurnsResponse(BaseModel):
+    session_id: UUID
+    phase: int
+    items: list[SessionTurnEntry]
+    has_more: bool
+    has_earlier: bool
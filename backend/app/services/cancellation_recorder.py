@@ -0,0 +1,51 @@
+"""Record pipeline runs that were cancelled because the client disconnected."""
+
+from __future__ import annotations
+
+import logging
+from datetime import datetime, timezone
+from typing import Any
+from uuid import UUID
+
+from sqlalchemy.exc import SQLAlchemyError
+from sqlmodel import Session
+
+from app.core import config as app_config
+from app.repositories import session_repository
+from app.utils.stage_timer import StageTimer
+
+logger = logging.getLogger(__name__)
+
+
+def record_cancellation(session: Session, session_id: UUID, timer: StageTimer, **extra: Any) -> None:
+    """Append a cancellation entry to ``meta_data["cancellations"]`` and commit.
+
+    Called from the ``asyncio.CancelledError`` handler of a pipeline before
+    it writes its result, so the turn / draft itself is never persisted
+    (``persisted: False``). Failures are logged, never raised, so the
+    cancellation still propagates.
+    """
+
+    entry = {
+        "pipeline": timer.pipeline,
+        **extra,
+        "cancelled_at": datetime.now(timezone.utc).isoformat(),
+        "persisted": False,
+        "stages_ms": timer.timings_ms(),
+    }
+    try:
+        session.rollback()
+        existing = session_repository.get_session_by_id(session, session_id)
+        if existing is None:
+            return
+        meta_data = dict(existing.meta_data or {})
+        entries = list(meta_data.get("cancellations") or [])
+        entries.append(entry)
+        max_entries = app_config.CANCELLATIONS_MAX_ENTRIES
+        meta_data["cancellations"] = entries[-max_entries:] if max_entries > 0 else entries
+        session_repository.update_session(session, session_id, meta_data=meta_data)
+        session.commit()
+    except SQLAlchemyError:
+        session.rollback()
+        logger.warning("Failed to record cancellation for session %s", session_id, exc_info=True)
+    logger.info("Cancelled %s for session %s after client disconnect", timer.pipeline, session_id)
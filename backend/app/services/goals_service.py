@@ -4,7 +4,7 @@ from sqlalchemy.exc import IntegrityError
 from sqlmodel import Session
 
 from app.models.goal import Goal
-from app.repositories import goals_repo
+from app.repositories import goal_cache, goals_repo
 
 
 class GoalActivationConflictError(RuntimeError):
@@ -29,6 +29,7 @@ def activate_new_goal(session: Session, user_id: int, content: str) -> Goal:
                 is_active=True,
             )
             goals_repo.add_goal(session, goal)
+        goal_cache.invalidate(session, user_id)
         session.refresh(goal)
         return goal
     except IntegrityError as exc:
@@ -6,6 +6,7 @@ from typing import Any
 
 from app.config.llm_config import LLMConfig
 from app.utils.prompt_hash import generate_prompt_hash
+from app.utils.token_estimator import estimate_tokens
 
 
 def build_llm_metadata(
@@ -39,3 +40,83 @@ def build_llm_metadata(
         metadata["config_max_turns"] = config_max_turns
 
     return metadata
+
+
+def build_llm_usage(
+    system_prompt: str,
+    user_prompt: str,
+    response: str,
+    latency_seconds: float,
+    ttft_seconds: float | None = None,
+    provider_usage: dict[str, int] | None = None,
+) -> dict[str, Any]:
+    """Build latency and token usage for one LLM call.
+
+    Provider-reported token counts are used when available; otherwise they
+    are estimated from the prompt and response text.
+    """
+
+    provider_usage = provider_usage or {}
+    prompt_tokens = provider_usage.get("prompt_tokens")
+    completion_tokens = provider_usage.get("completion_tokens")
+    usage_source = "provider" if prompt_tokens is not None and completion_tokens is not None else "estimate"
+    if prompt_tokens is None:
+        prompt_tokens = estimate_tokens(system_prompt) + estimate_tokens(user_prompt)
+    if completion_tokens is None:
+        completion_tokens = estimate_tokens(response)
+
+    return {
+        "latency_ms": round(latency_seconds * 1000, 3),
+        "ttft_ms": round(ttft_seconds * 1000, 3) if ttft_seconds is not None else None,
+        "prompt_tokens": int(prompt_tokens),
+        "completion_tokens": int(completion_tokens),
+        "total_tokens": int(prompt_tokens) + int(completion_tokens),
+        "usage_source": usage_source,
+        "response_chars": len(response or ""),
+    }
+
+
+_USAGE_ENTRY_KEYS = (
+    "provider",
+    "model_name",
+    "latency_ms",
+    "ttft_ms",
+    "prompt_tokens",
+    "completion_tokens",
+    "usage_source",
+)
+
+
+def merge_llm_usage(
+    meta_data: dict[str, Any] | None,
+    llm_meta_data: dict[str, Any] | None,
+    max_entries: int,
+    **extra: Any,
+) -> dict[str, Any]:
+    """Return a copy of ``meta_data`` with one LLM call's usage appended.
+
+    ``llm_usage`` keeps the most recent ``max_entries`` calls for latency
+    percentiles; ``llm_usage_totals`` keeps per-model running totals so
+    token and cost aggregates stay exact once old entries are dropped.
+    """
+
+    merged = dict(meta_data or {})
+    if not llm_meta_data or "latency_ms" not in llm_meta_data:
+        return merged
+
+    entry = {**extra, **{key: llm_meta_data.get(key) for key in _USAGE_ENTRY_KEYS}}
+    entries = list(merged.get("llm_usage") or [])
+    entries.append(entry)
+    merged["llm_usage"] = entries[-max_entries:] if max_entries > 0 else entries
+
+    totals = {model: dict(values) for model, values in (merged.get("llm_usage_totals") or {}).items()}
+    model_totals = totals.setdefault(
+        str(entry["model_name"]),
+        {"calls": 0, "prompt_tokens": 0, "completion_tokens": 0, "latency_ms": 0.0},
+    )
+    model_totals["calls"] += 1
+    model_totals["prompt_tokens"] += int(entry["prompt_tokens"] or 0)
+    model_totals["completion_tokens"] += int(entry["completion_tokens"] or 0)
+    model_totals["latency_ms"] = round(model_totals["latency_ms"] + float(entry["latency_ms"] or 0.0), 3)
+    merged["llm_usage_totals"] = totals
+    return merged
@@ -0,0 +1,176 @@
+"""Write-behind buffer for non-critical ``sessions.meta_data`` keys.
+
+Timestamps that do not need to be durable when the response is sent (such
+as ``report_final_saved_at``) are queued here instead of being merged into a
+full ``meta_data`` rewrite. Safety flags and ``turn_count`` are never queued:
+they stay in the synchronous versioned write of the turn. Pending keys are coalesced per session (the latest
+value wins) and flushed in one transaction per database as in-place
+``json_set`` / ``jsonb_set`` patches, every ``META_WRITE_BEHIND_FLUSH_SECONDS``,
+when ``META_WRITE_BEHIND_MAX_PENDING`` sessions are waiting (handed to the
+background flusher, never run on the caller's thread), and on shutdown.
+Keys still pending when the process dies are lost.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import logging
+import threading
+import weakref
+from dataclasses import dataclass, field
+from typing import Any, Dict
+from uuid import UUID
+
+from sqlalchemy.exc import SQLAlchemyError
+from sqlmodel import Session
+
+from app.core import config as app_config
+from app.repositories import session_repository
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(slots=True)
+class _Pending:
+    set_keys: Dict[str, Any] = field(default_factory=dict)
+    default_keys: Dict[str, Any] = field(default_factory=dict)
+
+    def merge(self, set_keys: Dict[str, Any], default_keys: Dict[str, Any]) -> None:
+        self.set_keys.update(set_keys)
+        for key, value in default_keys.items():
+            if key not in self.set_keys:
+                self.default_keys.setdefault(key, value)
+
+    def merge_older(self, older: "_Pending") -> None:
+        """Fold in patches queued before this one (this one's values win)."""
+
+        for key, value in older.set_keys.items():
+            self.set_keys.setdefault(key, value)
+        for key, value in older.default_keys.items():
+            if key not in self.set_keys:
+                self.default_keys.setdefault(key, value)
+
+
+def _engine_key(session: Session) -> Any:
+    bind = session.get_bind()
+    return getattr(bind, "engine", bind)
+
+
+class MetaWriteBuffer:
+    def __init__(self, max_pending: int | None = None) -> None:
+        self.max_pending = max_pending if max_pending is not None else app_config.META_WRITE_BEHIND_MAX_PENDING
+        self._pending: "weakref.WeakKeyDictionary[Any, Dict[UUID, _Pending]]" = weakref.WeakKeyDictionary()
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._flush_requested = False
+        # Set while run() is active: the flusher's loop and the event that wakes it early.
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._wake: asyncio.Event | None = None
+
+    def enqueue(
+        self,
+        session: Session,
+        session_id: UUID,
+        set_keys: Dict[str, Any] | None = None,
+        default_keys: Dict[str, Any] | None = None,
+    ) -> None:
+        """Queue top-level key writes; ``default_keys`` only apply when the key is absent."""
+
+        with self._lock:
+            pending = self._pending.setdefault(_engine_key(session), {})
+            pending.setdefault(session_id, _Pending()).merge(set_keys or {}, default_keys or {})
+            backlog = sum(len(entries) for entries in self._pending.values())
+        if backlog >= self.max_pending:
+            self._request_flush()
+
+    def _request_flush(self) -> None:
+        """Ask for an early flush without doing database work on the calling (possibly event-loop) thread."""
+
+        with self._lock:
+            if self._flush_requested:
+                return
+            self._flush_requested = True
+        loop, wake = self._loop, self._wake
+        if loop is not None and wake is not None and not loop.is_closed():
+            loop.call_soon_threadsafe(wake.set)
+            return
+        # No background flusher (scripts, tests): flush on a short-lived worker thread.
+        threading.Thread(target=self.flush, name="meta-write-behind-flush", daemon=True).start()
+
+    def pending_count(self) -> int:
+        with self._lock:
+            return sum(len(entries) for entries in self._pending.values())
+
+    def _requeue(self, engine: Any, batch: Dict[UUID, _Pending]) -> None:
+        with self._lock:
+            pending = self._pending.setdefault(engine, {})
+            for session_id, older in batch.items():
+                newer = pending.get(session_id)
+                if newer is None:
+                    pending[session_id] = older
+                else:
+                    newer.merge_older(older)
+
+    def flush(self) -> int:
+        """Apply every pending patch; returns the number of sessions written."""
+
+        with self._flush_lock:
+            with self._lock:
+                batches = list(self._pending.items())
+                self._pending = weakref.WeakKeyDictionary()
+                self._flush_requested = False
+            written = 0
+            for engine, batch in batches:
+                try:
+                    with Session(engine) as db:
+                        for session_id, pending in batch.items():
+                            if session_repository.patch_meta_data(
+                                db, session_id, pending.set_keys, pending.default_keys
+                            ):
+                                written += 1
+                        db.commit()
+                except (SQLAlchemyError, session_repository.SessionConflictError):
+                    logger.warning(
+                        "meta_data write-behind flush failed; requeued %d session(s)", len(batch), exc_info=True
+                    )
+                    self._requeue(engine, batch)
+            return written
+
+    async def run(self, interval_seconds: float) -> None:
+        """Flush every ``interval_seconds``, or sooner when the backlog is full, until cancelled."""
+
+        self._loop = asyncio.get_running_loop()
+        self._wake = asyncio.Event()
+        try:
+            while True:
+                with contextlib.suppress(asyncio.TimeoutError):
+                    await asyncio.wait_for(self._wake.wait(), interval_seconds)
+                self._wake.clear()
+                if self.pending_count():
+                    await asyncio.to_thread(self.flush)
+        finally:
+            self._loop = None
+            self._wake = None
+
+
+_buffer: MetaWriteBuffer | None = None
+_buffer_lock = threading.Lock()
+
+
+def get_meta_write_buffer() -> MetaWriteBuffer:
+    global _buffer
+    if _buffer is None:
+        with _buffer_lock:
+            if _buffer is None:
+                _buffer = MetaWriteBuffer()
+    return _buffer
+
+
+def reset_meta_write_buffer(max_pending: int | None = None) -> MetaWriteBuffer:
+    """Replace the process-wide buffer (used by tests)."""
+
+    global _buffer
+    with _buffer_lock:
+        _buffer = MetaWriteBuffer(max_pending)
+    return _buffer
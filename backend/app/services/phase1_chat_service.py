@@ -1,17 +1,28 @@
 from __future__ import annotations
 
-from typing import Any
+import asyncio
+from typing import Any, Callable
 from uuid import UUID
 
 from sqlalchemy.exc import SQLAlchemyError
 from sqlmodel import Session
 
 from app.config.llm_config import LLMConfig
+from app.core import config as app_config
+from app.llm.base import LLMCircuitOpenError, LLMRetryableError
 from app.llm.factory import get_llm_client
+from app.llm.resilient_client import with_resilience
+from app.llm.scheduler import LLMPriority, get_llm_scheduler
+from app.models.session import Session as SessionModel
 from app.repositories import session_repository
 from app.safety.safety_detector import detect_high_risk
 from app.safety.safety_rules import ESCALATION_RESPONSE, SAFETY_VERSION
+from app.services import turn_coalescer
+from app.services.cancellation_recorder import record_cancellation
+from app.services.llm_metadata_builder import merge_llm_usage
 from app.utils.prompt_builder import build_system_prompt
+from app.utils.stage_timer import StageTimer, merge_stage_timings
+from app.utils.token_estimator import estimate_tokens
 
 
 class Phase1ChatError(RuntimeError):
@@ -34,10 +45,22 @@ class LLMGenerateError(Phase1ChatError):
     """Raised when the LLM fails to generate a response."""
 
 
+class LLMUnavailableError(LLMGenerateError):
+    """Raised when the LLM stays unavailable after retries or the breaker is open."""
+
+
 class SessionUpdateError(Phase1ChatError):
     """Raised when a session update fails."""
 
 
+class SessionConflictError(SessionUpdateError):
+    """Raised when concurrent writes to the session keep conflicting."""
+
+
+class IdempotencyKeyReuseError(Phase1ChatError):
+    """Raised when an Idempotency-Key is reused for a different message."""
+
+
 def _normalize_log_json(log_json: Any) -> list[dict[str, Any]]:
     if isinstance(log_json, list):
         return list(log_json)
@@ -46,74 +69,140 @@ def _normalize_log_json(log_json: Any) -> list[dict[str, Any]]:
     return []
 
 
+def _commit_turn(
+    session: Session,
+    session_id: UUID,
+    timer: StageTimer,
+    build_fields: Callable[[SessionModel], dict[str, Any]],
+) -> int:
+    """Write the turn with a versioned update (re-applied on conflict), commit, return its turn index."""
+
+    try:
+        with timer.stage("commit"):
+            updated = session_repository.update_session_with_retry(
+                session,
+                session_id,
+                build_fields,
+                max_attempts=app_config.SESSION_WRITE_MAX_ATTEMPTS,
+            )
+            if updated is None:
+                raise SessionNotFoundError("session not found")
+            turn_index = len(updated.log_json) - 1
+            session.commit()
+    except session_repository.SessionConflictError as exc:
+        raise SessionConflictError("session was modified concurrently, please retry") from exc
+    except SQLAlchemyError as exc:
+        session.rollback()
+        raise SessionUpdateError("Failed to update session log") from exc
+    return turn_index
+
+
 async def append_phase1_turn(
     session: Session,
     session_id: UUID,
     message: str,
+    idempotency_key: str | None = None,
 ) -> tuple[str, int, bool]:
     cleaned = message.strip() if message is not None else ""
     if not cleaned:
         raise InvalidMessageError("message must not be empty")
 
-    existing = session_repository.get_session_by_id(session, session_id)
+    try:
+        return await turn_coalescer.run_turn(
+            session_id,
+            idempotency_key,
+            cleaned,
+            lambda: _append_phase1_turn(session, session_id, cleaned),
+        )
+    except turn_coalescer.IdempotencyKeyReuseError as exc:
+        raise IdempotencyKeyReuseError(str(exc)) from exc
+
+
+async def _append_phase1_turn(
+    session: Session,
+    session_id: UUID,
+    cleaned: str,
+) -> tuple[str, int, bool]:
+    timer = StageTimer("phase1_turn")
+    with timer.stage("load"):
+        existing = session_repository.get_session_by_id(session, session_id)
     if existing is None:
         raise SessionNotFoundError("session not found")
     if existing.phase != 1:
         raise PhaseMismatchError("phase mismatch")
 
-    if detect_high_risk(cleaned):
-        updated_log = _normalize_log_json(existing.log_json)
-        updated_log.append({"role": "user", "content": cleaned})
-        updated_log.append({"role": "assistant", "content": ESCALATION_RESPONSE})
-
-        meta_data = dict(existing.meta_data or {})
-        meta_data.setdefault("safety_version", SAFETY_VERSION)
-        meta_data["safety_triggered"] = True
-        meta_data["safety_reason"] = "high_risk_keyword"
-
-        try:
-            updated = session_repository.update_session(
-                session=session,
-                session_id=existing.id,
-                log_json=updated_log,
-                meta_data=meta_data,
-            )
-            if updated is None:
-                raise SessionNotFoundError("session not found")
-            session.commit()
-            session.refresh(updated)
-        except SQLAlchemyError as exc:
-            session.rollback()
-            raise SessionUpdateError("Failed to update session log") from exc
-
-        turn_index = len(updated_log) - 1
+    with timer.stage("safety"):
+        high_risk = detect_high_risk(cleaned)
+
+    if high_risk:
+
+        def _escalation_fields(current: SessionModel) -> dict[str, Any]:
+            log_json = _normalize_log_json(current.log_json)
+            log_json.append({"role": "user", "content": cleaned})
+            log_json.append({"role": "assistant", "content": ESCALATION_RESPONSE})
+
+            meta_data = dict(current.meta_data or {})
+            meta_data.setdefault("safety_version", SAFETY_VERSION)
+            meta_data["safety_triggered"] = True
+            meta_data["safety_reason"] = "high_risk_keyword"
+            meta_data["turn_count"] = session_repository.count_turns(log_json)
+            if app_config.STAGE_TIMINGS_IN_META:
+                meta_data = merge_stage_timings(
+                    meta_data,
+                    timer,
+                    app_config.STAGE_TIMINGS_MAX_ENTRIES,
+                    turn_index=len(log_json) - 1,
+                )
+            return {"log_json": log_json, "meta_data": meta_data}
+
+        turn_index = _commit_turn(session, existing.id, timer, _escalation_fields)
         return ESCALATION_RESPONSE, turn_index, True
 
-    system_prompt = build_system_prompt("phase1")
-    llm_client = get_llm_client(LLMConfig())
+    with timer.stage("prompt"):
+        system_prompt = build_system_prompt("phase1")
+    llm_client = with_resilience(get_llm_client(LLMConfig()))
 
     try:
-        assistant_response = await llm_client.generate(system_prompt, cleaned)
+        async with get_llm_scheduler().slot(
+            user_id=existing.user_id,
+            priority=LLMPriority.INTERACTIVE,
+            tokens=estimate_tokens(system_prompt) + estimate_tokens(cleaned),
+        ) as ticket:
+            with timer.stage("llm"):
+                llm_result = await llm_client.generate_result(system_prompt, cleaned)
+            ticket.record_completion(llm_result.text)
+    except asyncio.CancelledError:
+        record_cancellation(session, existing.id, timer)
+        raise
+    except (LLMRetryableError, LLMCircuitOpenError) as exc:
+        raise LLMUnavailableError("LLM is temporarily unavailable") from exc
     except Exception as exc:  # noqa: BLE001
         raise LLMGenerateError("LLM generation failed") from exc
-
-    updated_log = _normalize_log_json(existing.log_json)
-    updated_log.append({"role": "user", "content": cleaned})
-    updated_log.append({"role": "assistant", "content": assistant_response})
-
-    try:
-        updated = session_repository.update_session_log(
-            session=session,
-            session_id=existing.id,
-            log_json=updated_log,
+    timer.record("llm_queue", ticket.wait_seconds)
+    assistant_response = llm_result.text
+
+    def _turn_fields(current: SessionModel) -> dict[str, Any]:
+        log_json = _normalize_log_json(current.log_json)
+        log_json.append({"role": "user", "content": cleaned})
+        log_json.append({"role": "assistant", "content": assistant_response})
+        turn_index = len(log_json) - 1
+
+        meta_data = merge_llm_usage(
+            current.meta_data,
+            llm_result.meta_data,
+            app_config.LLM_USAGE_MAX_ENTRIES,
+            pipeline="phase1_turn",
+            turn_index=turn_index,
         )
-        if updated is None:
-            raise SessionNotFoundError("session not found")
-        session.commit()
-        session.refresh(updated)
-    except SQLAlchemyError as exc:
-        session.rollback()
-        raise SessionUpdateError("Failed to update session log") from exc
+        meta_data["turn_count"] = session_repository.count_turns(log_json)
+        if app_config.STAGE_TIMINGS_IN_META:
+            meta_data = merge_stage_timings(
+                meta_data,
+                timer,
+                app_config.STAGE_TIMINGS_MAX_ENTRIES,
+                turn_index=turn_index,
+            )
+        return {"log_json": log_json, "meta_data": meta_data}
 
-    turn_index = len(updated_log) - 1
+    turn_index = _commit_turn(session, existing.id, timer, _turn_fields)
     return assistant_response, turn_index, False
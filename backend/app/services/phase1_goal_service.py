@@ -6,7 +6,7 @@ from sqlalchemy.exc import IntegrityError, SQLAlchemyError
 from sqlmodel import Session
 
 from app.models.goal import Goal
-from app.repositories import goals_repository, session_repository
+from app.repositories import goal_cache, goals_repository, session_repository
 
 
 class Phase1GoalConfirmError(RuntimeError):
@@ -66,32 +66,27 @@ def confirm_phase1_goal(
     if existing.phase != 1:
         raise PhaseMismatchError("phase mismatch")
 
+    # The session load above already opened the transaction; any failure below
+    # rolls it back as a whole, so no savepoint is needed. Round trips: UPDATE
+    # (deactivate), INSERT ... SELECT RETURNING (new version), UPDATE sessions
+    # (flushed by commit) and COMMIT.
+    user_id = existing.user_id
     try:
-        transaction = session.begin_nested() if session.in_transaction() else session.begin()
-        with transaction:
-            goals_repository.deactivate_active_goal(session, existing.user_id)
-            max_version = goals_repository.get_max_goal_version(session, existing.user_id)
-            next_version = (max_version or 0) + 1
-            goal = goals_repository.insert_goal(
-                session=session,
-                user_id=existing.user_id,
-                content=resolved_goal,
-                version=next_version,
-                is_active=True,
-            )
-            updated = session_repository.update_session(
-                session=session,
-                session_id=existing.id,
-                report_final=resolved_goal,
-            )
-            if updated is None:
-                raise SessionNotFoundError("session not found")
+        goals_repository.deactivate_active_goal(session, user_id)
+        goal = goals_repository.insert_goal(
+            session=session,
+            user_id=user_id,
+            content=resolved_goal,
+            is_active=True,
+        )
+        existing.report_final = resolved_goal
+        session.add(existing)
         session.commit()
-        session.refresh(goal)
+        goal_cache.invalidate(session, user_id)
         return goal
     except IntegrityError as exc:
         session.rollback()
-        raise GoalActivationConflictError(existing.user_id) from exc
+        raise GoalActivationConflictError(user_id) from exc
     except SQLAlchemyError as exc:
         session.rollback()
         raise GoalConfirmError("Failed to confirm Phase1 goal") from exc
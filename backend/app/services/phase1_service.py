@@ -8,6 +8,7 @@ from sqlmodel import Session
 from app.config.llm_config import LLMConfig
 from app.prompts.prompt_loader import resolve_prompt_version
 from app.repositories import session_repository
+from app.services import system_prompt_store
 from app.services.llm_metadata_builder import build_llm_metadata
 from app.utils.prompt_hash import generate_prompt_hash
 from app.utils.prompt_builder import build_system_prompt
@@ -25,12 +26,7 @@ def start_phase1_session(session: Session, user_id: int):
     prompt_hash = generate_prompt_hash(system_prompt)
     prompt_version = resolve_prompt_version("phase1")
 
-    log_json = [
-        {
-            "role": "system",
-            "content": system_prompt,
-        }
-    ]
+    log_json = [system_prompt_store.system_prompt_entry(prompt_hash)]
 
     meta_data = build_llm_metadata(
         LLMConfig(),
@@ -44,6 +40,7 @@ def start_phase1_session(session: Session, user_id: int):
     )
 
     try:
+        system_prompt_store.store_system_prompt(session, system_prompt)
         created_session = session_repository.create_phase1_session(
             session=session,
             user_id=user_id,
@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import asyncio
 from datetime import datetime, timezone
 import re
 from typing import Any
@@ -9,12 +10,23 @@ from sqlalchemy.exc import SQLAlchemyError
 from sqlmodel import Session
 
 from app.config.llm_config import LLMConfig
+from app.core import config as app_config
+from app.llm.base import LLMCircuitOpenError, LLMRetryableError
 from app.llm.factory import get_llm_client
+from app.llm.resilient_client import with_resilience
+from app.llm.scheduler import LLMPriority, get_llm_scheduler
 from app.prompts.prompt_loader import load_prompt, resolve_prompt_version
-from app.repositories import goals_repository, session_repository
+from app.models.session import Session as SessionModel
+from app.repositories import goal_cache, session_repository
+from app.services import system_prompt_store
+from app.services.cancellation_recorder import record_cancellation
+from app.services.llm_metadata_builder import merge_llm_usage
+from app.services.meta_write_buffer import get_meta_write_buffer
 from app.services.phase3_service import DEFAULT_GOAL_TEXT
 from app.utils.edit_metrics import compute_edit_metrics
 from app.utils.prompt_hash import generate_prompt_hash
+from app.utils.stage_timer import StageTimer, merge_stage_timings
+from app.utils.token_estimator import estimate_tokens
 
 ALWAYS_ON_GOAL_PLACEHOLDER = "{{ALWAYS_ON_GOAL}}"
 CHAT_LOG_PLACEHOLDER = "{{CHAT_LOG}}"
@@ -41,10 +53,18 @@ class LLMGenerateError(Phase3ReportError):
     """Raised when the LLM fails to generate a report."""
 
 
+class LLMUnavailableError(LLMGenerateError):
+    """Raised when the LLM stays unavailable after retries or the breaker is open."""
+
+
 class SessionUpdateError(Phase3ReportError):
     """Raised when a session update fails."""
 
 
+class SessionConflictError(SessionUpdateError):
+    """Raised when concurrent writes to the session keep conflicting."""
+
+
 class PromptLoadError(Phase3ReportError):
     """Raised when the report prompt cannot be loaded."""
 
@@ -61,20 +81,6 @@ def _normalize_log_json(log_json: Any) -> list[dict[str, Any]]:
     return []
 
 
-def _extract_system_prompt(log_json: list[dict[str, Any]]) -> str | None:
-    if not log_json:
-        return None
-    first = log_json[0]
-    if not isinstance(first, dict):
-        return None
-    if first.get("role") != "system":
-        return None
-    content = first.get("content")
-    if not isinstance(content, str) or not content.strip():
-        return None
-    return content
-
-
 def _extract_goal_from_system_prompt(system_prompt: str) -> str | None:
     if ALWAYS_ON_GOAL_PLACEHOLDER in system_prompt:
         return None
@@ -126,18 +132,14 @@ def _merge_report_final_metadata(
     return meta_data
 
 
-async def generate_phase3_report_draft(
-    session: Session,
-    session_id: UUID,
-) -> str:
-    existing = session_repository.get_session_by_id(session, session_id)
-    if existing is None:
-        raise SessionNotFoundError("session not found")
-    if existing.phase != 3:
-        raise PhaseMismatchError("phase mismatch")
+def build_report_prompt(session: Session, existing: SessionModel) -> tuple[str, str, str]:
+    """Build the report prompt for a Phase3 session.
+
+    Returns (report_prompt, prompt_version, prompt_hash).
+    """
 
     normalized_log = _normalize_log_json(existing.log_json)
-    system_prompt = _extract_system_prompt(normalized_log)
+    system_prompt = system_prompt_store.extract_system_prompt(session, normalized_log)
     if system_prompt is None:
         raise InvalidSessionLogError("invalid session log: missing system prompt")
 
@@ -149,9 +151,12 @@ async def generate_phase3_report_draft(
 
     goal_text = _extract_goal_from_system_prompt(system_prompt)
     if goal_text is None:
-        active_goal = goals_repository.get_active_goal(session, existing.user_id)
-        goal_text = active_goal.content if active_goal is not None else DEFAULT_GOAL_TEXT
+        active_goal_text = goal_cache.get_active_goal_content(session, existing.user_id)
+        goal_text = active_goal_text if active_goal_text is not None else DEFAULT_GOAL_TEXT
 
+    if "content" not in normalized_log[0]:
+        # Inline the hash-referenced prompt so the formatted log matches legacy rows.
+        normalized_log[0] = {**normalized_log[0], "content": system_prompt}
     formatted_log = _format_chat_log(normalized_log)
     report_prompt = base_prompt
     if ALWAYS_ON_GOAL_PLACEHOLDER in report_prompt:
@@ -160,33 +165,121 @@ async def generate_phase3_report_draft(
         report_prompt = report_prompt.replace(CHAT_LOG_PLACEHOLDER, formatted_log)
 
     prompt_hash = generate_prompt_hash(report_prompt)
+    return report_prompt, prompt_version, prompt_hash
 
-    llm_config = LLMConfig()
-    llm_client = get_llm_client(llm_config)
-    try:
-        report_draft = await llm_client.generate(report_prompt, "")
-    except Exception as exc:  # noqa: BLE001
-        raise LLMGenerateError("LLM generation failed") from exc
 
+def _report_draft_fields(
+    current: SessionModel,
+    report_draft: str,
+    prompt_version: str,
+    prompt_hash: str,
+    model_name: str,
+    timer: StageTimer | None = None,
+    llm_meta_data: dict[str, Any] | None = None,
+) -> dict[str, Any]:
     meta_data = _merge_report_metadata(
-        existing.meta_data,
+        current.meta_data,
         prompt_phase="phase3_report",
         prompt_version=prompt_version,
         prompt_hash=prompt_hash,
-        model_name=llm_config.model,
+        model_name=model_name,
     )
+    if llm_meta_data is not None:
+        meta_data = merge_llm_usage(
+            meta_data,
+            llm_meta_data,
+            app_config.LLM_USAGE_MAX_ENTRIES,
+            pipeline="phase3_report_draft",
+        )
+    if timer is not None:
+        meta_data = merge_stage_timings(meta_data, timer, app_config.STAGE_TIMINGS_MAX_ENTRIES)
+    return {"report_draft": report_draft, "meta_data": meta_data}
+
 
+def store_report_draft(
+    session: Session,
+    existing: SessionModel,
+    report_draft: str,
+    prompt_version: str,
+    prompt_hash: str,
+    model_name: str,
+    timer: StageTimer | None = None,
+    llm_meta_data: dict[str, Any] | None = None,
+) -> SessionModel | None:
+    """Stage report_draft and its generation metadata without committing."""
+
+    fields = _report_draft_fields(
+        existing,
+        report_draft,
+        prompt_version=prompt_version,
+        prompt_hash=prompt_hash,
+        model_name=model_name,
+        timer=timer,
+        llm_meta_data=llm_meta_data,
+    )
+    return session_repository.update_session(session=session, session_id=existing.id, **fields)
+
+
+async def generate_phase3_report_draft(
+    session: Session,
+    session_id: UUID,
+) -> str:
+    timer = StageTimer("phase3_report_draft")
+    with timer.stage("load"):
+        existing = session_repository.get_session_by_id(session, session_id)
+    if existing is None:
+        raise SessionNotFoundError("session not found")
+    if existing.phase != 3:
+        raise PhaseMismatchError("phase mismatch")
+
+    with timer.stage("prompt"):
+        report_prompt, prompt_version, prompt_hash = build_report_prompt(session, existing)
+
+    llm_config = LLMConfig()
+    llm_client = with_resilience(get_llm_client(llm_config))
     try:
-        updated = session_repository.update_session(
-            session=session,
-            session_id=existing.id,
-            report_draft=report_draft,
-            meta_data=meta_data,
+        async with get_llm_scheduler().slot(
+            user_id=existing.user_id,
+            priority=LLMPriority.REPORT,
+            tokens=estimate_tokens(report_prompt),
+        ) as ticket:
+            with timer.stage("llm"):
+                llm_result = await llm_client.generate_result(report_prompt, "")
+            ticket.record_completion(llm_result.text)
+    except asyncio.CancelledError:
+        record_cancellation(session, existing.id, timer)
+        raise
+    except (LLMRetryableError, LLMCircuitOpenError) as exc:
+        raise LLMUnavailableError("LLM is temporarily unavailable") from exc
+    except Exception as exc:  # noqa: BLE001
+        raise LLMGenerateError("LLM generation failed") from exc
+    timer.record("llm_queue", ticket.wait_seconds)
+    report_draft = llm_result.text
+
+    def _draft_fields(current: SessionModel) -> dict[str, Any]:
+        return _report_draft_fields(
+            current,
+            report_draft,
+            prompt_version=prompt_version,
+            prompt_hash=prompt_hash,
+            model_name=llm_config.model,
+            timer=timer if app_config.STAGE_TIMINGS_IN_META else None,
+            llm_meta_data=llm_result.meta_data,
         )
-        if updated is None:
-            raise SessionNotFoundError("session not found")
-        session.commit()
-        session.refresh(updated)
+
+    try:
+        with timer.stage("commit"):
+            updated = session_repository.update_session_with_retry(
+                session,
+                existing.id,
+                _draft_fields,
+                max_attempts=app_config.SESSION_WRITE_MAX_ATTEMPTS,
+            )
+            if updated is None:
+                raise SessionNotFoundError("session not found")
+            session.commit()
+    except session_repository.SessionConflictError as exc:
+        raise SessionConflictError("session was modified concurrently, please retry") from exc
     except SQLAlchemyError as exc:
         session.rollback()
         raise SessionUpdateError("Failed to update session report_draft") from exc
@@ -208,23 +301,36 @@ def save_phase3_report_final(
     if report_final is None or not report_final.strip():
         raise InvalidReportFinalError("report_final must not be empty")
 
-    metrics = compute_edit_metrics(existing.report_draft, report_final)
-    meta_data = _merge_report_final_metadata(existing.meta_data)
+    metrics: dict[str, int | float] = {}
+    write_behind = app_config.META_WRITE_BEHIND
+
+    def _final_fields(current: SessionModel) -> dict[str, Any]:
+        # Recomputed per attempt: a concurrent redraft changes the draft the edit is measured against.
+        metrics.clear()
+        metrics.update(compute_edit_metrics(current.report_draft, report_final))
+        fields: dict[str, Any] = {"report_final": report_final, "edit_metrics": dict(metrics)}
+        if not write_behind:
+            fields["meta_data"] = _merge_report_final_metadata(current.meta_data)
+        return fields
 
     try:
-        updated = session_repository.update_report_final(
-            session=session,
-            session_id=existing.id,
-            report_final=report_final,
-            edit_metrics=metrics,
-            meta_data=meta_data,
+        updated = session_repository.update_session_with_retry(
+            session,
+            existing.id,
+            _final_fields,
+            max_attempts=app_config.SESSION_WRITE_MAX_ATTEMPTS,
         )
         if updated is None:
             raise SessionNotFoundError("session not found")
         session.commit()
-        session.refresh(updated)
+    except session_repository.SessionConflictError as exc:
+        raise SessionConflictError("session was modified concurrently, please retry") from exc
     except SQLAlchemyError as exc:
         session.rollback()
         raise SessionUpdateError("Failed to update session report_final") from exc
 
+    if write_behind:
+        get_meta_write_buffer().enqueue(
+            session, existing.id, {"report_final_saved_at": datetime.now(timezone.utc).isoformat()}
+        )
     return metrics
@@ -7,7 +7,8 @@ from sqlmodel import Session
 
 from app.config.llm_config import LLMConfig
 from app.prompts.prompt_loader import load_prompt, resolve_prompt_version
-from app.repositories import goals_repository, session_repository
+from app.repositories import goal_cache, session_repository
+from app.services import system_prompt_store
 from app.services.llm_metadata_builder import build_llm_metadata
 from app.utils.prompt_hash import generate_prompt_hash
 from app.utils.prompt_builder import prepend_safety_guardrails
@@ -35,20 +36,15 @@ def start_phase3_session(session: Session, user_id: int):
     base_prompt = load_prompt("phase3")
     prompt_version = resolve_prompt_version("phase3")
 
-    active_goal = goals_repository.get_active_goal(session, user_id)
-    goal_injected = active_goal is not None
-    goal_text = active_goal.content if active_goal is not None else DEFAULT_GOAL_TEXT
+    active_goal_text = goal_cache.get_active_goal_content(session, user_id)
+    goal_injected = active_goal_text is not None
+    goal_text = active_goal_text if active_goal_text is not None else DEFAULT_GOAL_TEXT
 
     injected_prompt = _inject_goal(base_prompt, goal_text)
     injected_prompt = prepend_safety_guardrails(injected_prompt)
     prompt_hash = generate_prompt_hash(injected_prompt)
 
-    log_json = [
-        {
-            "role": "system",
-            "content": injected_prompt,
-        }
-    ]
+    log_json = [system_prompt_store.system_prompt_entry(prompt_hash)]
 
     meta_data = build_llm_metadata(
         LLMConfig(),
@@ -62,6 +58,7 @@ def start_phase3_session(session: Session, user_id: int):
     )
 
     try:
+        system_prompt_store.store_system_prompt(session, injected_prompt)
         created_session = session_repository.create_phase3_session(
             session=session,
             user_id=user_id,
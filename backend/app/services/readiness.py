@@ -0,0 +1,116 @@
+"""Readiness report for load balancer probes.
+
+The database round trip is cached for ``HEALTH_READY_CACHE_SECONDS`` and
+only one probe at a time refreshes it, so frequent probes neither hold pool
+connections nor queue on SQLite locks. Pool and LLM scheduler figures are
+in-memory reads and always current.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Any
+
+from sqlalchemy import text
+from sqlalchemy.exc import SQLAlchemyError
+from sqlmodel import Session
+
+from app.core import config as app_config
+from app.core import db
+from app.llm.scheduler import get_llm_scheduler
+
+
+@dataclass(frozen=True, slots=True)
+class DatabaseCheck:
+    ok: bool
+    latency_ms: float
+    checked_at: datetime
+    checked_monotonic: float
+    error: str | None = None
+
+
+_last_check: DatabaseCheck | None = None
+_refresh_lock = threading.Lock()
+
+
+def _fresh(check: DatabaseCheck | None, now: float) -> bool:
+    return check is not None and now - check.checked_monotonic < app_config.HEALTH_READY_CACHE_SECONDS
+
+
+def _ping(session: Session) -> DatabaseCheck:
+    started = time.perf_counter()
+    try:
+        session.exec(text("SELECT 1"))
+        error = None
+    except SQLAlchemyError as exc:
+        session.rollback()
+        error = type(exc).__name__
+    finally:
+        # Hand the connection back to the pool straight away.
+        session.close()
+    latency_ms = (time.perf_counter() - started) * 1000
+    return DatabaseCheck(error is None, latency_ms, datetime.now(timezone.utc), time.monotonic(), error)
+
+
+def check_database(session: Session) -> DatabaseCheck:
+    """Return the cached database check, refreshing it when older than the TTL."""
+
+    global _last_check
+    check = _last_check
+    if _fresh(check, time.monotonic()):
+        return check
+    with _refresh_lock:
+        # Another probe may have refreshed it while this one waited.
+        check = _last_check
+        if _fresh(check, time.monotonic()):
+            return check
+        check = _ping(session)
+        _last_check = check
+        return check
+
+
+def pool_stats(session: Session) -> dict[str, Any]:
+    return _pool_stats(session.get_bind().pool)
+
+
+def _pool_stats(pool: Any) -> dict[str, Any]:
+    stats: dict[str, Any] = {"class": type(pool).__name__}
+    for name in ("size", "checkedin", "checkedout", "overflow"):
+        method = getattr(pool, name, None)
+        if callable(method):
+            stats[name] = method()
+    return stats
+
+
+def readiness_report(session: Session) -> dict[str, Any]:
+    check = check_database(session)
+    scheduler = get_llm_scheduler().snapshot()
+    database: dict[str, Any] = {
+        "status": "ok" if check.ok else "error",
+        "latency_ms": round(check.latency_ms, 3),
+        "checked_at": check.checked_at.isoformat(),
+    }
+    if check.error is not None:
+        database["error"] = check.error
+    report: dict[str, Any] = {
+        "status": "ok" if check.ok else "unavailable",
+        "db": database,
+        "pool": pool_stats(session),
+        "llm_scheduler": {
+            "queue_depth": scheduler["queue_depth"],
+            "in_flight": scheduler["in_flight"],
+            "max_concurrency": scheduler["max_concurrency"],
+        },
+    }
+    if db.read_engine is not None:
+        report["read_pool"] = _pool_stats(db.read_engine.pool)
+    return report
+
+
+def clear() -> None:
+    global _last_check
+    with _refresh_lock:
+        _last_check = None
@@ -0,0 +1,77 @@
+"""Paged reads of a session's conversation with version-based ETags.
+
+The ETag is derived from the session's optimistic-lock ``version`` (bumped
+by every ORM write of the row) and the requested range, so a revalidation
+reads two columns instead of the log.
+"""
+
+from __future__ import annotations
+
+import hashlib
+from uuid import UUID
+
+from sqlmodel import Session
+
+from app.repositories import session_repository
+from app.schemas.session_turns_schema import SessionTurnEntry, SessionTurnsResponse
+
+DEFAULT_TURNS_PAGE_SIZE = 50
+MAX_TURNS_PAGE_SIZE = 200
+
+
+class SessionLogError(RuntimeError):
+    """Base error for session log reads."""
+
+
+class SessionNotFoundError(SessionLogError):
+    """Raised when a session is not found."""
+
+
+class PhaseMismatchError(SessionLogError):
+    """Raised when a session phase does not match the requested phase."""
+
+
+def turns_etag(session_id: UUID, version: int, after: int | None, limit: int) -> str:
+    raw = f"{session_id.hex}:{version}:{'tail' if after is None else after}:{limit}"
+    return '"' + hashlib.sha256(raw.encode("ascii")).hexdigest()[:32] + '"'
+
+
+def etag_matches(if_none_match: str | None, etag: str) -> bool:
+    if if_none_match is None:
+        return False
+    candidates = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+    return "*" in candidates or etag in candidates
+
+
+def _check_phase(found: int | None, phase: int) -> None:
+    if found is None:
+        raise SessionNotFoundError("session not found")
+    if found != phase:
+        raise PhaseMismatchError("phase mismatch")
+
+
+def current_turns_etag(session: Session, session_id: UUID, phase: int, after: int | None, limit: int) -> str:
+    """ETag of the page as it would be served now, without reading the log."""
+
+    row = session_repository.get_session_version(session, session_id)
+    _check_phase(row[0] if row is not None else None, phase)
+    return turns_etag(session_id, row[1], after, limit)
+
+
+def get_turns(
+    session: Session,
+    session_id: UUID,
+    phase: int,
+    after: int | None,
+    limit: int,
+) -> tuple[SessionTurnsResponse, str]:
+    page = session_repository.get_log_page(session, session_id, after=after, limit=limit)
+    _check_phase(page["phase"] if page is not None else None, phase)
+    body = SessionTurnsResponse(
+        session_id=session_id,
+        phase=page["phase"],
+        items=[SessionTurnEntry(**item) for item in page["items"]],
+        has_more=page["has_more"],
+        has_earlier=page["has_earlier"],
+    )
+    return body, turns_etag(session_id, page["version"], after, limit)
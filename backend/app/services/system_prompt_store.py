@@ -0,0 +1,100 @@
+"""Content-addressed system prompts referenced from session logs by hash.
+
+New sessions store ``{"role": "system", "prompt_hash": ...}`` as
+``log_json[0]``; the prompt text lives once in ``system_prompts``. Resolved
+prompts are kept in a per-engine LRU, which never needs invalidation since a
+hash always maps to the same content. Logs that still inline ``content``
+(rows written before the migration) keep resolving as before.
+
+The hash covers the normalized prompt (see ``generate_prompt_hash``), so
+prompts that differ only in whitespace share the first stored text.
+"""
+
+from __future__ import annotations
+
+import threading
+import weakref
+from collections import OrderedDict
+from typing import Any
+
+from sqlmodel import Session
+
+from app.core import config as app_config
+from app.repositories import system_prompt_repository
+from app.utils.prompt_hash import generate_prompt_hash
+
+_cache: "weakref.WeakKeyDictionary[Any, OrderedDict[str, str]]" = weakref.WeakKeyDictionary()
+_lock = threading.Lock()
+
+
+def _engine_key(session: Session) -> Any:
+    bind = session.get_bind()
+    return getattr(bind, "engine", bind)
+
+
+def _cache_get(session: Session, prompt_hash: str) -> str | None:
+    with _lock:
+        entries = _cache.get(_engine_key(session))
+        if entries is None or prompt_hash not in entries:
+            return None
+        entries.move_to_end(prompt_hash)
+        return entries[prompt_hash]
+
+
+def _cache_put(session: Session, prompt_hash: str, content: str) -> None:
+    size = app_config.SYSTEM_PROMPT_CACHE_SIZE
+    if size <= 0:
+        return
+    with _lock:
+        entries = _cache.setdefault(_engine_key(session), OrderedDict())
+        entries[prompt_hash] = content
+        entries.move_to_end(prompt_hash)
+        while len(entries) > size:
+            entries.popitem(last=False)
+
+
+def store_system_prompt(session: Session, content: str) -> str:
+    """Persist ``content`` (if new) in the caller's transaction and return its hash."""
+
+    prompt_hash = generate_prompt_hash(content)
+    # Always issue the idempotent insert: a cached hash may come from a rolled back transaction.
+    system_prompt_repository.ensure_prompt(session, prompt_hash, content)
+    _cache_put(session, prompt_hash, content)
+    return prompt_hash
+
+
+def system_prompt_entry(prompt_hash: str) -> dict[str, Any]:
+    return {"role": "system", "prompt_hash": prompt_hash}
+
+
+def resolve_system_prompt(session: Session, prompt_hash: str) -> str | None:
+    content = _cache_get(session, prompt_hash)
+    if content is not None:
+        return content
+    content = system_prompt_repository.get_prompt_content(session, prompt_hash)
+    if content is not None:
+        _cache_put(session, prompt_hash, content)
+    return content
+
+
+def extract_system_prompt(session: Session, log_json: list[dict[str, Any]]) -> str | None:
+    """Return the system prompt of a session log, resolving hash references."""
+
+    if not log_json:
+        return None
+    first = log_json[0]
+    if not isinstance(first, dict):
+        return None
+    if first.get("role") != "system":
+        return None
+    content = first.get("content")
+    if content is None and isinstance(first.get("prompt_hash"), str):
+        content = resolve_system_prompt(session, first["prompt_hash"])
+    if not isinstance(content, str) or not content.strip():
+        return None
+    return content
+
+
+def clear() -> None:
+    with _lock:
+        _cache.clear()
@@ -0,0 +1,145 @@
+"""Per-session serialisation and idempotent coalescing of chat turns.
+
+Turns of one session run one at a time in this process: locks live in a
+``WeakValueDictionary`` so a session's lock disappears as soon as no request
+holds or waits on it. A turn sent with an ``Idempotency-Key`` is remembered
+for ``IDEMPOTENCY_TTL_SECONDS``: a duplicate that arrives while the original
+is running awaits the same result, and one that arrives later gets the stored
+response, so client retries never trigger a second LLM call or log entry.
+Failed or cancelled turns are forgotten so the retry runs again.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import threading
+import time
+import weakref
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Hashable, TypeVar
+from uuid import UUID
+
+from app.core import config as app_config
+
+T = TypeVar("T")
+
+MAX_IDEMPOTENCY_KEY_LENGTH = 255
+
+
+class IdempotencyKeyReuseError(RuntimeError):
+    """Raised when an idempotency key is reused for a different message."""
+
+
+@dataclass(slots=True)
+class _Entry:
+    fingerprint: str
+    future: asyncio.Future[Any]
+    expires_at: float
+
+
+_locks: "weakref.WeakValueDictionary[Hashable, asyncio.Lock]" = weakref.WeakValueDictionary()
+_entries: "OrderedDict[tuple[UUID, str], _Entry]" = OrderedDict()
+_registry_lock = threading.Lock()
+
+
+def session_lock(session_id: UUID) -> asyncio.Lock:
+    """Return the lock serialising turns of ``session_id``; hold a reference while using it."""
+
+    with _registry_lock:
+        lock = _locks.get(session_id)
+        if lock is None:
+            lock = asyncio.Lock()
+            _locks[session_id] = lock
+        return lock
+
+
+def _fingerprint(message: str) -> str:
+    return hashlib.sha256(message.encode("utf-8")).hexdigest()
+
+
+def _prune(now: float) -> None:
+    while _entries:
+        key, entry = next(iter(_entries.items()))
+        if entry.expires_at > now and len(_entries) <= app_config.IDEMPOTENCY_CACHE_MAX_ENTRIES:
+            break
+        del _entries[key]
+
+
+def _claim(cache_key: tuple[UUID, str], fingerprint: str) -> tuple[_Entry, bool]:
+    """Return the live entry for ``cache_key`` and whether the caller owns (must run) it."""
+
+    now = time.monotonic()
+    with _registry_lock:
+        _prune(now)
+        entry = _entries.get(cache_key)
+        if entry is not None and entry.expires_at <= now:
+            del _entries[cache_key]
+            entry = None
+        if entry is not None:
+            if entry.fingerprint != fingerprint:
+                raise IdempotencyKeyReuseError("idempotency key was already used for a different message")
+            return entry, False
+        entry = _Entry(fingerprint, asyncio.get_running_loop().create_future(), float("inf"))
+        _entries[cache_key] = entry
+        return entry, True
+
+
+def _forget(cache_key: tuple[UUID, str], entry: _Entry) -> None:
+    with _registry_lock:
+        if _entries.get(cache_key) is entry:
+            del _entries[cache_key]
+
+
+async def _run_locked(session_id: UUID, work: Callable[[], Awaitable[T]]) -> T:
+    async with session_lock(session_id):
+        return await work()
+
+
+async def run_turn(
+    session_id: UUID,
+    idempotency_key: str | None,
+    message: str,
+    work: Callable[[], Awaitable[T]],
+) -> T:
+    """Run ``work`` under the session lock, coalescing duplicates of ``idempotency_key``."""
+
+    if idempotency_key is None or app_config.IDEMPOTENCY_TTL_SECONDS <= 0:
+        return await _run_locked(session_id, work)
+
+    cache_key = (session_id, idempotency_key)
+    fingerprint = _fingerprint(message)
+    while True:
+        entry, owner = _claim(cache_key, fingerprint)
+        if owner:
+            break
+        try:
+            return await asyncio.shield(entry.future)
+        except asyncio.CancelledError:
+            current = asyncio.current_task()
+            if entry.future.cancelled() and (current is None or not current.cancelling()):
+                continue  # the original request was cancelled; run the turn ourselves
+            raise
+
+    try:
+        result = await _run_locked(session_id, work)
+    except asyncio.CancelledError:
+        _forget(cache_key, entry)
+        entry.future.cancel()
+        raise
+    except Exception as exc:
+        _forget(cache_key, entry)
+        entry.future.set_exception(exc)
+        # Waiters re-raise the exception; mark it retrieved so an unawaited future does not warn.
+        entry.future.exception()
+        raise
+    with _registry_lock:
+        entry.expires_at = time.monotonic() + app_config.IDEMPOTENCY_TTL_SECONDS
+    entry.future.set_result(result)
+    return result
+
+
+def clear() -> None:
+    with _registry_lock:
+        _entries.clear()
@@ -0,0 +1,137 @@
+"""Response compression (Brotli, else gzip) above a size threshold."""
+
+from __future__ import annotations
+
+import re
+
+import brotli
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.middleware.gzip import GZipResponder, IdentityResponder
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+_ENCODED_ETAG = re.compile(r'^"(.*)-(?:br|gzip)"$')
+
+
+def accepted_encodings(accept_encoding: str) -> set[str]:
+    """Codings from an ``Accept-Encoding`` header, minus those refused with ``q=0``."""
+
+    accepted: set[str] = set()
+    for part in accept_encoding.split(","):
+        coding, _, params = part.strip().partition(";")
+        coding = coding.strip().lower()
+        if not coding:
+            continue
+        q = params.strip().lower()
+        if q.startswith("q="):
+            try:
+                if float(q[2:]) <= 0:
+                    continue
+            except ValueError:
+                continue
+        accepted.add(coding)
+    return accepted
+
+
+def encoded_etag(etag: str, coding: str) -> str:
+    """ETag of the ``coding``-encoded representation of the response tagged ``etag``.
+
+    A strong validator identifies exact bytes, so the encoded body gets its
+    own ``"<tag>-<coding>"``. Weak tags already allow equivalent
+    representations and are kept as they are.
+    """
+
+    if etag.startswith("W/") or len(etag) < 2 or not etag.endswith('"'):
+        return etag
+    return f'{etag[:-1]}-{coding}"'
+
+
+def identity_etags(header_value: str) -> str:
+    """Map the encoded ETags in an ``If-None-Match``/``If-Match`` value back to the app's own tags."""
+
+    tags = []
+    for tag in header_value.split(","):
+        tag = tag.strip()
+        match = _ENCODED_ETAG.match(tag)
+        tags.append(f'"{match.group(1)}"' if match else tag)
+    return ", ".join(tags)
+
+
+def _with_identity_validators(scope: Scope) -> Scope:
+    raw_headers = scope.get("headers") or []
+    if not any(name in (b"if-none-match", b"if-match") for name, _value in raw_headers):
+        return scope
+    headers = [
+        (name, identity_etags(value.decode("latin-1")).encode("latin-1"))
+        if name in (b"if-none-match", b"if-match")
+        else (name, value)
+        for name, value in raw_headers
+    ]
+    return {**scope, "headers": headers}
+
+
+class BrotliResponder(IdentityResponder):
+    content_encoding = "br"
+
+    def __init__(self, app: ASGIApp, minimum_size: int, quality: int) -> None:
+        super().__init__(app, minimum_size)
+        self.compressor = brotli.Compressor(quality=quality)
+
+    def apply_compression(self, body: bytes, *, more_body: bool) -> bytes:
+        compressed = self.compressor.process(body)
+        if more_body:
+            return compressed + self.compressor.flush()
+        return compressed + self.compressor.finish()
+
+
+class CompressionMiddleware:
+    """Compress responses of at least ``minimum_size`` bytes.
+
+    Prefers ``br`` when the client accepts it, falling back to ``gzip``. Responses that already carry a
+    ``Content-Encoding`` and event streams are passed through untouched.
+
+    Encoded responses get an encoding-specific strong ETag (see
+    ``encoded_etag``). Conditional request headers are mapped back to the
+    app's identity tags, and a ``304`` echoes the encoded tag the client
+    sent, so revalidation keeps working per representation.
+    """
+
+    def __init__(self, app: ASGIApp, minimum_size: int = 1024, gzip_level: int = 6, brotli_quality: int = 4) -> None:
+        self.app = app
+        self.minimum_size = minimum_size
+        self.gzip_level = gzip_level
+        self.brotli_quality = brotli_quality
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        request_headers = Headers(scope=scope)
+        accepted = accepted_encodings(request_headers.get("Accept-Encoding", ""))
+        responder: IdentityResponder
+        coding: str | None = None
+        if "br" in accepted:
+            responder = BrotliResponder(self.app, self.minimum_size, quality=self.brotli_quality)
+            coding = "br"
+        elif "gzip" in accepted:
+            responder = GZipResponder(self.app, self.minimum_size, compresslevel=self.gzip_level)
+            coding = "gzip"
+        else:
+            responder = IdentityResponder(self.app, self.minimum_size)
+        if_none_match = {tag.strip() for tag in request_headers.get("If-None-Match", "").split(",")}
+
+        async def send_with_etag(message: Message) -> None:
+            if message["type"] == "http.response.start" and coding is not None:
+                headers = MutableHeaders(raw=message["headers"])
+                etag = headers.get("etag")
+                if etag is not None:
+                    encoded = encoded_etag(etag, coding)
+                    if message["status"] == 304:
+                        # No body to encode: repeat the tag of the representation the client holds.
+                        if encoded in if_none_match:
+                            headers["ETag"] = encoded
+                    elif not responder.content_encoding_set and headers.get("content-encoding") == coding:
+                        headers["ETag"] = encoded
+            await send(message)
+
+        await responder(_with_identity_validators(scope), receive, send_with_etag)
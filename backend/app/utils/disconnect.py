@@ -0,0 +1,62 @@
+"""Cancel request work when the HTTP client goes away."""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+from typing import Any, Awaitable, Callable, TypeVar
+
+T = TypeVar("T")
+
+Receive = Callable[[], Awaitable[dict[str, Any]]]
+
+# Nginx's "client closed request"; logged for the disconnected request, never seen by the client.
+CLIENT_CLOSED_REQUEST = 499
+
+
+class ClientDisconnectedError(RuntimeError):
+    """Raised when the client disconnected before the work finished."""
+
+
+async def wait_for_disconnect(receive: Receive) -> None:
+    """Return once the ASGI server reports ``http.disconnect``.
+
+    Only call this after the request body has been read (FastAPI does so
+    before the endpoint runs); any further message is the disconnect.
+    """
+
+    while True:
+        message = await receive()
+        if message.get("type") == "http.disconnect":
+            return
+
+
+async def cancel_on_disconnect(receive: Receive, awaitable: Awaitable[T]) -> T:
+    """Await ``awaitable``, cancelling it if the client disconnects first.
+
+    Cancellation is delivered as ``asyncio.CancelledError`` at the work's
+    next await point (scheduler queue, LLM call), so code between awaits,
+    such as a synchronous commit, always runs to completion.
+    """
+
+    work = asyncio.ensure_future(awaitable)
+    watcher = asyncio.create_task(wait_for_disconnect(receive))
+    try:
+        await asyncio.wait({work, watcher}, return_when=asyncio.FIRST_COMPLETED)
+    except asyncio.CancelledError:
+        work.cancel()
+        raise
+    finally:
+        watcher.cancel()
+        with contextlib.suppress(asyncio.CancelledError):
+            await watcher
+    if work.done():
+        return work.result()
+
+    work.cancel()
+    with contextlib.suppress(asyncio.CancelledError):
+        await work
+    if not work.cancelled() and work.exception() is None:
+        # The work finished while being cancelled; its result is already persisted.
+        return work.result()
+    raise ClientDisconnectedError("client disconnected")
@@ -0,0 +1,15 @@
+"""Default JSON response class serialised with orjson."""
+
+from __future__ import annotations
+
+from typing import Any
+
+import orjson
+from fastapi.responses import JSONResponse
+
+
+class FastJSONResponse(JSONResponse):
+    """Compact UTF-8 JSON like ``JSONResponse``, serialised with orjson."""
+
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(content, option=orjson.OPT_NON_STR_KEYS)
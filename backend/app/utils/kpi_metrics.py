@@ -5,6 +5,8 @@ from __future__ import annotations
 from datetime import date, datetime
 from typing import Any, Dict, Iterable, List
 
+from app.config.llm_config import LLMCostConfig
+
 
 def _parse_date(value: Any) -> date | None:
     if value is None:
@@ -105,4 +107,88 @@ def compute_edit_ratio_summary(ratios: Iterable[float]) -> Dict[str, int | float
         "median": float(median),
         "min": float(values[0]),
         "max": float(values[-1]),
-    }
\ No newline at end of file
+    }
+
+
+def _percentile(sorted_values: List[float], q: float) -> float:
+    if len(sorted_values) == 1:
+        return sorted_values[0]
+    position = (len(sorted_values) - 1) * q
+    lower = int(position)
+    upper = min(lower + 1, len(sorted_values) - 1)
+    return sorted_values[lower] + (sorted_values[upper] - sorted_values[lower]) * (position - lower)
+
+
+def _latency_summary(values: List[float]) -> Dict[str, int | float | None]:
+    values = sorted(values)
+    if not values:
+        return {"count": 0, "avg": None, "p50": None, "p95": None, "max": None}
+    return {
+        "count": len(values),
+        "avg": float(sum(values) / len(values)),
+        "p50": float(_percentile(values, 0.5)),
+        "p95": float(_percentile(values, 0.95)),
+        "max": float(values[-1]),
+    }
+
+
+def compute_llm_usage_summary(
+    meta_data_list: Iterable[Dict[str, Any]],
+    cost_config: LLMCostConfig,
+) -> Dict[str, Any]:
+    """Aggregate per-session ``llm_usage_totals``/``llm_usage`` into KPI figures.
+
+    Token counts and cost come from the running totals; latency percentiles
+    come from the retained per-call entries.
+    """
+
+    by_model: Dict[str, Dict[str, float]] = {}
+    latencies: List[float] = []
+    ttfts: List[float] = []
+    for meta_data in meta_data_list:
+        if not isinstance(meta_data, dict):
+            continue
+        for model_name, totals in (meta_data.get("llm_usage_totals") or {}).items():
+            model = by_model.setdefault(
+                model_name,
+                {"calls": 0, "prompt_tokens": 0, "completion_tokens": 0, "latency_ms": 0.0},
+            )
+            for key in model:
+                model[key] += totals.get(key) or 0
+        for entry in meta_data.get("llm_usage") or []:
+            if entry.get("latency_ms") is not None:
+                latencies.append(float(entry["latency_ms"]))
+            if entry.get("ttft_ms") is not None:
+                ttfts.append(float(entry["ttft_ms"]))
+
+    models = []
+    for model_name in sorted(by_model):
+        totals = by_model[model_name]
+        calls = int(totals["calls"])
+        prompt_tokens = int(totals["prompt_tokens"])
+        completion_tokens = int(totals["completion_tokens"])
+        models.append(
+            {
+                "model_name": model_name,
+                "calls": calls,
+                "prompt_tokens": prompt_tokens,
+                "completion_tokens": completion_tokens,
+                "total_tokens": prompt_tokens + completion_tokens,
+                "estimated_cost": float(cost_config.cost(prompt_tokens, completion_tokens)),
+                "latency_ms_avg": float(totals["latency_ms"] / calls) if calls else None,
+            }
+        )
+
+    prompt_tokens = sum(model["prompt_tokens"] for model in models)
+    completion_tokens = sum(model["completion_tokens"] for model in models)
+    return {
+        "calls": sum(model["calls"] for model in models),
+        "prompt_tokens": prompt_tokens,
+        "completion_tokens": completion_tokens,
+        "total_tokens": prompt_tokens + completion_tokens,
+        "estimated_cost": float(sum(model["estimated_cost"] for model in models)),
+        "currency": cost_config.currency,
+        "latency_ms": _latency_summary(latencies),
+        "ttft_ms": _latency_summary(ttfts),
+        "by_model": models,
+    }
@@ -0,0 +1,324 @@
+"""Sampling request profiler: cProfile for a fraction of requests, stack samples for slow ones.
+
+cProfile only instruments the thread that enables it, while sync (``def``)
+routes run in Starlette's threadpool. Sync endpoints are therefore wrapped
+so that, inside a sampled request, they profile their worker thread too; the
+dumps of the event-loop thread and the worker threads are merged into one
+``.prof`` file.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextvars
+import cProfile
+import functools
+import inspect
+import itertools
+import logging
+import pstats
+import random
+import re
+import sys
+import threading
+import time
+from collections import Counter
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Callable, Dict, List
+
+from fastapi.routing import APIRoute
+
+from app.config.profiling_config import ProfilingConfig
+
+logger = logging.getLogger(__name__)
+
+PROFILE_SUFFIXES = (".prof", ".folded")
+_PROFILE_NAME = re.compile(r"^[A-Za-z0-9_.-]+$")
+
+# cProfile hooks the whole thread; only one request can hold it at a time.
+_cprofile_lock = threading.Lock()
+
+
+class _RequestProfile:
+    """Profilers of one sampled request: the event-loop thread's plus one per worker-thread call."""
+
+    def __init__(self) -> None:
+        self.main = cProfile.Profile()
+        self.workers: List[cProfile.Profile] = []
+        self._lock = threading.Lock()
+
+    def add_worker(self, profiler: cProfile.Profile) -> None:
+        with self._lock:
+            self.workers.append(profiler)
+
+    def stats(self) -> pstats.Stats:
+        stats = pstats.Stats(self.main)
+        with self._lock:
+            workers = list(self.workers)
+        for profiler in workers:
+            stats.add(profiler)
+        return stats
+
+
+# Copied into threadpool workers with the request's context, so wrapped endpoints find their request.
+_active_profile: contextvars.ContextVar[_RequestProfile | None] = contextvars.ContextVar(
+    "active_request_profile", default=None
+)
+
+
+def _profile_worker_call(func: Callable[..., Any]) -> Callable[..., Any]:
+    @functools.wraps(func)
+    def wrapper(*args: Any, **kwargs: Any) -> Any:
+        active = _active_profile.get()
+        if active is None:
+            return func(*args, **kwargs)
+        profiler = cProfile.Profile()
+        profiler.enable()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            profiler.disable()
+            active.add_worker(profiler)
+
+    wrapper.__profiled__ = True  # type: ignore[attr-defined]
+    return wrapper
+
+
+def profile_sync_endpoints(routes: List[Any]) -> None:
+    """Wrap the sync endpoints of ``routes`` so sampled requests also profile their worker thread.
+
+    FastAPI resolves the endpoint through ``route.dependant.call`` on every
+    request, so replacing it keeps the route's signature, dependencies and
+    threadpool dispatch unchanged. Already wrapped endpoints are skipped.
+    """
+
+    for route in routes:
+        if not isinstance(route, APIRoute):
+            continue
+        call = route.dependant.call
+        if call is None or getattr(call, "__profiled__", False) or inspect.iscoroutinefunction(call):
+            continue
+        route.dependant.call = _profile_worker_call(call)
+
+
+@dataclass(slots=True)
+class ProfileFile:
+    name: str
+    size: int
+    created_at: datetime
+    kind: str
+
+
+class ProfileStore:
+    """Directory of profile files, pruned to the newest ``max_files``."""
+
+    def __init__(self, directory: Path, max_files: int) -> None:
+        self.directory = Path(directory)
+        self.max_files = max_files
+        self._counter = itertools.count()
+        self._lock = threading.Lock()
+
+    def _file_name(self, method: str, path: str, duration_ms: float, suffix: str) -> str:
+        stamp = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%S%f")
+        slug = re.sub(r"[^A-Za-z0-9]+", "_", path).strip("_")[:80] or "root"
+        return f"{stamp}-{next(self._counter):04d}_{method}_{slug}_{int(duration_ms)}ms{suffix}"
+
+    def save_cprofile(
+        self, profiler: cProfile.Profile | pstats.Stats, method: str, path: str, duration_ms: float
+    ) -> Path:
+        target = self.directory / self._file_name(method, path, duration_ms, ".prof")
+        self.directory.mkdir(parents=True, exist_ok=True)
+        profiler.dump_stats(str(target))
+        self._rotate()
+        return target
+
+    def save_stacks(self, stacks: Counter, method: str, path: str, duration_ms: float) -> Path:
+        target = self.directory / self._file_name(method, path, duration_ms, ".folded")
+        self.directory.mkdir(parents=True, exist_ok=True)
+        # Folded stacks ("frame;frame;frame count"), the input format of flamegraph tools.
+        lines = [f"{stack} {count}" for stack, count in stacks.most_common()]
+        target.write_text("\n".join(lines) + "\n", encoding="utf-8")
+        self._rotate()
+        return target
+
+    def _rotate(self) -> None:
+        with self._lock:
+            files = sorted(self._profile_paths(), key=lambda item: item.name)
+            for stale in files[: max(0, len(files) - self.max_files)]:
+                stale.unlink(missing_ok=True)
+
+    def _profile_paths(self) -> List[Path]:
+        if not self.directory.is_dir():
+            return []
+        return [item for item in self.directory.iterdir() if item.is_file() and item.suffix in PROFILE_SUFFIXES]
+
+    def list(self) -> List[ProfileFile]:
+        items = []
+        for item in self._profile_paths():
+            stat = item.stat()
+            items.append(
+                ProfileFile(
+                    name=item.name,
+                    size=stat.st_size,
+                    created_at=datetime.fromtimestamp(stat.st_mtime, tz=timezone.utc),
+                    kind="cprofile" if item.suffix == ".prof" else "stack_samples",
+                )
+            )
+        return sorted(items, key=lambda item: item.name, reverse=True)
+
+    def resolve(self, name: str) -> Path | None:
+        if not _PROFILE_NAME.match(name) or not name.endswith(PROFILE_SUFFIXES):
+            return None
+        target = self.directory / name
+        return target if target.is_file() else None
+
+
+def _fold_stack(frame: Any, thread_name: str) -> str:
+    names = []
+    while frame is not None:
+        code = frame.f_code
+        names.append(f"{code.co_name} ({Path(code.co_filename).name}:{frame.f_lineno})")
+        frame = frame.f_back
+    names.append(thread_name)
+    return ";".join(reversed(names))
+
+
+class StackSampler:
+    """Background thread that samples all thread stacks while a request runs past its threshold.
+
+    Requests under the threshold cost one dict insert/remove; the sampler
+    only walks stacks while at least one tracked request is overdue.
+    """
+
+    def __init__(self, threshold_seconds: float, interval_seconds: float) -> None:
+        self.threshold_seconds = threshold_seconds
+        self.interval_seconds = interval_seconds
+        self._active: Dict[int, tuple[float, Counter]] = {}
+        self._ids = itertools.count()
+        self._lock = threading.Lock()
+        self._thread: threading.Thread | None = None
+
+    def _ensure_started(self) -> None:
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._thread = threading.Thread(target=self._run, name="request-stack-sampler", daemon=True)
+        self._thread.start()
+
+    def start(self) -> int:
+        with self._lock:
+            self._ensure_started()
+            request_id = next(self._ids)
+            self._active[request_id] = (time.perf_counter(), Counter())
+            return request_id
+
+    def stop(self, request_id: int) -> Counter:
+        with self._lock:
+            _started_at, stacks = self._active.pop(request_id, (0.0, Counter()))
+            return stacks
+
+    def _run(self) -> None:
+        sampler_ident = threading.get_ident()
+        while True:
+            time.sleep(self.interval_seconds)
+            now = time.perf_counter()
+            with self._lock:
+                overdue = [
+                    stacks
+                    for started_at, stacks in self._active.values()
+                    if now - started_at >= self.threshold_seconds
+                ]
+            if not overdue:
+                continue
+            names = {thread.ident: thread.name for thread in threading.enumerate()}
+            folded = [
+                _fold_stack(frame, names.get(ident, str(ident)))
+                for ident, frame in sys._current_frames().items()
+                if ident != sampler_ident
+            ]
+            with self._lock:
+                for stacks in overdue:
+                    stacks.update(folded)
+
+
+class ProfilingMiddleware:
+    """ASGI middleware that profiles sampled requests and every request slower than the threshold.
+
+    The cProfile dump covers the event-loop thread and the worker threads of
+    the request's sync endpoints (see ``profile_sync_endpoints``); the stack
+    sampler sees every thread, so under concurrency both may also contain
+    other in-flight requests.
+    """
+
+    def __init__(
+        self,
+        app: Any,
+        config: ProfilingConfig | None = None,
+        store: ProfileStore | None = None,
+        rng: Callable[[], float] = random.random,
+    ) -> None:
+        self.app = app
+        self.config = config or ProfilingConfig.from_env()
+        self.store = store or ProfileStore(self.config.directory, self.config.max_files)
+        self.sampler = (
+            StackSampler(self.config.slow_threshold_ms / 1000, self.config.sampler_interval_ms / 1000)
+            if self.config.slow_threshold_ms > 0
+            else None
+        )
+        self._rng = rng
+
+    def _should_profile(self, scope: Dict[str, Any]) -> bool:
+        if scope["type"] != "http":
+            return False
+        path = scope.get("path", "")
+        return any(path.startswith(prefix) for prefix in self.config.path_prefixes)
+
+    async def __call__(self, scope, receive, send) -> None:
+        if not self.config.enabled or not self._should_profile(scope):
+            await self.app(scope, receive, send)
+            return
+
+        profile: _RequestProfile | None = None
+        if self.config.sample_rate > 0 and self._rng() < self.config.sample_rate:
+            if _cprofile_lock.acquire(blocking=False):
+                profile = _RequestProfile()
+                app = scope.get("app")
+                if app is not None:
+                    # Cheap after the first pass; also picks up routes included later.
+                    profile_sync_endpoints(getattr(app, "routes", []))
+        sample_id = self.sampler.start() if self.sampler is not None else None
+
+        started_at = time.perf_counter()
+        token = _active_profile.set(profile) if profile is not None else None
+        try:
+            if profile is not None:
+                profile.main.enable()
+            await self.app(scope, receive, send)
+        finally:
+            if profile is not None:
+                profile.main.disable()
+                _active_profile.reset(token)
+                _cprofile_lock.release()
+            duration_ms = (time.perf_counter() - started_at) * 1000
+            stacks = self.sampler.stop(sample_id) if self.sampler is not None and sample_id is not None else Counter()
+            await self._save(scope, profile, stacks, duration_ms)
+
+    async def _save(
+        self,
+        scope: Dict[str, Any],
+        profile: _RequestProfile | None,
+        stacks: Counter,
+        duration_ms: float,
+    ) -> None:
+        method = scope.get("method", "GET")
+        path = scope.get("path", "")
+        try:
+            if profile is not None:
+                await asyncio.to_thread(
+                    lambda: self.store.save_cprofile(profile.stats(), method, path, duration_ms)
+                )
+            elif stacks and duration_ms >= self.config.slow_threshold_ms:
+                await asyncio.to_thread(self.store.save_stacks, stacks, method, path, duration_ms)
+        except OSError:
+            logger.warning("Failed to write request profile for %s %s", method, path, exc_info=True)
@@ -0,0 +1,146 @@
+"""Per-stage latency timers backed by Prometheus-style histograms."""
+
+from __future__ import annotations
+
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Tuple
+
+DEFAULT_BUCKETS: Tuple[float, ...] = (
+    0.001,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+    30.0,
+)
+
+
+class Histogram:
+    """Cumulative histogram of observations in seconds."""
+
+    def __init__(self, buckets: Tuple[float, ...] = DEFAULT_BUCKETS) -> None:
+        self.buckets = buckets
+        self._counts = [0] * len(buckets)
+        self._sum = 0.0
+        self._count = 0
+        self._lock = threading.Lock()
+
+    def observe(self, value: float) -> None:
+        with self._lock:
+            self._sum += value
+            self._count += 1
+            for index, upper in enumerate(self.buckets):
+                if value <= upper:
+                    self._counts[index] += 1
+
+    def snapshot(self) -> Tuple[List[int], float, int]:
+        with self._lock:
+            return list(self._counts), self._sum, self._count
+
+
+class StageHistograms:
+    """Histograms keyed by (pipeline, stage)."""
+
+    def __init__(self) -> None:
+        self._histograms: Dict[Tuple[str, str], Histogram] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, pipeline: str, stage: str, seconds: float) -> None:
+        key = (pipeline, stage)
+        histogram = self._histograms.get(key)
+        if histogram is None:
+            with self._lock:
+                histogram = self._histograms.setdefault(key, Histogram())
+        histogram.observe(seconds)
+
+    def items(self) -> List[Tuple[Tuple[str, str], Histogram]]:
+        with self._lock:
+            return sorted(self._histograms.items())
+
+    def clear(self) -> None:
+        with self._lock:
+            self._histograms.clear()
+
+
+STAGE_HISTOGRAMS = StageHistograms()
+STAGE_METRIC_NAME = "t2ai_stage_duration_seconds"
+
+
+class StageTimer:
+    """Collect stage timings for one pipeline run and feed the shared histograms.
+
+    Usage::
+
+        timer = StageTimer("phase1_turn")
+        with timer.stage("load"):
+            ...
+        timer.timings_ms()  # {"load": 1.234}
+    """
+
+    def __init__(self, pipeline: str, histograms: StageHistograms = STAGE_HISTOGRAMS) -> None:
+        self.pipeline = pipeline
+        self.timings: Dict[str, float] = {}
+        self._histograms = histograms
+
+    def record(self, stage: str, seconds: float) -> None:
+        self.timings[stage] = self.timings.get(stage, 0.0) + seconds
+        self._histograms.observe(self.pipeline, stage, seconds)
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        started_at = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, time.perf_counter() - started_at)
+
+    def timings_ms(self) -> Dict[str, float]:
+        return {stage: round(seconds * 1000, 3) for stage, seconds in self.timings.items()}
+
+
+def _format_float(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value))
+
+
+def render_stage_histograms(histograms: StageHistograms = STAGE_HISTOGRAMS) -> str:
+    """Render histograms in the Prometheus text exposition format."""
+
+    lines = [
+        f"# HELP {STAGE_METRIC_NAME} Time spent per pipeline stage.",
+        f"# TYPE {STAGE_METRIC_NAME} histogram",
+    ]
+    for (pipeline, stage), histogram in histograms.items():
+        counts, total, count = histogram.snapshot()
+        labels = f'pipeline="{pipeline}",stage="{stage}"'
+        for upper, bucket_count in zip(histogram.buckets, counts):
+            lines.append(f'{STAGE_METRIC_NAME}_bucket{{{labels},le="{_format_float(upper)}"}} {bucket_count}')
+        lines.append(f'{STAGE_METRIC_NAME}_bucket{{{labels},le="+Inf"}} {count}')
+        lines.append(f"{STAGE_METRIC_NAME}_sum{{{labels}}} {_format_float(total)}")
+        lines.append(f"{STAGE_METRIC_NAME}_count{{{labels}}} {count}")
+    return "\n".join(lines) + "\n"
+
+
+def merge_stage_timings(
+    meta_data: Dict[str, Any] | None,
+    timer: StageTimer,
+    max_entries: int,
+    **extra: Any,
+) -> Dict[str, Any]:
+    """Return a copy of ``meta_data`` with this run's timings appended (bounded)."""
+
+    merged = dict(meta_data or {})
+    entries = list(merged.get("stage_timings") or [])
+    entries.append({"pipeline": timer.pipeline, **extra, "stages_ms": timer.timings_ms()})
+    merged["stage_timings"] = entries[-max_entries:] if max_entries > 0 else entries
+    return merged
@@ -0,0 +1,17 @@
+"""Rough token estimation for budgeting LLM calls."""
+
+from __future__ import annotations
+
+BYTES_PER_TOKEN = 4
+
+
+def estimate_tokens(text: str | None) -> int:
+    """Estimate the token count of ``text`` without a tokenizer.
+
+    UTF-8 byte length divided by four tracks both English (~4 chars/token)
+    and Japanese (~1 char/token, 3 bytes/char) closely enough for rate limiting.
+    """
+
+    if not text:
+        return 0
+    return max(1, len(text.encode("utf-8")) // BYTES_PER_TOKEN)
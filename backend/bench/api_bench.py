@@ -0,0 +1,359 @@
+"""End-to-end HTTP benchmark for the API against a temp SQLite DB and the mock LLM."""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import os
+import platform
+import socket
+import sqlite3
+import subprocess
+import tempfile
+import threading
+import time
+from collections import defaultdict
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, List
+
+import httpx
+
+BENCH_DIR = Path(__file__).resolve().parent
+BACKEND_DIR = BENCH_DIR.parent
+DEFAULT_RESULTS_DIR = BENCH_DIR / "results"
+
+REPORT_FINAL_SUFFIX = "\n\n(編集済み)"
+
+
+def percentile(values: List[float], q: float) -> float | None:
+    if not values:
+        return None
+    ordered = sorted(values)
+    rank = q * (len(ordered) - 1)
+    lower = int(rank)
+    upper = min(lower + 1, len(ordered) - 1)
+    weight = rank - lower
+    return ordered[lower] * (1 - weight) + ordered[upper] * weight
+
+
+class Recorder:
+    def __init__(self) -> None:
+        self.latencies: Dict[str, List[float]] = defaultdict(list)
+        self.errors: Dict[str, int] = defaultdict(int)
+        self.response_bytes: Dict[str, int] = defaultdict(int)
+        self.wire_bytes: Dict[str, int] = defaultdict(int)
+
+    async def call(self, client: httpx.AsyncClient, name: str, method: str, url: str, **kwargs) -> httpx.Response | None:
+        started = time.perf_counter()
+        try:
+            response = await client.request(method, url, **kwargs)
+        except httpx.HTTPError:
+            self.errors[name] += 1
+            return None
+        elapsed = time.perf_counter() - started
+        self.latencies[name].append(elapsed)
+        self.response_bytes[name] += len(response.content)
+        self.wire_bytes[name] += response.num_bytes_downloaded
+        if response.status_code >= 400:
+            self.errors[name] += 1
+            return None
+        return response
+
+    def summary(self, duration: float) -> Dict[str, Any]:
+        operations: Dict[str, Any] = {}
+        for name in sorted(set(self.latencies) | set(self.errors)):
+            values = self.latencies.get(name, [])
+            count = len(values)
+            operations[name] = {
+                "count": count,
+                "errors": self.errors.get(name, 0),
+                "throughput_rps": count / duration if duration > 0 else 0.0,
+                "mean_ms": (sum(values) / count * 1000) if count else None,
+                "p50_ms": _ms(percentile(values, 0.50)),
+                "p95_ms": _ms(percentile(values, 0.95)),
+                "p99_ms": _ms(percentile(values, 0.99)),
+                "max_ms": _ms(max(values) if values else None),
+                "avg_response_bytes": (self.response_bytes.get(name, 0) / count) if count else None,
+                "avg_wire_bytes": (self.wire_bytes.get(name, 0) / count) if count else None,
+            }
+        all_values = [value for values in self.latencies.values() for value in values]
+        total = len(all_values)
+        return {
+            "duration_seconds": duration,
+            "total_requests": total,
+            "total_errors": sum(self.errors.values()),
+            "throughput_rps": total / duration if duration > 0 else 0.0,
+            "p50_ms": _ms(percentile(all_values, 0.50)),
+            "p95_ms": _ms(percentile(all_values, 0.95)),
+            "p99_ms": _ms(percentile(all_values, 0.99)),
+            "operations": operations,
+        }
+
+
+def _ms(value: float | None) -> float | None:
+    return None if value is None else value * 1000
+
+
+async def _run_user(client: httpx.AsyncClient, recorder: Recorder, user_id: int, args: argparse.Namespace) -> None:
+    for iteration in range(args.iterations):
+        response = await recorder.call(client, "phase1.session.create", "POST", "/api/v1/phase1/session", json={"user_id": user_id})
+        if response is not None:
+            phase1_id = response.json()["session_id"]
+            for turn in range(args.turns):
+                await recorder.call(
+                    client,
+                    "phase1.turn",
+                    "POST",
+                    f"/api/v1/phase1/session/{phase1_id}/turn",
+                    json={"message": f"目標についての相談 {iteration}-{turn}: チームの1on1を改善したい"},
+                )
+            await recorder.call(
+                client,
+                "phase1.goal.confirm",
+                "POST",
+                f"/api/v1/phase1/session/{phase1_id}/confirm",
+                json={"goal_text": f"毎週1on1で課題を言語化する ({iteration})"},
+            )
+
+        response = await recorder.call(client, "phase3.session.create", "POST", "/api/v1/phase3/session", json={"user_id": user_id})
+        if response is None:
+            continue
+        phase3_id = response.json()["session_id"]
+        for turn in range(args.turns):
+            await recorder.call(
+                client,
+                "phase3.turn",
+                "POST",
+                f"/api/v1/phase3/session/{phase3_id}/turn",
+                json={"message": f"今週の振り返り {iteration}-{turn}: 部下の反応が薄くて焦った"},
+            )
+        draft = await recorder.call(client, "phase3.report.draft", "POST", f"/api/v1/phase3/session/{phase3_id}/report/draft", json={})
+        if draft is not None:
+            await recorder.call(
+                client,
+                "phase3.report.final",
+                "PUT",
+                f"/api/v1/phase3/session/{phase3_id}/report/final",
+                json={"report_final": draft.json()["report_draft"] + REPORT_FINAL_SUFFIX},
+            )
+        for _ in range(args.kpi_reads):
+            await recorder.call(client, "kpi.edit_ratio", "GET", "/api/v1/kpi/edit-ratio", params={"user_id": user_id})
+
+
+def _create_users(db_path: Path, count: int) -> List[int]:
+    connection = sqlite3.connect(db_path)
+    try:
+        now = datetime.now(timezone.utc).isoformat(sep=" ")
+        cursor = connection.executemany(
+            "INSERT INTO users(name, created_at) VALUES (?, ?)",
+            [(f"bench-user-{index}", now) for index in range(count)],
+        )
+        connection.commit()
+        del cursor
+        return [row[0] for row in connection.execute("SELECT id FROM users ORDER BY id").fetchall()]
+    finally:
+        connection.close()
+
+
+def _db_stats(db_path: Path) -> Dict[str, Any]:
+    connection = sqlite3.connect(db_path)
+    try:
+        page_count = connection.execute("PRAGMA page_count").fetchone()[0]
+        page_size = connection.execute("PRAGMA page_size").fetchone()[0]
+        tables = {
+            table: connection.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+            for table in ("users", "goals", "sessions")
+        }
+        avg_log_bytes = connection.execute("SELECT AVG(LENGTH(log_json)) FROM sessions").fetchone()[0]
+        avg_meta_bytes = connection.execute("SELECT AVG(LENGTH(meta_data)) FROM sessions").fetchone()[0]
+    finally:
+        connection.close()
+    wal_path = db_path.with_name(db_path.name + "-wal")
+    return {
+        "file_bytes": db_path.stat().st_size,
+        "wal_bytes": wal_path.stat().st_size if wal_path.exists() else 0,
+        "page_bytes": page_count * page_size,
+        "rows": tables,
+        "avg_log_json_bytes": avg_log_bytes,
+        "avg_meta_data_bytes": avg_meta_bytes,
+    }
+
+
+def _free_port() -> int:
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def _start_uvicorn(app, port: int):
+    import uvicorn
+
+    server = uvicorn.Server(uvicorn.Config(app, host="127.0.0.1", port=port, log_level="warning"))
+    thread = threading.Thread(target=server.run, daemon=True)
+    thread.start()
+    deadline = time.monotonic() + 10
+    while not server.started:
+        if time.monotonic() > deadline:
+            raise RuntimeError("uvicorn did not start within 10s")
+        time.sleep(0.05)
+    return server, thread
+
+
+async def _drive(app, db_path: Path, args: argparse.Namespace) -> Dict[str, Any]:
+    user_ids = _create_users(db_path, args.users)
+    recorder = Recorder()
+    limits = httpx.Limits(max_connections=args.users, max_keepalive_connections=args.users)
+
+    server = thread = None
+    if args.transport == "http":
+        port = _free_port()
+        server, thread = _start_uvicorn(app, port)
+        client = httpx.AsyncClient(base_url=f"http://127.0.0.1:{port}", limits=limits, timeout=60)
+    else:
+        client = httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://bench", timeout=60)
+
+    try:
+        async with client:
+            await recorder.call(client, "health", "GET", "/health")
+            started = time.perf_counter()
+            await asyncio.gather(*(_run_user(client, recorder, user_id, args) for user_id in user_ids))
+            duration = time.perf_counter() - started
+    finally:
+        if server is not None:
+            server.should_exit = True
+            thread.join(timeout=10)
+
+    return recorder.summary(duration)
+
+
+def _git_revision() -> str | None:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=BACKEND_DIR,
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def _apply_mock_env(args: argparse.Namespace) -> None:
+    os.environ["LLM_PROVIDER"] = "mock"
+    os.environ["LLM_MOCK_LATENCY"] = args.mock_latency
+    os.environ["LLM_MOCK_LATENCY_MS"] = str(args.mock_latency_ms)
+    os.environ["LLM_MOCK_LATENCY_STDDEV_MS"] = str(args.mock_latency_stddev_ms)
+    os.environ["LLM_MOCK_TOKENS_PER_SECOND"] = str(args.mock_tokens_per_second)
+    os.environ["LLM_MOCK_RESPONSE_TOKENS"] = str(args.mock_response_tokens)
+    os.environ["LLM_MOCK_ERROR_RATE"] = str(args.mock_error_rate)
+    os.environ["LLM_MOCK_SEED"] = str(args.seed)
+
+
+def compare_results(current: Dict[str, Any], baseline: Dict[str, Any], threshold: float) -> List[str]:
+    """Return regressions where p95 latency grew or throughput fell by more than ``threshold``."""
+
+    regressions: List[str] = []
+    current_ops = current["summary"]["operations"]
+    for name, base in baseline["summary"]["operations"].items():
+        now = current_ops.get(name)
+        if now is None:
+            continue
+        if base.get("p95_ms") and now.get("p95_ms") and now["p95_ms"] > base["p95_ms"] * (1 + threshold):
+            regressions.append(f"{name}: p95 {base['p95_ms']:.1f}ms -> {now['p95_ms']:.1f}ms")
+    base_rps = baseline["summary"]["throughput_rps"]
+    now_rps = current["summary"]["throughput_rps"]
+    if base_rps and now_rps < base_rps * (1 - threshold):
+        regressions.append(f"throughput {base_rps:.1f} rps -> {now_rps:.1f} rps")
+    return regressions
+
+
+def _parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Benchmark the API end to end with the mock LLM")
+    parser.add_argument("--users", type=int, default=8, help="Concurrent virtual users (default: 8)")
+    parser.add_argument("--iterations", type=int, default=3, help="Scenario iterations per user (default: 3)")
+    parser.add_argument("--turns", type=int, default=5, help="Chat turns per session (default: 5)")
+    parser.add_argument("--kpi-reads", type=int, default=2, help="KPI reads per iteration (default: 2)")
+    parser.add_argument("--transport", choices=("asgi", "http"), default="asgi", help="In-process ASGI or uvicorn over HTTP")
+    parser.add_argument(
+        "--mock-latency",
+        choices=("none", "fixed", "normal", "longtail"),
+        default="fixed",
+        help="Mock latency profile (default: fixed)",
+    )
+    parser.add_argument("--mock-latency-ms", type=float, default=50, help="Mock latency in ms (default: 50)")
+    parser.add_argument("--mock-latency-stddev-ms", type=float, default=20, help="Mock latency stddev in ms (default: 20)")
+    parser.add_argument("--mock-tokens-per-second", type=float, default=0, help="Mock generation speed (default: instant)")
+    parser.add_argument("--mock-response-tokens", type=int, default=200, help="Mock response size in tokens (default: 200)")
+    parser.add_argument("--mock-error-rate", type=float, default=0.0, help="Mock injected error rate (default: 0)")
+    parser.add_argument("--seed", type=int, default=1234, help="Mock RNG seed (default: 1234)")
+    parser.add_argument("--output", default=None, help="Result JSON path (default: bench/results/<timestamp>-<rev>.json)")
+    parser.add_argument("--compare", default=None, help="Baseline result JSON to compare against")
+    parser.add_argument("--threshold", type=float, default=0.10, help="Regression threshold ratio (default: 0.10)")
+    parser.add_argument("--fail-on-regression", action="store_true", help="Exit 1 when a regression is found")
+    return parser.parse_args()
+
+
+def main() -> None:
+    args = _parse_args()
+
+    with tempfile.TemporaryDirectory(prefix="t2ai-bench-") as tmp_dir:
+        db_path = Path(tmp_dir) / "bench.db"
+        os.environ["DATABASE_URL"] = f"sqlite:///{db_path}"
+        _apply_mock_env(args)
+
+        # Imported after the env is set: app.core.db builds its engine at import time.
+        from sqlmodel import SQLModel
+
+        from app import models  # noqa: F401
+        from app.core.db import engine
+        from app.main import app
+
+        SQLModel.metadata.create_all(engine)
+        summary = asyncio.run(_drive(app, db_path, args))
+        engine.dispose()
+        db_stats = _db_stats(db_path)
+
+    revision = _git_revision()
+    result = {
+        "created_at": datetime.now(timezone.utc).isoformat(),
+        "git_revision": revision,
+        "python": platform.python_version(),
+        "config": {key: value for key, value in vars(args).items() if key not in {"output", "compare"}},
+        "summary": summary,
+        "db": db_stats,
+    }
+
+    output_path = Path(args.output) if args.output else (
+        DEFAULT_RESULTS_DIR / f"{datetime.now().strftime('%Y%m%d-%H%M%S')}-{revision or 'nogit'}.json"
+    )
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    output_path.write_text(json.dumps(result, ensure_ascii=False, indent=2), encoding="utf-8")
+
+    print("Benchmark Summary")
+    print(json.dumps({"summary": {k: v for k, v in summary.items() if k != "operations"}, "db": db_stats}, ensure_ascii=False, indent=2))
+    print(f"{'operation':<24}{'count':>7}{'err':>5}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}")
+    for name, op in summary["operations"].items():
+        print(
+            f"{name:<24}{op['count']:>7}{op['errors']:>5}"
+            f"{(op['p50_ms'] or 0):>10.1f}{(op['p95_ms'] or 0):>10.1f}{(op['p99_ms'] or 0):>10.1f}"
+        )
+    print(f"Saved results to {output_path}")
+
+    if args.compare:
+        baseline = json.loads(Path(args.compare).read_text(encoding="utf-8"))
+        regressions = compare_results(result, baseline, args.threshold)
+        if regressions:
+            print("Regressions:")
+            for line in regressions:
+                print(f"  - {line}")
+            if args.fail_on_regression:
+                raise SystemExit(1)
+        else:
+            print(f"No regressions beyond {args.threshold:.0%} vs {args.compare}")
+
+
+if __name__ == "__main__":
+    main()
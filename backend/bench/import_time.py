@@ -0,0 +1,109 @@
+"""Cold-start import benchmark based on ``python -X importtime``.
+
+Runs the import in a fresh interpreter so nothing is cached in ``sys.modules``
+and reports the total plus the slowest modules. Used by the test suite as a
+startup budget check, and by hand when chasing worker boot time.
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import subprocess
+import sys
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, List
+
+BENCH_DIR = Path(__file__).resolve().parent
+BACKEND_DIR = BENCH_DIR.parent
+
+
+@dataclass(slots=True)
+class ImportEntry:
+    module: str
+    self_us: int
+    cumulative_us: int
+    depth: int
+
+
+@dataclass(slots=True)
+class ImportTimeReport:
+    target: str
+    entries: List[ImportEntry]
+
+    @property
+    def modules(self) -> set[str]:
+        return {entry.module for entry in self.entries}
+
+    @property
+    def total_ms(self) -> float:
+        for entry in self.entries:
+            if entry.module == self.target and entry.depth == 0:
+                return entry.cumulative_us / 1000
+        return sum(entry.self_us for entry in self.entries) / 1000
+
+    def slowest(self, limit: int = 15, prefix: str | None = None) -> List[ImportEntry]:
+        entries = [entry for entry in self.entries if prefix is None or entry.module.startswith(prefix)]
+        return sorted(entries, key=lambda entry: entry.self_us, reverse=True)[:limit]
+
+
+def parse_importtime(output: str) -> List[ImportEntry]:
+    """Parse ``-X importtime`` stderr lines (``import time: self | cumulative | name``)."""
+
+    entries: List[ImportEntry] = []
+    for line in output.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        fields = line[len("import time:") :].split("|", 2)
+        if len(fields) != 3 or not fields[0].strip().isdigit():
+            continue  # header line
+        name = fields[2].rstrip()
+        stripped = name.lstrip(" ")
+        depth = max(0, (len(name) - len(stripped) - 1) // 2)
+        entries.append(ImportEntry(stripped, int(fields[0]), int(fields[1]), depth))
+    return entries
+
+
+def measure_import_time(target: str = "app.main", env: Dict[str, str] | None = None) -> ImportTimeReport:
+    child_env = {**os.environ, **(env or {})}
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {target}"],
+        cwd=BACKEND_DIR,
+        env=child_env,
+        capture_output=True,
+        text=True,
+        check=False,
+    )
+    if completed.returncode != 0:
+        raise RuntimeError(f"import {target} failed:\n{completed.stderr[-2000:]}")
+    return ImportTimeReport(target=target, entries=parse_importtime(completed.stderr))
+
+
+def _parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Measure cold-start import time of the API")
+    parser.add_argument("--target", default="app.main", help="Module to import (default: app.main)")
+    parser.add_argument("--runs", type=int, default=5, help="Fresh interpreters to measure; best run is kept (default: 5)")
+    parser.add_argument("--top", type=int, default=15, help="Slowest modules to list (default: 15)")
+    parser.add_argument("--prefix", default=None, help="Only list modules with this prefix (e.g. app.)")
+    parser.add_argument("--budget-ms", type=float, default=None, help="Exit 1 when the best run exceeds this")
+    return parser.parse_args()
+
+
+def main() -> None:
+    args = _parse_args()
+    reports = [measure_import_time(args.target) for _ in range(max(1, args.runs))]
+    best = min(reports, key=lambda report: report.total_ms)
+
+    print(f"import {args.target}: best {best.total_ms:.1f} ms over {len(reports)} run(s)")
+    print(f"{'module':<60}{'self ms':>10}{'cum ms':>10}")
+    for entry in best.slowest(args.top, args.prefix):
+        print(f"{entry.module:<60}{entry.self_us / 1000:>10.1f}{entry.cumulative_us / 1000:>10.1f}")
+
+    if args.budget_ms is not None and best.total_ms > args.budget_ms:
+        print(f"Over budget: {best.total_ms:.1f} ms > {args.budget_ms:.1f} ms")
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,146 @@
+"""Serialisation and compression benchmark for the largest API payloads.
+
+Builds realistic bodies for the KPI edit-ratio, session list and report
+draft endpoints, then compares the stdlib ``JSONResponse`` encoder with
+``FastJSONResponse`` (orjson) and the bytes on the wire with identity, gzip
+and Brotli encoding at the app's configured levels.
+"""
+
+from __future__ import annotations
+
+import argparse
+import gzip
+import random
+import time
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta, timezone
+from typing import Any, Callable, Dict, List
+from uuid import uuid4
+
+import brotli
+
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+
+from app.core import config as app_config
+from app.schemas.kpi_edit_ratio_schema import EditRatioItem, EditRatioResponse, EditRatioSummary
+from app.schemas.session_list_schema import SessionListResponse, SessionSummary
+from app.utils.json_response import FastJSONResponse
+
+REPORT_PARAGRAPH = (
+    "今週は部下との1on1で反応が薄く、焦りから話しすぎてしまった。"
+    "次回は質問を先に用意し、沈黙を待つことを意識する。"
+    "Always-on Goal に照らすと、傾聴の姿勢はまだ定着していない。\n"
+)
+
+
+@dataclass(slots=True)
+class PayloadResult:
+    name: str
+    raw_bytes: int
+    gzip_bytes: int
+    br_bytes: int
+    stdlib_us: float
+    orjson_us: float
+
+
+def edit_ratio_payload(items: int, seed: int = 1234) -> Any:
+    rng = random.Random(seed)
+    start = date(2026, 1, 1)
+    ratios = [rng.random() for _ in range(items)]
+    response = EditRatioResponse(
+        user_id=1,
+        items=[
+            EditRatioItem(
+                session_id=uuid4(),
+                session_date=start + timedelta(days=index),
+                ratio=ratio,
+                chars_added=rng.randint(0, 400),
+                chars_removed=rng.randint(0, 400),
+            )
+            for index, ratio in enumerate(ratios)
+        ],
+        summary=EditRatioSummary(count=items, avg=sum(ratios) / items, min=min(ratios), max=max(ratios)),
+    )
+    return jsonable_encoder(response)
+
+
+def session_list_payload(items: int) -> Any:
+    now = datetime.now(timezone.utc)
+    response = SessionListResponse(
+        user_id=1,
+        items=[
+            SessionSummary(
+                id=uuid4(),
+                phase=3,
+                session_date=(now - timedelta(days=index)).date(),
+                created_at=now - timedelta(days=index),
+                has_draft=True,
+                has_final=index % 2 == 0,
+                turn_count=10,
+            )
+            for index in range(items)
+        ],
+        next_cursor="x" * 96,
+    )
+    return jsonable_encoder(response)
+
+
+def report_draft_payload(paragraphs: int) -> Any:
+    return {"session_id": str(uuid4()), "report_draft": REPORT_PARAGRAPH * paragraphs, "saved": True}
+
+
+def _best_us(render: Callable[[Any], bytes], content: Any, runs: int) -> float:
+    best = float("inf")
+    for _ in range(runs):
+        started = time.perf_counter()
+        render(content)
+        best = min(best, time.perf_counter() - started)
+    return best * 1_000_000
+
+
+def measure_payload(name: str, content: Any, runs: int = 50) -> PayloadResult:
+    stdlib = JSONResponse(None).render
+    fast = FastJSONResponse(None).render
+    body = stdlib(content)
+    return PayloadResult(
+        name=name,
+        raw_bytes=len(body),
+        gzip_bytes=len(gzip.compress(body, compresslevel=app_config.RESPONSE_GZIP_LEVEL)),
+        br_bytes=len(brotli.compress(body, quality=app_config.RESPONSE_BROTLI_QUALITY)),
+        stdlib_us=_best_us(stdlib, content, runs),
+        orjson_us=_best_us(fast, content, runs),
+    )
+
+
+def run(edit_ratio_items: int, session_items: int, report_paragraphs: int, runs: int) -> List[PayloadResult]:
+    payloads: Dict[str, Any] = {
+        f"kpi.edit_ratio[{edit_ratio_items}]": edit_ratio_payload(edit_ratio_items),
+        f"sessions.list[{session_items}]": session_list_payload(session_items),
+        f"phase3.report.draft[{report_paragraphs}p]": report_draft_payload(report_paragraphs),
+    }
+    return [measure_payload(name, content, runs) for name, content in payloads.items()]
+
+
+def _parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Compare JSON encoders and response compression on large payloads")
+    parser.add_argument("--edit-ratio-items", type=int, default=365, help="KPI items (default: 365)")
+    parser.add_argument("--session-items", type=int, default=100, help="Session list page size (default: 100)")
+    parser.add_argument("--report-paragraphs", type=int, default=40, help="Report draft paragraphs (default: 40)")
+    parser.add_argument("--runs", type=int, default=50, help="Renders per encoder; best is kept (default: 50)")
+    return parser.parse_args()
+
+
+def main() -> None:
+    args = _parse_args()
+    results = run(args.edit_ratio_items, args.session_items, args.report_paragraphs, args.runs)
+    print(f"{'payload':<30}{'raw B':>9}{'gzip B':>9}{'br B':>9}{'json us':>10}{'orjson us':>11}")
+    for result in results:
+        print(
+            f"{result.name:<30}{result.raw_bytes:>9}{result.gzip_bytes:>9}{result.br_bytes:>9}"
+            f"{result.stdlib_us:>10.1f}{result.orjson_us:>11.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
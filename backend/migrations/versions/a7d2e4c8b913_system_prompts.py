@@ -0,0 +1,104 @@
+"""add content-addressed system_prompts and reference them from sessions
+
+Revision ID: a7d2e4c8b913
+Revises: f3a1c9d2b7e4
+Create Date: 2026-10-19 12:00:00.000000
+"""
+from __future__ import annotations
+
+from datetime import datetime, timezone
+
+from alembic import op
+import sqlalchemy as sa
+
+from app.models.types import CompressedJSON
+from app.utils.prompt_hash import generate_prompt_hash
+
+
+revision = "a7d2e4c8b913"
+down_revision = "f3a1c9d2b7e4"
+branch_labels = None
+depends_on = None
+
+BATCH_SIZE = 500
+
+# CompressedJSON decodes compressed rows and re-encodes per the current DB_COMPRESSION setting.
+sessions = sa.table("sessions", sa.column("id", sa.Uuid()), sa.column("log_json", CompressedJSON()))
+system_prompts = sa.table(
+    "system_prompts",
+    sa.column("prompt_hash", sa.String()),
+    sa.column("content", sa.Text()),
+)
+
+
+def _iter_sessions(connection):
+    last_id = None
+    while True:
+        statement = sa.select(sessions.c.id, sessions.c.log_json).order_by(sessions.c.id).limit(BATCH_SIZE)
+        if last_id is not None:
+            statement = statement.where(sessions.c.id > last_id)
+        rows = connection.execute(statement).all()
+        if not rows:
+            return
+        yield rows
+        last_id = rows[-1][0]
+
+
+def _system_entry(log_json):
+    if isinstance(log_json, list) and log_json and isinstance(log_json[0], dict):
+        if log_json[0].get("role") == "system":
+            return log_json[0]
+    return None
+
+
+def upgrade() -> None:
+    op.execute(
+        """
+        CREATE TABLE IF NOT EXISTS system_prompts (
+            prompt_hash VARCHAR(64) NOT NULL PRIMARY KEY,
+            content TEXT NOT NULL,
+            created_at TIMESTAMP NOT NULL
+        );
+        """
+    )
+    connection = op.get_bind()
+    insert_prompt = sa.text(
+        "INSERT INTO system_prompts (prompt_hash, content, created_at) VALUES (:prompt_hash, :content, :created_at) "
+        "ON CONFLICT (prompt_hash) DO NOTHING"
+    )
+    for rows in _iter_sessions(connection):
+        prompts = {}
+        updates = []
+        for session_id, log_json in rows:
+            entry = _system_entry(log_json)
+            content = entry.get("content") if entry is not None else None
+            if not isinstance(content, str) or not content.strip():
+                continue
+            prompt_hash = generate_prompt_hash(content)
+            prompts.setdefault(prompt_hash, content)
+            updates.append((session_id, [{"role": "system", "prompt_hash": prompt_hash}, *log_json[1:]]))
+        now = datetime.now(timezone.utc)
+        if prompts:
+            connection.execute(
+                insert_prompt,
+                [{"prompt_hash": key, "content": value, "created_at": now} for key, value in prompts.items()],
+            )
+        for session_id, log_json in updates:
+            connection.execute(sessions.update().where(sessions.c.id == session_id).values(log_json=log_json))
+
+
+def downgrade() -> None:
+    connection = op.get_bind()
+    for rows in _iter_sessions(connection):
+        for session_id, log_json in rows:
+            entry = _system_entry(log_json)
+            if entry is None or "content" in entry or not isinstance(entry.get("prompt_hash"), str):
+                continue
+            content = connection.execute(
+                sa.select(system_prompts.c.content).where(system_prompts.c.prompt_hash == entry["prompt_hash"])
+            ).scalar()
+            if content is None:
+                continue
+            restored = [{"role": "system", "content": content}, *log_json[1:]]
+            connection.execute(sessions.update().where(sessions.c.id == session_id).values(log_json=restored))
+    op.execute("DROP TABLE IF EXISTS system_prompts")
@@ -0,0 +1,26 @@
+"""add sessions (user_id, session_date, created_at, id) index for keyset listing
+
+Revision ID: b4e8f1a6c2d7
+Revises: a7d2e4c8b913
+Create Date: 2026-10-19 13:00:00.000000
+"""
+from __future__ import annotations
+
+from alembic import op
+
+
+revision = "b4e8f1a6c2d7"
+down_revision = "a7d2e4c8b913"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.execute(
+        "CREATE INDEX IF NOT EXISTS ix_sessions_user_listing "
+        "ON sessions(user_id, session_date, created_at, id);"
+    )
+
+
+def downgrade() -> None:
+    op.execute("DROP INDEX IF EXISTS ix_sessions_user_listing")
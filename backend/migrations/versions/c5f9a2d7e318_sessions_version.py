@@ -0,0 +1,28 @@
+"""add sessions.version for optimistic concurrency on turn writes
+
+Revision ID: c5f9a2d7e318
+Revises: b4e8f1a6c2d7
+Create Date: 2026-10-19 14:00:00.000000
+"""
+from __future__ import annotations
+
+import sqlalchemy as sa
+from alembic import op
+
+
+revision = "c5f9a2d7e318"
+down_revision = "b4e8f1a6c2d7"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "sessions",
+        sa.Column("version", sa.Integer(), nullable=False, server_default=sa.text("1")),
+    )
+
+
+def downgrade() -> None:
+    with op.batch_alter_table("sessions") as batch_op:
+        batch_op.drop_column("version")
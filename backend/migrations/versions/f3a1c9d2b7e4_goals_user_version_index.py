@@ -0,0 +1,23 @@
+"""add goals (user_id, version) index
+
+Revision ID: f3a1c9d2b7e4
+Revises: e9e967759a9a
+Create Date: 2026-10-19 10:00:00.000000
+"""
+from __future__ import annotations
+
+from alembic import op
+
+
+revision = "f3a1c9d2b7e4"
+down_revision = "e9e967759a9a"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.execute("CREATE INDEX IF NOT EXISTS ix_goals_user_version ON goals(user_id, version);")
+
+
+def downgrade() -> None:
+    op.execute("DROP INDEX IF EXISTS ix_goals_user_version")
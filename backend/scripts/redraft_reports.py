@@ -0,0 +1,195 @@
+"""CLI to regenerate Phase3 report drafts in bulk for a session date range."""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import time
+from datetime import date
+from pathlib import Path
+from typing import Any, Dict
+from uuid import UUID
+
+from sqlalchemy.exc import SQLAlchemyError
+from sqlmodel import Session, create_engine
+
+from app.config.llm_config import LLMConfig
+from app.llm.base import LLMRequest
+from app.llm.factory import get_llm_client
+from app.llm.resilient_client import with_resilience
+from app.repositories import session_repository
+from app.services import phase3_report_service
+
+
+class CheckpointMismatchError(ValueError):
+    """Raised when a checkpoint was written for a different --start/--end range."""
+
+
+def _load_checkpoint(path: Path, start: date, end: date) -> Dict[str, Any]:
+    if not path.exists():
+        return {
+            "start": start.isoformat(),
+            "end": end.isoformat(),
+            "last_session_date": None,
+            "last_session_id": None,
+            "processed": 0,
+            "failed": [],
+        }
+    checkpoint = json.loads(path.read_text(encoding="utf-8"))
+    # A cursor from another range would silently skip (or never reach) sessions of this one.
+    if (checkpoint.get("start"), checkpoint.get("end")) != (start.isoformat(), end.isoformat()):
+        raise CheckpointMismatchError(
+            f"checkpoint {path} was written for {checkpoint.get('start')}..{checkpoint.get('end')}, "
+            f"not {start.isoformat()}..{end.isoformat()}; use another --checkpoint or delete it"
+        )
+    return checkpoint
+
+
+def _write_checkpoint(path: Path, checkpoint: Dict[str, Any]) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_suffix(path.suffix + ".tmp")
+    tmp_path.write_text(json.dumps(checkpoint, ensure_ascii=False, indent=2), encoding="utf-8")
+    tmp_path.replace(path)
+
+
+def _checkpoint_cursor(checkpoint: Dict[str, Any]) -> tuple[date, UUID] | None:
+    if not checkpoint.get("last_session_date") or not checkpoint.get("last_session_id"):
+        return None
+    return date.fromisoformat(checkpoint["last_session_date"]), UUID(checkpoint["last_session_id"])
+
+
+async def _redraft_batch(
+    db: Session,
+    sessions: list,
+    llm_client,
+    llm_config: LLMConfig,
+    concurrency: int,
+    dry_run: bool,
+) -> tuple[int, list[str]]:
+    prepared = []
+    failed: list[str] = []
+    for existing in sessions:
+        try:
+            prepared.append((existing, *phase3_report_service.build_report_prompt(db, existing)))
+        except phase3_report_service.Phase3ReportError:
+            failed.append(str(existing.id))
+
+    if dry_run or not prepared:
+        return len(prepared), failed
+
+    requests = [LLMRequest(system_prompt=report_prompt, user_prompt="") for _, report_prompt, _, _ in prepared]
+    results = await llm_client.generate_many(requests, concurrency=concurrency, return_exceptions=True)
+
+    redrafted = 0
+    for (existing, _report_prompt, prompt_version, prompt_hash), result in zip(prepared, results):
+        if isinstance(result, BaseException):
+            failed.append(str(existing.id))
+            continue
+        phase3_report_service.store_report_draft(
+            db,
+            existing,
+            result,
+            prompt_version=prompt_version,
+            prompt_hash=prompt_hash,
+            model_name=llm_config.model,
+        )
+        redrafted += 1
+    db.commit()
+    return redrafted, failed
+
+
+async def _run(args: argparse.Namespace) -> Dict[str, Any]:
+    db_path = Path(args.db).expanduser().resolve()
+    checkpoint_path = Path(args.checkpoint)
+    checkpoint = _load_checkpoint(checkpoint_path, args.start, args.end)
+    cursor = _checkpoint_cursor(checkpoint)
+
+    engine = create_engine(f"sqlite:///{db_path}", connect_args={"check_same_thread": False})
+    llm_config = LLMConfig.from_env()
+    llm_client = with_resilience(get_llm_client(llm_config))
+
+    started_at = time.perf_counter()
+    processed_this_run = 0
+    with Session(engine) as db:
+        while True:
+            sessions = session_repository.list_phase3_sessions_between(
+                db,
+                start_date=args.start,
+                end_date=args.end,
+                after=cursor,
+                limit=args.batch_size,
+            )
+            if not sessions:
+                break
+
+            try:
+                redrafted, failed = await _redraft_batch(
+                    db,
+                    sessions,
+                    llm_client,
+                    llm_config,
+                    concurrency=args.concurrency,
+                    dry_run=args.dry_run,
+                )
+            except SQLAlchemyError:
+                db.rollback()
+                raise
+
+            last = sessions[-1]
+            cursor = (last.session_date, last.id)
+            processed_this_run += len(sessions)
+            checkpoint["last_session_date"] = last.session_date.isoformat()
+            checkpoint["last_session_id"] = str(last.id)
+            checkpoint["processed"] = int(checkpoint.get("processed", 0)) + redrafted
+            checkpoint["failed"] = list(checkpoint.get("failed", [])) + failed
+            if not args.dry_run:
+                _write_checkpoint(checkpoint_path, checkpoint)
+
+            elapsed = time.perf_counter() - started_at
+            rate = processed_this_run / elapsed if elapsed > 0 else 0.0
+            print(f"batch: {len(sessions)} sessions ({redrafted} redrafted, {len(failed)} failed) - {rate:.2f} sessions/s")
+            db.expunge_all()
+
+    elapsed = time.perf_counter() - started_at
+    return {
+        "start": args.start.isoformat(),
+        "end": args.end.isoformat(),
+        "sessions_scanned": processed_this_run,
+        "redrafted_total": int(checkpoint.get("processed", 0)),
+        "failed_total": len(checkpoint.get("failed", [])),
+        "elapsed_seconds": round(elapsed, 3),
+        "sessions_per_second": round(processed_this_run / elapsed, 3) if elapsed > 0 else 0.0,
+        "dry_run": bool(args.dry_run),
+    }
+
+
+def _parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Regenerate Phase3 report drafts in bulk")
+    parser.add_argument("--db", required=True, help="Path to SQLite DB file")
+    parser.add_argument("--start", required=True, type=date.fromisoformat, help="First session_date (YYYY-MM-DD)")
+    parser.add_argument("--end", required=True, type=date.fromisoformat, help="Last session_date (YYYY-MM-DD)")
+    parser.add_argument("--concurrency", type=int, default=4, help="Concurrent LLM calls (default: 4)")
+    parser.add_argument("--batch-size", type=int, default=50, help="Sessions per batch/commit (default: 50)")
+    parser.add_argument(
+        "--checkpoint",
+        default="out/redraft_checkpoint.json",
+        help="Checkpoint path used to resume (default: out/redraft_checkpoint.json)",
+    )
+    parser.add_argument("--dry-run", action="store_true", help="Build prompts without calling the LLM")
+    return parser.parse_args()
+
+
+def main() -> None:
+    args = _parse_args()
+    try:
+        summary = asyncio.run(_run(args))
+    except CheckpointMismatchError as exc:
+        raise SystemExit(str(exc)) from exc
+
+    print("Redraft Summary")
+    print(json.dumps(summary, ensure_ascii=False, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,331 @@
+"""CLI to bulk export/import users, goals, system prompts and sessions between databases.
+
+Tables are streamed in primary-key order in fixed-size chunks, so memory
+stays bounded regardless of table size. Two formats are supported:
+
+- ``ndjson``: one JSON object per row (``<table>.ndjson``).
+- ``columnar``: gzip-compressed JSON lines, one line per chunk with the
+  values stored column by column (``<table>.columnar.jsonl.gz``). Repeated
+  keys disappear and similar values sit together, so it compresses well.
+
+Both directions resume after interruption: export records the last key and
+byte offset of every completed chunk in ``manifest.json``; import records
+the input offset in a checkpoint and inserts with ON CONFLICT DO NOTHING, so
+a chunk that was committed but not yet checkpointed is skipped on rerun.
+"""
+
+from __future__ import annotations
+
+import argparse
+import gzip
+import json
+import time
+import uuid
+import zlib
+from datetime import date, datetime
+from pathlib import Path
+from typing import Any, Dict, Iterator, List
+
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.engine import Engine
+from sqlmodel import SQLModel
+
+import app.models  # noqa: F401  # register tables on SQLModel.metadata
+
+TABLES = ("users", "goals", "system_prompts", "sessions")
+FORMATS = {"ndjson": ".ndjson", "columnar": ".columnar.jsonl.gz"}
+MANIFEST_NAME = "manifest.json"
+
+
+def _engine(args: argparse.Namespace) -> Engine:
+    if args.url:
+        return sa.create_engine(args.url)
+    db_path = Path(args.db).expanduser().resolve()
+    return sa.create_engine(f"sqlite:///{db_path}", connect_args={"check_same_thread": False})
+
+
+def _table(name: str) -> sa.Table:
+    return SQLModel.metadata.tables[name]
+
+
+def _to_json_value(value: Any) -> Any:
+    if isinstance(value, uuid.UUID):
+        return str(value)
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    return value
+
+
+def _python_type(column: sa.Column) -> type | None:
+    try:
+        return column.type.python_type
+    except NotImplementedError:
+        return None
+
+
+def _from_json_value(column: sa.Column, value: Any) -> Any:
+    if value is None:
+        return None
+    python_type = _python_type(column)
+    if python_type is uuid.UUID and not isinstance(value, uuid.UUID):
+        return uuid.UUID(str(value))
+    if python_type is datetime and isinstance(value, str):
+        return datetime.fromisoformat(value)
+    if python_type is date and isinstance(value, str):
+        return date.fromisoformat(value)
+    return value
+
+
+def _write_json(path: Path, payload: Dict[str, Any]) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_suffix(path.suffix + ".tmp")
+    tmp_path.write_text(json.dumps(payload, ensure_ascii=False, indent=2), encoding="utf-8")
+    tmp_path.replace(path)
+
+
+def _encode_chunk(rows: List[Dict[str, Any]], columns: List[str], fmt: str) -> bytes:
+    if fmt == "ndjson":
+        lines = [json.dumps({key: _to_json_value(row[key]) for key in columns}, ensure_ascii=False) for row in rows]
+        return ("\n".join(lines) + "\n").encode("utf-8")
+    chunk = {
+        "rows": len(rows),
+        "columns": {key: [_to_json_value(row[key]) for row in rows] for key in columns},
+    }
+    # Each chunk is its own gzip member; concatenated members form a valid gzip
+    # stream, and the file can be truncated at a member boundary on resume.
+    return gzip.compress((json.dumps(chunk, ensure_ascii=False) + "\n").encode("utf-8"))
+
+
+def _export_table(
+    engine: Engine,
+    table: sa.Table,
+    out_dir: Path,
+    fmt: str,
+    chunk_size: int,
+    state: Dict[str, Any],
+) -> Iterator[int]:
+    (pk_column,) = table.primary_key.columns
+    columns = [column.name for column in table.columns]
+    path = out_dir / f"{table.name}{FORMATS[fmt]}"
+
+    out_dir.mkdir(parents=True, exist_ok=True)
+    # Drop anything written after the last recorded chunk (an interrupted write).
+    mode = "r+b" if path.exists() and state["offset"] else "wb"
+    with path.open(mode) as handle:
+        handle.seek(state["offset"])
+        handle.truncate()
+        while True:
+            statement = sa.select(table).order_by(pk_column).limit(chunk_size)
+            if state["last_key"] is not None:
+                statement = statement.where(pk_column > _from_json_value(pk_column, state["last_key"]))
+            with engine.connect() as connection:
+                rows = [dict(row._mapping) for row in connection.execute(statement)]
+            if not rows:
+                break
+
+            handle.write(_encode_chunk(rows, columns, fmt))
+            handle.flush()
+            state["offset"] = handle.tell()
+            state["last_key"] = _to_json_value(rows[-1][pk_column.name])
+            state["rows"] += len(rows)
+            yield len(rows)
+    state["done"] = True
+
+
+def run_export(args: argparse.Namespace) -> Dict[str, Any]:
+    out_dir = Path(args.out)
+    manifest_path = out_dir / MANIFEST_NAME
+    if manifest_path.exists():
+        manifest = json.loads(manifest_path.read_text(encoding="utf-8"))
+        if manifest["format"] != args.format:
+            raise SystemExit(f"{manifest_path} was written with format={manifest['format']}")
+    else:
+        manifest = {"format": args.format, "tables": {}}
+
+    engine = _engine(args)
+    started_at = time.perf_counter()
+    for name in args.tables:
+        state = manifest["tables"].setdefault(
+            name,
+            {"file": f"{name}{FORMATS[args.format]}", "rows": 0, "last_key": None, "offset": 0, "done": False},
+        )
+        if state["done"]:
+            continue
+        for written in _export_table(engine, _table(name), out_dir, args.format, args.chunk_size, state):
+            _write_json(manifest_path, manifest)
+            print(f"export {name}: +{written} rows ({state['rows']} total)")
+        _write_json(manifest_path, manifest)
+
+    return {
+        "direction": "export",
+        "format": args.format,
+        "rows": {name: manifest["tables"][name]["rows"] for name in args.tables},
+        "elapsed_seconds": round(time.perf_counter() - started_at, 3),
+    }
+
+
+def _iter_ndjson(path: Path, offset: int, chunk_size: int) -> Iterator[tuple[List[Dict[str, Any]], int]]:
+    with path.open("rb") as handle:
+        handle.seek(offset)
+        rows: List[Dict[str, Any]] = []
+        for line in iter(handle.readline, b""):
+            if line.strip():
+                rows.append(json.loads(line))
+            if len(rows) >= chunk_size:
+                yield rows, handle.tell()
+                rows = []
+        if rows:
+            yield rows, handle.tell()
+
+
+def _iter_gzip_members(path: Path, offset: int) -> Iterator[tuple[bytes, int]]:
+    """Yield (decompressed member, offset just after it) for each gzip member from ``offset``."""
+
+    with path.open("rb") as handle:
+        handle.seek(offset)
+        position = offset
+        pending = b""
+        while True:
+            decompressor = zlib.decompressobj(wbits=31)
+            parts: List[bytes] = []
+            while not decompressor.eof:
+                if not pending:
+                    pending = handle.read(64 * 1024)
+                    if not pending:
+                        if parts:
+                            raise ValueError(f"{path} ends with a truncated chunk")
+                        return
+                parts.append(decompressor.decompress(pending))
+                position += len(pending) - len(decompressor.unused_data)
+                pending = decompressor.unused_data
+            yield b"".join(parts), position
+
+
+def _iter_columnar(path: Path, offset: int) -> Iterator[tuple[List[Dict[str, Any]], int]]:
+    for member, end_offset in _iter_gzip_members(path, offset):
+        chunk = json.loads(member)
+        names = list(chunk["columns"])
+        values = [chunk["columns"][name] for name in names]
+        yield [dict(zip(names, row)) for row in zip(*values)], end_offset
+
+
+def _insert_statement(engine: Engine, table: sa.Table):
+    if engine.dialect.name == "sqlite":
+        return sqlite.insert(table).on_conflict_do_nothing()
+    if engine.dialect.name == "postgresql":
+        return postgresql.insert(table).on_conflict_do_nothing()
+    return table.insert()
+
+
+def _reset_sequence(engine: Engine, table: sa.Table) -> None:
+    (pk_column,) = table.primary_key.columns
+    if engine.dialect.name != "postgresql" or _python_type(pk_column) is not int:
+        return
+    with engine.begin() as connection:
+        connection.execute(
+            sa.text(
+                f"SELECT setval(pg_get_serial_sequence('{table.name}', '{pk_column.name}'), "
+                f"COALESCE((SELECT MAX({pk_column.name}) FROM {table.name}), 1))"
+            )
+        )
+
+
+def run_import(args: argparse.Namespace) -> Dict[str, Any]:
+    in_dir = Path(args.input)
+    manifest = json.loads((in_dir / MANIFEST_NAME).read_text(encoding="utf-8"))
+    checkpoint_path = Path(args.checkpoint) if args.checkpoint else in_dir / "import_checkpoint.json"
+    checkpoint = (
+        json.loads(checkpoint_path.read_text(encoding="utf-8"))
+        if checkpoint_path.exists()
+        else {"tables": {}}
+    )
+
+    engine = _engine(args)
+    if args.create_tables:
+        SQLModel.metadata.create_all(engine)
+
+    started_at = time.perf_counter()
+    for name in args.tables:
+        if name not in manifest["tables"]:
+            continue
+        table = _table(name)
+        state = checkpoint["tables"].setdefault(name, {"offset": 0, "rows": 0, "done": False})
+        if state["done"]:
+            continue
+
+        path = in_dir / manifest["tables"][name]["file"]
+        if manifest["format"] == "ndjson":
+            chunks = _iter_ndjson(path, state["offset"], args.chunk_size)
+        else:
+            chunks = _iter_columnar(path, state["offset"])
+        statement = _insert_statement(engine, table)
+        columns = {column.name: column for column in table.columns}
+        for rows, offset in chunks:
+            params = [
+                {key: _from_json_value(columns[key], value) for key, value in row.items() if key in columns}
+                for row in rows
+            ]
+            with engine.begin() as connection:
+                connection.execute(statement, params)
+            state["offset"] = offset
+            state["rows"] += len(rows)
+            _write_json(checkpoint_path, checkpoint)
+            print(f"import {name}: +{len(rows)} rows ({state['rows']} total)")
+
+        _reset_sequence(engine, table)
+        state["done"] = True
+        _write_json(checkpoint_path, checkpoint)
+
+    return {
+        "direction": "import",
+        "format": manifest["format"],
+        "rows": {name: checkpoint["tables"].get(name, {}).get("rows", 0) for name in args.tables},
+        "elapsed_seconds": round(time.perf_counter() - started_at, 3),
+    }
+
+
+def _parse_tables(value: str) -> List[str]:
+    tables = [name.strip() for name in value.split(",") if name.strip()]
+    unknown = sorted(set(tables) - set(TABLES))
+    if unknown:
+        raise argparse.ArgumentTypeError(f"unknown tables: {', '.join(unknown)}")
+    # Keep dependency order (users -> goals -> system_prompts -> sessions) regardless of the order given.
+    return [name for name in TABLES if name in tables]
+
+
+def _parse_args(argv: List[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Bulk export/import users, goals, system prompts and sessions")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    def _add_common(sub: argparse.ArgumentParser) -> None:
+        target = sub.add_mutually_exclusive_group(required=True)
+        target.add_argument("--db", help="Path to SQLite DB file")
+        target.add_argument("--url", help="SQLAlchemy database URL")
+        sub.add_argument("--tables", type=_parse_tables, default=list(TABLES), help="Comma separated tables")
+        sub.add_argument("--chunk-size", type=int, default=1000, help="Rows per chunk (default: 1000)")
+
+    export_parser = subparsers.add_parser("export", help="Export tables to a directory")
+    _add_common(export_parser)
+    export_parser.add_argument("--out", default="out/export", help="Output directory (default: out/export)")
+    export_parser.add_argument("--format", choices=sorted(FORMATS), default="ndjson", help="Output format")
+
+    import_parser = subparsers.add_parser("import", help="Import tables from an export directory")
+    _add_common(import_parser)
+    import_parser.add_argument("--input", required=True, help="Export directory containing manifest.json")
+    import_parser.add_argument("--checkpoint", help="Checkpoint path (default: <input>/import_checkpoint.json)")
+    import_parser.add_argument("--create-tables", action="store_true", help="Create missing tables first")
+    return parser.parse_args(argv)
+
+
+def main(argv: List[str] | None = None) -> Dict[str, Any]:
+    args = _parse_args(argv)
+    summary = run_export(args) if args.command == "export" else run_import(args)
+
+    print("Transfer Summary")
+    print(json.dumps(summary, ensure_ascii=False, indent=2))
+    return summary
+
+
+if __name__ == "__main__":
+    main()
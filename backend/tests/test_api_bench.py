@@ -0,0 +1,36 @@
+from __future__ import annotations
+
+import sys
+from pathlib import Path
+
+BASE_DIR = Path(__file__).resolve().parents[1]
+if str(BASE_DIR) not in sys.path:
+    sys.path.insert(0, str(BASE_DIR))
+
+from bench.api_bench import compare_results, percentile
+
+
+def _result(p95_ms: float, throughput_rps: float) -> dict:
+    return {
+        "summary": {
+            "throughput_rps": throughput_rps,
+            "operations": {"phase3.turn": {"p95_ms": p95_ms}},
+        }
+    }
+
+
+def test_percentile_interpolates():
+    values = [0.1, 0.2, 0.3, 0.4, 0.5]
+    assert percentile(values, 0.5) == 0.3
+    assert abs(percentile(values, 0.95) - 0.48) < 1e-9
+    assert percentile([], 0.5) is None
+
+
+def test_compare_results_flags_latency_and_throughput_regressions():
+    baseline = _result(p95_ms=100.0, throughput_rps=50.0)
+
+    assert compare_results(_result(p95_ms=105.0, throughput_rps=48.0), baseline, threshold=0.1) == []
+
+    regressions = compare_results(_result(p95_ms=150.0, throughput_rps=30.0), baseline, threshold=0.1)
+    assert len(regressions) == 2
+    assert regressions[0].startswith("phase3.turn")
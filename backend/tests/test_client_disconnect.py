@@ -0,0 +1,142 @@
+from __future__ import annotations
+
+import asyncio
+import sys
+from pathlib import Path
+
+import pytest
+from sqlalchemy.pool import StaticPool
+from sqlmodel import SQLModel, Session as SqlSession, create_engine
+
+BASE_DIR = Path(__file__).resolve().parents[1]
+if str(BASE_DIR) not in sys.path:
+    sys.path.insert(0, str(BASE_DIR))
+
+from app.models.session import Session as SessionModel
+from app.models.user import User
+from app.services import phase3_chat_service, phase3_report_service, phase3_service
+from app.utils.disconnect import ClientDisconnectedError, cancel_on_disconnect
+
+
+def _build_engine():
+    engine = create_engine(
+        "sqlite://",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    )
+    SQLModel.metadata.create_all(engine)
+    return engine
+
+
+def _create_phase3_session(engine):
+    with SqlSession(engine) as session:
+        user = User(name="Test User")
+        session.add(user)
+        session.commit()
+        session.refresh(user)
+        created, _goal_injected = phase3_service.start_phase3_session(session, int(user.id))
+        return created.id, list(created.log_json)
+
+
+def _disconnect_after(seconds: float):
+    async def _receive() -> dict:
+        await asyncio.sleep(seconds)
+        return {"type": "http.disconnect"}
+
+    return _receive
+
+
+def _never_disconnect():
+    async def _receive() -> dict:
+        await asyncio.Event().wait()
+        return {"type": "http.disconnect"}
+
+    return _receive
+
+
+class _SlowClient:
+    def __init__(self) -> None:
+        self.cancelled = False
+
+    async def generate(self, _system_prompt: str, _message: str) -> str:
+        try:
+            await asyncio.sleep(30)
+        except asyncio.CancelledError:
+            self.cancelled = True
+            raise
+        return "too late"
+
+
+def test_cancel_on_disconnect_returns_result_when_work_finishes_first():
+    async def _work() -> str:
+        await asyncio.sleep(0)
+        return "done"
+
+    assert asyncio.run(cancel_on_disconnect(_never_disconnect(), _work())) == "done"
+
+
+def test_cancel_on_disconnect_cancels_work():
+    cancelled = []
+
+    async def _work() -> str:
+        try:
+            await asyncio.sleep(30)
+        except asyncio.CancelledError:
+            cancelled.append(True)
+            raise
+        return "unreachable"
+
+    with pytest.raises(ClientDisconnectedError):
+        asyncio.run(cancel_on_disconnect(_disconnect_after(0.01), _work()))
+    assert cancelled == [True]
+
+
+def test_phase3_turn_cancelled_on_disconnect_is_recorded_and_not_persisted(monkeypatch):
+    engine = _build_engine()
+    session_id, log_before = _create_phase3_session(engine)
+    client = _SlowClient()
+    monkeypatch.setattr(phase3_chat_service, "get_llm_client", lambda _config: client)
+
+    async def _run() -> None:
+        with SqlSession(engine) as session:
+            await cancel_on_disconnect(
+                _disconnect_after(0.05),
+                phase3_chat_service.append_phase3_turn(session, session_id, "途中で閉じます"),
+            )
+
+    with pytest.raises(ClientDisconnectedError):
+        asyncio.run(_run())
+
+    assert client.cancelled is True
+    with SqlSession(engine) as session:
+        stored = session.get(SessionModel, session_id)
+        assert stored.log_json == log_before
+        assert "llm_usage" not in stored.meta_data
+        (entry,) = stored.meta_data["cancellations"]
+        assert entry["pipeline"] == "phase3_turn"
+        assert entry["persisted"] is False
+        assert entry["stages_ms"]["llm"] >= 0
+
+
+def test_report_draft_cancelled_on_disconnect_keeps_previous_draft(monkeypatch):
+    engine = _build_engine()
+    session_id, _log = _create_phase3_session(engine)
+    client = _SlowClient()
+    monkeypatch.setattr(phase3_report_service, "get_llm_client", lambda _config: client)
+
+    async def _run() -> None:
+        with SqlSession(engine) as session:
+            await cancel_on_disconnect(
+                _disconnect_after(0.05),
+                phase3_report_service.generate_phase3_report_draft(session, session_id),
+            )
+
+    with pytest.raises(ClientDisconnectedError):
+        asyncio.run(_run())
+
+    assert client.cancelled is True
+    with SqlSession(engine) as session:
+        stored = session.get(SessionModel, session_id)
+        assert stored.report_draft is None
+        assert "report_generation" not in stored.meta_data
+        assert [entry["pipeline"] for entry in stored.meta_data["cancellations"]] == ["phase3_report_draft"]
@@ -0,0 +1,105 @@
+from __future__ import annotations
+
+import json
+import sys
+from datetime import date
+from pathlib import Path
+
+from sqlalchemy import text
+from sqlalchemy.pool import StaticPool
+from sqlmodel import SQLModel, Session as SqlSession, create_engine
+
+BASE_DIR = Path(__file__).resolve().parents[1]
+if str(BASE_DIR) not in sys.path:
+    sys.path.insert(0, str(BASE_DIR))
+
+from app.core import config as app_config
+from app.models.session import Session as SessionModel
+from app.models.types import ENVELOPE_KEY, TEXT_PREFIX
+from app.models.user import User
+
+LARGE_LOG = [{"role": "system", "content": "安全ガイドライン。" * 400}] + [
+    {"role": "user", "content": f"turn {index}"} for index in range(20)
+]
+LARGE_REPORT = "今日の振り返り。" * 300
+
+
+def _build_engine():
+    engine = create_engine(
+        "sqlite://",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    )
+    SQLModel.metadata.create_all(engine)
+    return engine
+
+
+def _insert_session(engine, log_json, report_final=None):
+    with SqlSession(engine) as session:
+        user = User(name="Test User")
+        session.add(user)
+        session.flush()
+        row = SessionModel(
+            user_id=user.id,
+            session_date=date(2026, 2, 8),
+            phase=3,
+            log_json=log_json,
+            report_final=report_final,
+            meta_data={},
+        )
+        session.add(row)
+        session.commit()
+        return row.id
+
+
+def _raw_columns(engine, session_id):
+    with engine.connect() as connection:
+        return connection.execute(
+            text("SELECT log_json, report_final FROM sessions WHERE id = :id"),
+            {"id": session_id.hex},
+        ).one()
+
+
+def test_compressed_columns_round_trip_and_shrink(monkeypatch):
+    monkeypatch.setattr(app_config, "DB_COMPRESSION", "zlib")
+    engine = _build_engine()
+    session_id = _insert_session(engine, LARGE_LOG, LARGE_REPORT)
+
+    raw_log, raw_report = _raw_columns(engine, session_id)
+    assert json.loads(raw_log)[ENVELOPE_KEY] == "zlib"
+    assert raw_report.startswith(TEXT_PREFIX)
+    plain_size = len(json.dumps(LARGE_LOG, ensure_ascii=False).encode("utf-8"))
+    assert len(raw_log) < plain_size / 4
+
+    with SqlSession(engine) as session:
+        loaded = session.get(SessionModel, session_id)
+        assert loaded.log_json == LARGE_LOG
+        assert loaded.report_final == LARGE_REPORT
+
+
+def test_small_values_and_disabled_mode_are_stored_plain(monkeypatch):
+    monkeypatch.setattr(app_config, "DB_COMPRESSION", "zlib")
+    engine = _build_engine()
+    small_id = _insert_session(engine, [{"role": "system", "content": "short"}], "short report")
+
+    raw_log, raw_report = _raw_columns(engine, small_id)
+    assert json.loads(raw_log) == [{"role": "system", "content": "short"}]
+    assert raw_report == "short report"
+
+    monkeypatch.setattr(app_config, "DB_COMPRESSION", "none")
+    plain_id = _insert_session(engine, LARGE_LOG, LARGE_REPORT)
+    raw_log, raw_report = _raw_columns(engine, plain_id)
+    assert ENVELOPE_KEY not in raw_log
+    assert raw_report == LARGE_REPORT
+
+
+def test_compressed_rows_still_load_after_disabling(monkeypatch):
+    monkeypatch.setattr(app_config, "DB_COMPRESSION", "zlib")
+    engine = _build_engine()
+    session_id = _insert_session(engine, LARGE_LOG, LARGE_REPORT)
+
+    monkeypatch.setattr(app_config, "DB_COMPRESSION", "none")
+    with SqlSession(engine) as session:
+        loaded = session.get(SessionModel, session_id)
+        assert loaded.log_json == LARGE_LOG
+        assert loaded.report_final == LARGE_REPORT
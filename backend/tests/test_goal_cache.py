@@ -0,0 +1,123 @@
+from __future__ import annotations
+
+import sys
+from pathlib import Path
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import event
+from sqlalchemy.pool import StaticPool
+from sqlmodel import SQLModel, Session as SqlSession, create_engine
+
+BASE_DIR = Path(__file__).resolve().parents[1]
+if str(BASE_DIR) not in sys.path:
+    sys.path.insert(0, str(BASE_DIR))
+
+from app.api.phase1_router import router as phase1_router
+from app.api.phase3_router import router as phase3_router
+from app.core import config as app_config
+from app.core.db import get_session
+from app.models.user import User
+from app.repositories import goal_cache
+from app.services import phase1_service
+
+
+def _build_test_app():
+    engine = create_engine(
+        "sqlite://",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    )
+    SQLModel.metadata.create_all(engine)
+
+    app = FastAPI()
+    app.include_router(phase1_router)
+    app.include_router(phase3_router)
+
+    def _override_get_session():
+        with SqlSession(engine) as session:
+            yield session
+
+    app.dependency_overrides[get_session] = _override_get_session
+    return app, engine
+
+
+def _create_user(engine) -> int:
+    with SqlSession(engine) as session:
+        user = User(name="Test User")
+        session.add(user)
+        session.commit()
+        session.refresh(user)
+        return int(user.id)
+
+
+def _count_goal_queries(engine) -> list[str]:
+    statements: list[str] = []
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _record(_conn, _cursor, statement, *_args):
+        if statement.lstrip().upper().startswith("SELECT") and "FROM goals" in statement:
+            statements.append(statement)
+
+    return statements
+
+
+def _confirm_goal(client: TestClient, engine, user_id: int, goal_text: str) -> dict:
+    with SqlSession(engine) as session:
+        phase1_session_id = phase1_service.start_phase1_session(session, user_id).id
+    response = client.post(
+        f"/api/v1/phase1/session/{phase1_session_id}/confirm",
+        json={"goal_text": goal_text},
+    )
+    assert response.status_code == 200
+    return response.json()
+
+
+def test_phase3_session_starts_reuse_cached_active_goal():
+    app, engine = _build_test_app()
+    user_id = _create_user(engine)
+    client = TestClient(app)
+    _confirm_goal(client, engine, user_id, "毎日5分の振り返り")
+    goal_queries = _count_goal_queries(engine)
+
+    for _ in range(3):
+        response = client.post("/api/v1/phase3/session", json={"user_id": user_id})
+        assert response.status_code == 200
+        assert response.json()["goal_injected"] is True
+
+    assert len(goal_queries) == 1
+    assert "max(" not in goal_queries[0].lower()
+
+
+def test_confirm_goal_invalidates_cached_goal():
+    app, engine = _build_test_app()
+    user_id = _create_user(engine)
+    client = TestClient(app)
+
+    first = client.post("/api/v1/phase3/session", json={"user_id": user_id})
+    assert first.json()["goal_injected"] is False
+
+    confirmed = _confirm_goal(client, engine, user_id, "週1回の1on1")
+    assert confirmed["version"] == 1
+    with SqlSession(engine) as session:
+        assert goal_cache.get_goal_state(session, user_id).active_content == "週1回の1on1"
+
+    second = client.post("/api/v1/phase3/session", json={"user_id": user_id})
+    assert second.json()["goal_injected"] is True
+
+    assert _confirm_goal(client, engine, user_id, "新しい目標")["version"] == 2
+    with SqlSession(engine) as session:
+        assert goal_cache.get_active_goal_content(session, user_id) == "新しい目標"
+
+
+def test_goal_cache_is_disabled_with_zero_ttl(monkeypatch):
+    monkeypatch.setattr(app_config, "GOAL_CACHE_TTL_SECONDS", 0)
+    app, engine = _build_test_app()
+    user_id = _create_user(engine)
+    client = TestClient(app)
+    goal_queries = _count_goal_queries(engine)
+
+    for _ in range(2):
+        assert client.post("/api/v1/phase3/session", json={"user_id": user_id}).status_code == 200
+
+    assert len(goal_queries) >= 2
@@ -0,0 +1,106 @@
+from __future__ import annotations
+
+import sys
+from pathlib import Path
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import event
+from sqlalchemy.exc import OperationalError
+from sqlmodel import Session as SqlSession, create_engine
+
+BASE_DIR = Path(__file__).resolve().parents[1]
+if str(BASE_DIR) not in sys.path:
+    sys.path.insert(0, str(BASE_DIR))
+
+from app.api import health
+from app.core import config as app_config
+from app.core.db import get_session
+from app.services import readiness
+
+
+@pytest.fixture(autouse=True)
+def _clear_readiness():
+    readiness.clear()
+    yield
+    readiness.clear()
+
+
+def _build_test_app(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'health.db'}", connect_args={"check_same_thread": False})
+    statements: list[str] = []
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _record(_conn, _cursor, statement, *_args):
+        statements.append(statement)
+
+    app = FastAPI()
+    app.include_router(health.router)
+
+    def _override_get_session():
+        with SqlSession(engine) as session:
+            yield session
+
+    app.dependency_overrides[get_session] = _override_get_session
+    return app, engine, statements
+
+
+def test_live_does_no_database_io(tmp_path):
+    app, _engine, statements = _build_test_app(tmp_path)
+    client = TestClient(app)
+
+    for _ in range(5):
+        response = client.get("/health/live")
+        assert response.status_code == 200
+        assert response.json() == {"status": "ok"}
+
+    assert statements == []
+
+
+def test_ready_caches_the_database_check(tmp_path, monkeypatch):
+    monkeypatch.setattr(app_config, "HEALTH_READY_CACHE_SECONDS", 60)
+    app, engine, statements = _build_test_app(tmp_path)
+    client = TestClient(app)
+
+    responses = [client.get("/health/ready") for _ in range(5)]
+    legacy = client.get("/health")
+
+    assert all(response.status_code == 200 for response in responses)
+    assert legacy.json() == {"status": "ok", "db": "ok"}
+    assert statements == ["SELECT 1"]
+    data = responses[-1].json()
+    assert data["status"] == "ok"
+    assert data["db"]["status"] == "ok"
+    assert data["db"]["latency_ms"] >= 0
+    assert data["pool"]["class"] == type(engine.pool).__name__
+    assert data["pool"]["checkedout"] == 0
+    assert data["llm_scheduler"]["queue_depth"] == 0
+
+
+def test_ready_refreshes_after_ttl(tmp_path, monkeypatch):
+    monkeypatch.setattr(app_config, "HEALTH_READY_CACHE_SECONDS", 0)
+    app, _engine, statements = _build_test_app(tmp_path)
+    client = TestClient(app)
+
+    client.get("/health/ready")
+    client.get("/health/ready")
+
+    assert statements == ["SELECT 1", "SELECT 1"]
+
+
+def test_ready_reports_unavailable_database(tmp_path):
+    app, engine, _statements = _build_test_app(tmp_path)
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _fail(*_args):
+        raise OperationalError("SELECT 1", {}, Exception("database is locked"))
+
+    client = TestClient(app)
+    ready = client.get("/health/ready")
+    legacy = client.get("/health")
+
+    assert ready.status_code == 503
+    assert ready.json()["status"] == "unavailable"
+    assert ready.json()["db"]["error"] == "OperationalError"
+    assert legacy.status_code == 503
@@ -0,0 +1,45 @@
+from __future__ import annotations
+
+import os
+import sys
+from pathlib import Path
+
+BASE_DIR = Path(__file__).resolve().parents[1]
+if str(BASE_DIR) not in sys.path:
+    sys.path.insert(0, str(BASE_DIR))
+
+from bench.import_time import measure_import_time, parse_importtime
+
+# Generous default so slow CI machines pass; tighten locally with IMPORT_TIME_BUDGET_MS.
+IMPORT_TIME_BUDGET_MS = float(os.getenv("IMPORT_TIME_BUDGET_MS", "3000"))
+
+
+def test_parse_importtime_reads_depth_and_times():
+    output = "\n".join(
+        [
+            "import time: self [us] | cumulative | imported package",
+            "import time:       120 |        120 |     app.llm",
+            "import time:       300 |        420 |   app.llm.factory",
+            "import time:      1000 |       1420 | app.main",
+        ]
+    )
+    entries = parse_importtime(output)
+    assert [(entry.module, entry.depth) for entry in entries] == [
+        ("app.llm", 2),
+        ("app.llm.factory", 1),
+        ("app.main", 0),
+    ]
+    assert entries[-1].self_us == 1000
+    assert entries[-1].cumulative_us == 1420
+
+
+def test_app_startup_defers_llm_providers_and_stays_in_budget():
+    report = measure_import_time("app.main", env={"LLM_PROVIDER": "mock"})
+
+    assert "app.llm.factory" in report.modules
+    assert "app.llm.mock_client" not in report.modules
+    assert "app.llm.openai_client" not in report.modules
+    assert "openai" not in report.modules
+    assert report.total_ms <= IMPORT_TIME_BUDGET_MS, [
+        (entry.module, entry.self_us) for entry in report.slowest(10)
+    ]
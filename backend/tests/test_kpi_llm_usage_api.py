@@ -0,0 +1,141 @@
+from __future__ import annotations
+
+import sys
+from datetime import date
+from pathlib import Path
+from uuid import uuid4
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy.pool import StaticPool
+from sqlmodel import SQLModel, Session as SqlSession, create_engine
+
+BASE_DIR = Path(__file__).resolve().parents[1]
+if str(BASE_DIR) not in sys.path:
+    sys.path.insert(0, str(BASE_DIR))
+
+from app.api.kpi_router import router as kpi_router
+from app.api.phase1_router import router as phase1_router
+from app.core.db import get_session
+from app.models.session import Session as SessionModel
+from app.models.user import User
+from app.services import phase1_service
+
+
+def _build_test_app():
+    engine = create_engine(
+        "sqlite://",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    )
+    SQLModel.metadata.create_all(engine)
+
+    app = FastAPI()
+    app.include_router(kpi_router)
+    app.include_router(phase1_router)
+
+    def _override_get_session():
+        with SqlSession(engine) as session:
+            yield session
+
+    app.dependency_overrides[get_session] = _override_get_session
+    return app, engine
+
+
+def _create_user(engine) -> int:
+    with SqlSession(engine) as session:
+        user = User(name="Test User")
+        session.add(user)
+        session.commit()
+        session.refresh(user)
+        return int(user.id)
+
+
+def _add_session(engine, user_id: int, phase: int, meta_data: dict) -> None:
+    with SqlSession(engine) as session:
+        session.add(
+            SessionModel(
+                id=uuid4(),
+                user_id=user_id,
+                session_date=date(2026, 2, 8),
+                phase=phase,
+                log_json=[],
+                meta_data=meta_data,
+            )
+        )
+        session.commit()
+
+
+def test_llm_usage_kpi_aggregates_tokens_cost_and_latency(monkeypatch):
+    monkeypatch.setenv("LLM_COST_PROMPT_PER_1K", "0.5")
+    monkeypatch.setenv("LLM_COST_COMPLETION_PER_1K", "1.5")
+    app, engine = _build_test_app()
+    user_id = _create_user(engine)
+    _add_session(
+        engine,
+        user_id,
+        phase=1,
+        meta_data={
+            "llm_usage": [{"latency_ms": 100.0, "ttft_ms": None}, {"latency_ms": 300.0, "ttft_ms": 50.0}],
+            "llm_usage_totals": {
+                "gpt-a": {"calls": 2, "prompt_tokens": 1000, "completion_tokens": 200, "latency_ms": 400.0}
+            },
+        },
+    )
+    _add_session(
+        engine,
+        user_id,
+        phase=3,
+        meta_data={
+            "llm_usage": [{"latency_ms": 200.0, "ttft_ms": None}],
+            "llm_usage_totals": {
+                "gpt-a": {"calls": 1, "prompt_tokens": 1000, "completion_tokens": 800, "latency_ms": 200.0}
+            },
+        },
+    )
+    _add_session(engine, user_id, phase=3, meta_data={})
+
+    response = TestClient(app).get("/api/v1/kpi/llm-usage", params={"user_id": user_id})
+    assert response.status_code == 200
+    data = response.json()
+
+    assert data["calls"] == 3
+    assert data["prompt_tokens"] == 2000
+    assert data["completion_tokens"] == 1000
+    assert data["estimated_cost"] == 2000 / 1000 * 0.5 + 1000 / 1000 * 1.5
+    assert data["latency_ms"]["count"] == 3
+    assert data["latency_ms"]["p50"] == 200.0
+    assert data["ttft_ms"]["count"] == 1
+    assert data["by_model"][0]["model_name"] == "gpt-a"
+    assert data["by_model"][0]["latency_ms_avg"] == 200.0
+
+    phase3_only = TestClient(app).get("/api/v1/kpi/llm-usage", params={"user_id": user_id, "phase": 3})
+    assert phase3_only.json()["calls"] == 1
+
+
+def test_llm_usage_kpi_counts_recorded_turns():
+    app, engine = _build_test_app()
+    user_id = _create_user(engine)
+    with SqlSession(engine) as session:
+        session_id = phase1_service.start_phase1_session(session, user_id).id
+    client = TestClient(app)
+
+    for message in ("一つ目", "二つ目"):
+        response = client.post(f"/api/v1/phase1/session/{session_id}/turn", json={"message": message})
+        assert response.status_code == 200
+
+    data = client.get("/api/v1/kpi/llm-usage", params={"user_id": user_id}).json()
+    assert data["calls"] == 2
+    assert data["total_tokens"] > 0
+    assert data["estimated_cost"] == 0.0
+    assert data["latency_ms"]["count"] == 2
+
+
+def test_llm_usage_kpi_empty_user():
+    app, engine = _build_test_app()
+    user_id = _create_user(engine)
+
+    data = TestClient(app).get("/api/v1/kpi/llm-usage", params={"user_id": user_id}).json()
+    assert data["calls"] == 0
+    assert data["latency_ms"] == {"count": 0, "avg": None, "p50": None, "p95": None, "max": None}
+    assert data["by_model"] == []
@@ -2,11 +2,15 @@ from __future__ import annotations
 
 import asyncio
 import importlib.util
+import logging
 import os
 import sys
+import time
 from contextlib import contextmanager
 from pathlib import Path
 
+import pytest
+
 
 def _load_module(module_name: str, relative_path: str):
     module_path = Path(__file__).resolve().parents[1] / relative_path
@@ -68,3 +72,188 @@ def test_config_env_override():
         assert config.model == "mock-x"
         assert config.temperature == 0.25
         assert config.max_tokens == 512
+
+
+def test_generate_many_preserves_order_and_bounds_concurrency():
+    state = {"in_flight": 0, "peak": 0}
+
+    class _SlowClient(llm_mock.MockLLMClient):
+        async def generate(self, system_prompt: str, user_prompt: str, **kwargs) -> str:
+            state["in_flight"] += 1
+            state["peak"] = max(state["peak"], state["in_flight"])
+            await asyncio.sleep(0.01 * (5 - int(user_prompt)))
+            state["in_flight"] -= 1
+            return f"done-{user_prompt}"
+
+    client = _SlowClient(llm_config.LLMConfig())
+    requests = [llm_base.LLMRequest(system_prompt="system", user_prompt=str(index)) for index in range(5)]
+    results = asyncio.run(client.generate_many(requests, concurrency=2))
+
+    assert results == [f"done-{index}" for index in range(5)]
+    assert state["peak"] == 2
+
+
+def test_generate_many_can_return_exceptions():
+    class _FlakyClient(llm_mock.MockLLMClient):
+        async def generate(self, system_prompt: str, user_prompt: str, **kwargs) -> str:
+            if user_prompt == "bad":
+                raise llm_base.LLMClientError("boom")
+            return user_prompt
+
+    client = _FlakyClient(llm_config.LLMConfig())
+    requests = [
+        llm_base.LLMRequest(system_prompt="system", user_prompt=prompt) for prompt in ("a", "bad", "c")
+    ]
+    results = asyncio.run(client.generate_many(requests, return_exceptions=True))
+
+    assert results[0] == "a"
+    assert isinstance(results[1], Exception)
+    assert results[2] == "c"
+
+
+def _collect_stream(client, system_prompt: str, user_prompt: str) -> list[str]:
+    async def _collect() -> list[str]:
+        return [chunk async for chunk in client.stream(system_prompt, user_prompt)]
+
+    return asyncio.run(_collect())
+
+
+def test_mock_fixed_latency_and_token_rate():
+    profile = llm_config.MockLLMProfile(latency="fixed", latency_ms=30, tokens_per_second=1000)
+    client = llm_mock.MockLLMClient(llm_config.LLMConfig(), profile)
+
+    started = time.perf_counter()
+    asyncio.run(client.generate("system", "hello"))
+    assert time.perf_counter() - started >= 0.03
+
+
+def test_mock_seeded_latency_is_reproducible():
+    profile = llm_config.MockLLMProfile(latency="longtail", latency_ms=100, seed=7)
+    client = llm_mock.MockLLMClient(llm_config.LLMConfig(), profile)
+
+    llm_mock.reset_mock_rng()
+    first = [client._sample_latency(llm_mock._shared_rng(7)) for _ in range(5)]
+    llm_mock.reset_mock_rng()
+    second = [client._sample_latency(llm_mock._shared_rng(7)) for _ in range(5)]
+    assert first == second
+    assert len(set(first)) > 1
+
+
+def test_unknown_mock_latency_profile_is_rejected_at_config_time(monkeypatch):
+    monkeypatch.setenv("LLM_MOCK_LATENCY", "lognormal")
+
+    with pytest.raises(ValueError, match="LLM_MOCK_LATENCY 'lognormal'"):
+        llm_config.MockLLMProfile.from_env()
+    with pytest.raises(ValueError, match="expected one of none, fixed, normal, longtail"):
+        llm_config.MockLLMProfile(latency="slow")
+
+
+def test_startup_validation_checks_mock_settings_only_for_the_mock_provider(monkeypatch):
+    monkeypatch.setenv("LLM_MOCK_LATENCY", "lognormal")
+
+    monkeypatch.setenv("LLM_PROVIDER", "mock")
+    with pytest.raises(ValueError, match="LLM_MOCK_LATENCY"):
+        llm_factory.validate_llm_settings(llm_config.LLMConfig())
+    monkeypatch.setenv("LLM_PROVIDER", "openai")
+    llm_factory.validate_llm_settings(llm_config.LLMConfig())
+
+
+def test_mock_injected_errors_are_retryable():
+    profile = llm_config.MockLLMProfile(error_rate=1.0)
+    client = llm_mock.MockLLMClient(llm_config.LLMConfig(), profile)
+
+    # The mock raises the package's error type, not the path-loaded copy above.
+    with pytest.raises(Exception, match="mock injected error") as excinfo:
+        asyncio.run(client.generate("system", "hello"))
+    assert type(excinfo.value).__name__ == "LLMRetryableError"
+
+
+def test_mock_stream_chunks_match_generate():
+    profile = llm_config.MockLLMProfile(response_tokens=50)
+    client = llm_mock.MockLLMClient(llm_config.LLMConfig(), profile)
+
+    chunks = _collect_stream(client, "system", "hello world")
+    assert len(chunks) > 1
+    assert "".join(chunks) == asyncio.run(client.generate("system", "hello world"))
+
+
+def test_mock_prompts_are_not_logged_at_info(caplog):
+    client = llm_mock.MockLLMClient(llm_config.LLMConfig())
+
+    with caplog.at_level(logging.INFO):
+        asyncio.run(client.generate("secret system", "secret user"))
+    assert "secret" not in caplog.text
+
+    with caplog.at_level(logging.DEBUG):
+        asyncio.run(client.generate("secret system", "secret user"))
+    assert "secret system" in caplog.text
+
+
+def test_generate_records_latency_and_estimated_usage():
+    profile = llm_config.MockLLMProfile(latency="fixed", latency_ms=20, response_tokens=40)
+    client = llm_mock.MockLLMClient(llm_config.LLMConfig(), profile)
+
+    response = asyncio.run(client.generate("system prompt", "hello world"))
+
+    meta = client.last_meta_data
+    assert meta["latency_ms"] >= 20
+    assert meta["ttft_ms"] is None
+    assert meta["usage_source"] == "estimate"
+    assert meta["completion_tokens"] >= 40
+    assert meta["total_tokens"] == meta["prompt_tokens"] + meta["completion_tokens"]
+    assert meta["response_chars"] == len(response)
+
+
+def test_generate_prefers_provider_reported_usage():
+    class _UsageClient(llm_base.BaseLLMClient):
+        config = llm_config.LLMConfig()
+
+        async def generate(self, system_prompt: str, user_prompt: str, **kwargs) -> str:
+            llm_base.report_usage(123, 45)
+            return "ok"
+
+    client = _UsageClient()
+    asyncio.run(client.generate("system", "user"))
+
+    assert client.last_meta_data["usage_source"] == "provider"
+    assert client.last_meta_data["prompt_tokens"] == 123
+    assert client.last_meta_data["completion_tokens"] == 45
+
+
+def test_stream_records_time_to_first_token():
+    profile = llm_config.MockLLMProfile(latency="fixed", latency_ms=20, tokens_per_second=500, response_tokens=20)
+    client = llm_mock.MockLLMClient(llm_config.LLMConfig(), profile)
+
+    _collect_stream(client, "system", "hello world")
+
+    meta = client.last_meta_data
+    assert meta["ttft_ms"] >= 20
+    assert meta["latency_ms"] > meta["ttft_ms"]
+
+
+def test_generate_result_keeps_metadata_per_call_on_shared_client():
+    class _UsageClient(llm_base.BaseLLMClient):
+        config = llm_config.LLMConfig()
+
+        async def generate(self, system_prompt: str, user_prompt: str, **kwargs) -> str:
+            tokens = int(user_prompt)
+            # Finish in reverse order so the calls overlap.
+            await asyncio.sleep(0.01 * (5 - tokens))
+            llm_base.report_usage(tokens, tokens * 10)
+            return f"done-{user_prompt}"
+
+    client = _UsageClient()
+
+    async def _run():
+        return await asyncio.gather(*(client.generate_result(f"system-{i}", str(i)) for i in range(5)))
+
+    results = asyncio.run(_run())
+
+    for index, result in enumerate(results):
+        assert isinstance(result, llm_base.LLMResult)
+        assert result.text == f"done-{index}"
+        assert result.usage["prompt_tokens"] == index
+        assert result.usage["completion_tokens"] == index * 10
+        assert result.timings["latency_ms"] is not None
+        assert result.meta_data["system_prompt_hash"] != results[(index + 1) % 5].meta_data["system_prompt_hash"]
+    assert client.last_meta_data is None
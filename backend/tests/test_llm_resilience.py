@@ -0,0 +1,178 @@
+from __future__ import annotations
+
+import asyncio
+import sys
+import time
+from pathlib import Path
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy.pool import StaticPool
+from sqlmodel import SQLModel, Session as SqlSession, create_engine
+
+BASE_DIR = Path(__file__).resolve().parents[1]
+if str(BASE_DIR) not in sys.path:
+    sys.path.insert(0, str(BASE_DIR))
+
+from app.api.phase3_router import router as phase3_router
+from app.config.llm_config import LLMConfig, LLMResilienceConfig
+from app.core.db import get_session
+from app.llm.base import (
+    BaseLLMClient,
+    LLMCircuitOpenError,
+    LLMClientError,
+    LLMRateLimitError,
+    LLMTimeoutError,
+)
+from app.llm.resilient_client import (
+    CircuitBreaker,
+    ResilienceState,
+    ResilientLLMClient,
+    reset_resilience_states,
+)
+from app.models.user import User
+from app.services import phase3_chat_service, phase3_service
+
+
+class FaultInjectingLLMClient(BaseLLMClient):
+    """Plays back a script of (delay_seconds, error_or_None) per call."""
+
+    def __init__(self, script: list[tuple[float, Exception | None]]) -> None:
+        self.config = LLMConfig()
+        self.script = list(script)
+        self.calls = 0
+
+    async def generate(self, system_prompt: str, user_prompt: str, **kwargs) -> str:
+        index = min(self.calls, len(self.script) - 1)
+        self.calls += 1
+        delay, error = self.script[index]
+        if delay:
+            await asyncio.sleep(delay)
+        if error is not None:
+            raise error
+        return f"ok-{index}"
+
+
+async def _no_sleep(_seconds: float) -> None:
+    return None
+
+
+def _wrap(inner: BaseLLMClient, **overrides) -> ResilientLLMClient:
+    resilience = LLMResilienceConfig(**overrides)
+    return ResilientLLMClient(
+        inner,
+        resilience,
+        state=ResilienceState(resilience),
+        rng=lambda: 1.0,
+        sleep=_no_sleep,
+    )
+
+
+def test_retries_retryable_errors_then_succeeds():
+    inner = FaultInjectingLLMClient(
+        [
+            (0, LLMRateLimitError("429")),
+            (0, LLMTimeoutError("timeout")),
+            (0, None),
+        ]
+    )
+    client = _wrap(inner, max_attempts=3)
+
+    assert asyncio.run(client.generate("system", "user")) == "ok-2"
+    assert inner.calls == 3
+
+
+def test_non_retryable_error_is_not_retried():
+    inner = FaultInjectingLLMClient([(0, LLMClientError("bad request"))])
+    client = _wrap(inner, max_attempts=3)
+
+    with pytest.raises(LLMClientError):
+        asyncio.run(client.generate("system", "user"))
+    assert inner.calls == 1
+
+
+def test_attempt_deadline_bounds_hung_request():
+    inner = FaultInjectingLLMClient([(5.0, None)])
+    client = _wrap(inner, max_attempts=2, attempt_timeout=0.05)
+
+    started = time.perf_counter()
+    with pytest.raises(LLMTimeoutError):
+        asyncio.run(client.generate("system", "user"))
+    assert time.perf_counter() - started < 1.0
+    assert inner.calls == 2
+
+
+def test_hedged_request_wins_when_primary_is_slow():
+    inner = FaultInjectingLLMClient([(5.0, None), (0, None)])
+    client = _wrap(inner, hedge_enabled=True, hedge_after=0.02, attempt_timeout=10)
+
+    started = time.perf_counter()
+    assert asyncio.run(client.generate("system", "user")) == "ok-1"
+    assert time.perf_counter() - started < 1.0
+    assert inner.calls == 2
+
+
+def test_circuit_opens_after_consecutive_failures():
+    inner = FaultInjectingLLMClient([(0, LLMRateLimitError("429"))])
+    client = _wrap(inner, max_attempts=1, breaker_failure_threshold=2, breaker_reset_timeout=60)
+
+    for _ in range(2):
+        with pytest.raises(LLMRateLimitError):
+            asyncio.run(client.generate("system", "user"))
+    with pytest.raises(LLMCircuitOpenError):
+        asyncio.run(client.generate("system", "user"))
+    assert inner.calls == 2
+
+
+def test_circuit_half_open_probe_closes_on_success():
+    now = {"value": 0.0}
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=10, clock=lambda: now["value"])
+
+    breaker.record_failure()
+    assert breaker.allow() is False
+    now["value"] = 11.0
+    assert breaker.allow() is True
+    assert breaker.allow() is False
+    breaker.record_success()
+    assert breaker.state == CircuitBreaker.CLOSED
+
+
+def test_phase3_turn_returns_503_when_llm_stays_unavailable(monkeypatch):
+    engine = create_engine(
+        "sqlite://",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    )
+    SQLModel.metadata.create_all(engine)
+    app = FastAPI()
+    app.include_router(phase3_router)
+
+    def _override_get_session():
+        with SqlSession(engine) as session:
+            yield session
+
+    app.dependency_overrides[get_session] = _override_get_session
+
+    with SqlSession(engine) as session:
+        user = User(name="Test User")
+        session.add(user)
+        session.commit()
+        session.refresh(user)
+        created, _goal_injected = phase3_service.start_phase3_session(session, int(user.id))
+        session_id = created.id
+
+    inner = FaultInjectingLLMClient([(0, LLMRateLimitError("429"))])
+    monkeypatch.setenv("LLM_MAX_ATTEMPTS", "2")
+    monkeypatch.setenv("LLM_BACKOFF_BASE_SECONDS", "0")
+    monkeypatch.setattr(phase3_chat_service, "get_llm_client", lambda _config: inner)
+    reset_resilience_states()
+
+    response = TestClient(app).post(
+        f"/api/v1/phase3/session/{session_id}/turn",
+        json={"message": "こんにちは"},
+    )
+    reset_resilience_states()
+
+    assert response.status_code == 503
+    assert inner.calls == 2
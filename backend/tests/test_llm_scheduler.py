@@ -0,0 +1,124 @@
+from __future__ import annotations
+
+import asyncio
+import sys
+from pathlib import Path
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+BASE_DIR = Path(__file__).resolve().parents[1]
+if str(BASE_DIR) not in sys.path:
+    sys.path.insert(0, str(BASE_DIR))
+
+from app.api.llm_router import router as llm_router
+from app.config.llm_config import LLMSchedulerConfig
+from app.llm import scheduler as scheduler_module
+from app.llm.scheduler import LLMPriority, LLMScheduler, TokenBucket
+
+
+class _FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_interactive_turn_is_admitted_before_queued_report():
+    scheduler = LLMScheduler(LLMSchedulerConfig(max_concurrency=1, max_concurrency_per_user=5))
+    order: list[str] = []
+
+    async def _run() -> None:
+        holder = await scheduler.acquire(user_id=1, priority=LLMPriority.REPORT)
+
+        async def _worker(name: str, priority: LLMPriority) -> None:
+            async with scheduler.slot(user_id=2, priority=priority):
+                order.append(name)
+
+        report = asyncio.create_task(_worker("report", LLMPriority.REPORT))
+        await asyncio.sleep(0)
+        interactive = asyncio.create_task(_worker("interactive", LLMPriority.INTERACTIVE))
+        await asyncio.sleep(0)
+
+        snapshot = scheduler.snapshot()
+        assert snapshot["queue_depth"] == 2
+        assert snapshot["queue_depth_by_priority"] == {"interactive": 1, "report": 1}
+
+        scheduler.release(holder)
+        await asyncio.gather(report, interactive)
+
+    asyncio.run(_run())
+    assert order == ["interactive", "report"]
+
+
+def test_per_user_cap_does_not_block_other_users():
+    scheduler = LLMScheduler(LLMSchedulerConfig(max_concurrency=4, max_concurrency_per_user=1))
+
+    async def _run() -> None:
+        first = await scheduler.acquire(user_id=1)
+        blocked = asyncio.create_task(scheduler.acquire(user_id=1))
+        await asyncio.sleep(0)
+        other = await asyncio.wait_for(scheduler.acquire(user_id=2), timeout=1)
+
+        snapshot = scheduler.snapshot()
+        assert snapshot["in_flight"] == 2
+        assert snapshot["queue_depth"] == 1
+        assert not blocked.done()
+
+        scheduler.release(first)
+        second = await asyncio.wait_for(blocked, timeout=1)
+        scheduler.release(second)
+        scheduler.release(other)
+
+    asyncio.run(_run())
+    assert scheduler.snapshot()["in_flight"] == 0
+
+
+def test_cancelled_waiter_leaves_queue():
+    scheduler = LLMScheduler(LLMSchedulerConfig(max_concurrency=1))
+
+    async def _run() -> None:
+        holder = await scheduler.acquire(user_id=1)
+        waiter = asyncio.create_task(scheduler.acquire(user_id=2))
+        await asyncio.sleep(0)
+        waiter.cancel()
+        await asyncio.gather(waiter, return_exceptions=True)
+        assert scheduler.snapshot()["queue_depth"] == 0
+        scheduler.release(holder)
+
+    asyncio.run(_run())
+    assert scheduler.snapshot()["in_flight"] == 0
+
+
+def test_token_bucket_reserves_in_order():
+    clock = _FakeClock()
+    bucket = TokenBucket(rate_per_minute=60, clock=clock)
+
+    assert bucket.reserve(60) == 0.0
+    assert bucket.reserve(30) == 30.0
+    clock.now = 30.0
+    assert bucket.reserve(1) == 1.0
+
+
+@pytest.fixture()
+def process_scheduler(monkeypatch):
+    """Swap in a fresh process-wide scheduler; monkeypatch restores the previous one on teardown."""
+
+    scheduler = LLMScheduler(LLMSchedulerConfig(max_concurrency=3))
+    monkeypatch.setattr(scheduler_module, "_scheduler", scheduler)
+    return scheduler
+
+
+def test_scheduler_stats_endpoint_exposes_queue_metrics(process_scheduler):
+    app = FastAPI()
+    app.include_router(llm_router)
+    client = TestClient(app)
+
+    response = client.get("/api/v1/llm/scheduler")
+    assert response.status_code == 200
+    data = response.json()
+    assert data["max_concurrency"] == 3
+    assert data["queue_depth"] == 0
+    assert set(data["wait_time_by_priority"]) == {"interactive", "report"}
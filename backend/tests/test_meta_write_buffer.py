@@ -0,0 +1,223 @@
+from __future__ import annotations
+
+import asyncio
+import sys
+import threading
+import time
+from pathlib import Path
+from uuid import uuid4
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import event
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.pool import StaticPool
+from sqlmodel import SQLModel, Session as SqlSession, create_engine
+
+BASE_DIR = Path(__file__).resolve().parents[1]
+if str(BASE_DIR) not in sys.path:
+    sys.path.insert(0, str(BASE_DIR))
+
+from app import main
+from app.api.phase3_router import router as phase3_router
+from app.core import config as app_config
+from app.core.db import get_session
+from app.models.session import Session as SessionModel
+from app.models.user import User
+from app.repositories import session_repository
+from app.safety.safety_rules import SAFETY_VERSION
+from app.services import meta_write_buffer, phase3_service
+
+
+@pytest.fixture()
+def buffer(monkeypatch):
+    monkeypatch.setattr(app_config, "META_WRITE_BEHIND", True)
+    yield meta_write_buffer.reset_meta_write_buffer(max_pending=100)
+    meta_write_buffer.reset_meta_write_buffer()
+
+
+def _build_engine():
+    engine = create_engine(
+        "sqlite://",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    )
+    SQLModel.metadata.create_all(engine)
+    return engine
+
+
+def _build_test_app(engine):
+    app = FastAPI()
+    app.include_router(phase3_router)
+
+    def _override_get_session():
+        with SqlSession(engine) as session:
+            yield session
+
+    app.dependency_overrides[get_session] = _override_get_session
+    return app
+
+
+def _create_phase3_session(engine, report_draft: str | None = None):
+    with SqlSession(engine) as session:
+        user = User(name="Test User")
+        session.add(user)
+        session.commit()
+        session.refresh(user)
+        created, _goal_injected = phase3_service.start_phase3_session(session, int(user.id))
+        created.report_draft = report_draft
+        session.add(created)
+        session.commit()
+        return created.id
+
+
+def _stored(engine, session_id) -> SessionModel:
+    with SqlSession(engine) as session:
+        return session.get(SessionModel, session_id)
+
+
+def test_enqueue_coalesces_and_flush_patches_in_place(buffer):
+    engine = _build_engine()
+    session_id = _create_phase3_session(engine)
+    before = _stored(engine, session_id)
+
+    with SqlSession(engine) as session:
+        buffer.enqueue(session, session_id, {"report_final_saved_at": "t1", "turn_count": 1})
+        buffer.enqueue(session, session_id, {"report_final_saved_at": "t2"}, default_keys={"prompt_hash": "other"})
+    assert buffer.pending_count() == 1
+
+    statements: list[str] = []
+    event.listen(engine, "before_cursor_execute", lambda *args: statements.append(args[2]))
+    assert buffer.flush() == 1
+
+    after = _stored(engine, session_id)
+    assert after.meta_data == {**before.meta_data, "report_final_saved_at": "t2", "turn_count": 1}
+    assert after.version == before.version + 1
+    assert buffer.pending_count() == 0
+    assert any("json_set(json_insert(" in statement for statement in statements)
+
+
+def _wait_until(condition, timeout: float = 5.0) -> None:
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline
+        time.sleep(0.01)
+
+
+def _record_flush_threads(monkeypatch, buffer) -> list[threading.Thread]:
+    threads: list[threading.Thread] = []
+    flush = buffer.flush
+
+    def _flush() -> int:
+        threads.append(threading.current_thread())
+        return flush()
+
+    monkeypatch.setattr(buffer, "flush", _flush)
+    return threads
+
+
+def test_max_pending_flushes_off_the_calling_thread(monkeypatch):
+    engine = _build_engine()
+    buffer = meta_write_buffer.MetaWriteBuffer(max_pending=2)
+    threads = _record_flush_threads(monkeypatch, buffer)
+    first, second = _create_phase3_session(engine), _create_phase3_session(engine)
+
+    with SqlSession(engine) as session:
+        buffer.enqueue(session, first, {"report_final_saved_at": "t1"})
+        assert buffer.pending_count() == 1
+        buffer.enqueue(session, second, {"report_final_saved_at": "t2"})
+
+    _wait_until(lambda: _stored(engine, second).meta_data.get("report_final_saved_at") == "t2")
+    assert buffer.pending_count() == 0
+    assert threads and threading.current_thread() not in threads
+
+
+def test_max_pending_wakes_the_background_flusher(monkeypatch):
+    engine = _build_engine()
+    buffer = meta_write_buffer.MetaWriteBuffer(max_pending=2)
+    threads = _record_flush_threads(monkeypatch, buffer)
+    first, second = _create_phase3_session(engine), _create_phase3_session(engine)
+
+    async def _run() -> None:
+        # The interval is far longer than the test: only the backlog wake-up can flush in time.
+        flusher = asyncio.create_task(buffer.run(3600))
+        await asyncio.sleep(0)
+        with SqlSession(engine) as session:
+            buffer.enqueue(session, first, {"report_final_saved_at": "t1"})
+            buffer.enqueue(session, second, {"report_final_saved_at": "t2"})
+        assert threads == []  # enqueue returned without flushing on the event loop
+        for _ in range(500):
+            if buffer.pending_count() == 0 and threads:
+                break
+            await asyncio.sleep(0.01)
+        flusher.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await flusher
+
+    asyncio.run(_run())
+    assert buffer.pending_count() == 0
+    assert len(threads) == 1 and threads[0] is not threading.current_thread()
+    assert _stored(engine, first).meta_data["report_final_saved_at"] == "t1"
+
+
+def test_report_final_defers_meta_data_write(buffer):
+    engine = _build_engine()
+    session_id = _create_phase3_session(engine, report_draft="draft text")
+    client = TestClient(_build_test_app(engine))
+
+    response = client.put(f"/api/v1/phase3/session/{session_id}/report/final", json={"report_final": "final text"})
+
+    assert response.status_code == 200
+    stored = _stored(engine, session_id)
+    assert stored.report_final == "final text"
+    assert "report_final_saved_at" not in stored.meta_data
+    assert buffer.flush() == 1
+    assert "report_final_saved_at" in _stored(engine, session_id).meta_data
+
+
+def test_escalation_writes_safety_keys_with_the_turn(buffer):
+    engine = _build_engine()
+    session_id = _create_phase3_session(engine)
+    client = TestClient(_build_test_app(engine))
+
+    response = client.post(f"/api/v1/phase3/session/{session_id}/turn", json={"message": "死にたい"})
+
+    assert response.json()["emergency"] is True
+    assert buffer.pending_count() == 0
+    stored = _stored(engine, session_id)
+    assert len(stored.log_json) == 3
+    meta_data = stored.meta_data
+    assert meta_data["safety_triggered"] is True
+    assert meta_data["safety_version"] == SAFETY_VERSION
+    assert meta_data["turn_count"] == 1
+
+
+def test_lifespan_flushes_on_shutdown(buffer):
+    engine = _build_engine()
+    session_id = _create_phase3_session(engine)
+
+    with TestClient(FastAPI(lifespan=main.lifespan)):
+        with SqlSession(engine) as session:
+            buffer.enqueue(session, session_id, {"report_final_saved_at": "t"})
+
+    assert _stored(engine, session_id).meta_data["report_final_saved_at"] == "t"
+
+
+def test_missing_sessions_are_skipped(buffer):
+    engine = _build_engine()
+
+    with SqlSession(engine) as session:
+        buffer.enqueue(session, uuid4(), {"turn_count": 1})
+
+    assert buffer.flush() == 0
+
+
+def test_postgres_patch_uses_jsonb_set():
+    expression = session_repository.meta_patch_expression("postgresql", {"turn_count": 2}, {"safety_version": "v"})
+    sql = str(expression.compile(dialect=postgresql.dialect()))
+
+    assert "jsonb_set(" in sql
+    assert "|| coalesce(CAST(sessions.meta_data AS JSONB)" in sql
+    with pytest.raises(ValueError):
+        session_repository.meta_patch_expression("sqlite", {"bad.key": 1})
@@ -0,0 +1,278 @@
+from __future__ import annotations
+
+import json
+import os
+import sys
+import uuid
+from datetime import date, datetime, timezone
+from pathlib import Path
+
+import pytest
+from sqlalchemy import event, text
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.orm.exc import StaleDataError
+from sqlalchemy.pool import StaticPool
+from sqlmodel import SQLModel, Session as SqlSession, create_engine
+
+BASE_DIR = Path(__file__).resolve().parents[1]
+if str(BASE_DIR) not in sys.path:
+    sys.path.insert(0, str(BASE_DIR))
+
+from app.core import config as app_config
+from app.models.session import Session as SessionModel
+from app.models.types import ENVELOPE_KEY
+from app.models.user import User
+from app.repositories import session_repository
+
+BASE_LOG = [{"role": "system", "content": "x" * 4000}, {"role": "user", "content": "こんにちは"}]
+
+
+@pytest.fixture(autouse=True)
+def _plain_storage(monkeypatch):
+    monkeypatch.setattr(app_config, "DB_COMPRESSION", "none")
+
+
+def _build_engine():
+    engine = create_engine(
+        "sqlite://",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    )
+    SQLModel.metadata.create_all(engine)
+    return engine
+
+
+def _insert_session(engine, log_json=None, meta_data=None):
+    with SqlSession(engine) as session:
+        user = User(name="Test User")
+        session.add(user)
+        session.commit()
+        session.refresh(user)
+        row = SessionModel(
+            user_id=int(user.id),
+            phase=3,
+            session_date=date(2026, 1, 1),
+            log_json=list(BASE_LOG if log_json is None else log_json),
+            meta_data=dict(meta_data or {"turn_count": 1, "safety": {"flagged": False}}),
+            created_at=datetime.now(timezone.utc),
+        )
+        session.add(row)
+        session.commit()
+        return row.id
+
+
+def _capture_updates(engine):
+    statements: list[tuple[str, object]] = []
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _record(_conn, _cursor, statement, parameters, _context, _executemany):
+        if statement.lstrip().upper().startswith("UPDATE"):
+            statements.append((statement, parameters))
+
+    return statements
+
+
+def _raw(engine, session_id):
+    with engine.connect() as connection:
+        return connection.execute(
+            text("SELECT log_json, meta_data, version FROM sessions WHERE id = :id"),
+            {"id": session_id.hex},
+        ).one()
+
+
+def test_log_append_uses_json_insert_without_resending_the_log():
+    engine = _build_engine()
+    session_id = _insert_session(engine)
+    statements = _capture_updates(engine)
+    new_entries = [{"role": "user", "content": "次の質問"}, {"role": "assistant", "content": "回答"}]
+
+    with SqlSession(engine) as session:
+        updated = session_repository.update_session_log(session, session_id, BASE_LOG + new_entries)
+        session.commit()
+        assert updated.version == 2
+        assert updated.log_json == BASE_LOG + new_entries
+
+    assert len(statements) == 1
+    statement, parameters = statements[0]
+    assert "json_insert" in statement
+    assert "version=(sessions.version + ?)" in statement
+    assert all("x" * 4000 not in str(value) for value in parameters)
+
+    raw_log, _raw_meta, version = _raw(engine, session_id)
+    assert json.loads(raw_log) == BASE_LOG + new_entries
+    assert version == 2
+
+
+def test_meta_changes_only_write_changed_keys():
+    engine = _build_engine()
+    session_id = _insert_session(engine, meta_data={"turn_count": 1, "prompt_hash": "h" * 64, "tags": ["a"]})
+    statements = _capture_updates(engine)
+
+    with SqlSession(engine) as session:
+        session_repository.update_session(
+            session,
+            session_id,
+            meta_data={"turn_count": 2, "prompt_hash": "h" * 64, "tags": ["a", "b"], "last_turn_at": "t"},
+            report_draft="draft",
+        )
+        session.commit()
+
+    statement, parameters = statements[0]
+    assert "json_set" in statement
+    assert all("h" * 64 not in str(value) for value in parameters)
+    _raw_log, raw_meta, version = _raw(engine, session_id)
+    assert json.loads(raw_meta) == {"turn_count": 2, "prompt_hash": "h" * 64, "tags": ["a", "b"], "last_turn_at": "t"}
+    assert version == 2
+    with SqlSession(engine) as session:
+        assert session.get(SessionModel, session_id).report_draft == "draft"
+
+
+def test_removed_keys_and_rewritten_logs_fall_back_to_full_writes():
+    engine = _build_engine()
+    session_id = _insert_session(engine)
+    statements = _capture_updates(engine)
+
+    with SqlSession(engine) as session:
+        session_repository.update_session(
+            session, session_id, log_json=[{"role": "system", "content": "reset"}], meta_data={"turn_count": 0}
+        )
+        session.commit()
+
+    assert "json_insert" not in statements[0][0] and "json_set" not in statements[0][0]
+    raw_log, raw_meta, version = _raw(engine, session_id)
+    assert json.loads(raw_log) == [{"role": "system", "content": "reset"}]
+    assert json.loads(raw_meta) == {"turn_count": 0}
+    assert version == 2
+
+
+def test_compressed_logs_are_rewritten_whole(monkeypatch):
+    monkeypatch.setattr(app_config, "DB_COMPRESSION", "zlib")
+    engine = _build_engine()
+    session_id = _insert_session(engine)
+    assert ENVELOPE_KEY in json.loads(_raw(engine, session_id)[0])
+    appended = BASE_LOG + [{"role": "user", "content": "more"}]
+
+    # Compression switched off later: the stored envelope is not an array, so the append falls back.
+    monkeypatch.setattr(app_config, "DB_COMPRESSION", "none")
+    with SqlSession(engine) as session:
+        updated = session_repository.update_session_log(session, session_id, appended)
+        session.commit()
+        assert updated.version == 2
+
+    raw_log, _raw_meta, version = _raw(engine, session_id)
+    assert json.loads(raw_log) == appended
+    assert version == 2
+
+
+def test_concurrent_partial_write_is_detected(tmp_path):
+    # A file database so the two sessions use separate connections.
+    engine = create_engine(f"sqlite:///{tmp_path / 'partial.db'}", connect_args={"check_same_thread": False})
+    SQLModel.metadata.create_all(engine)
+    session_id = _insert_session(engine)
+
+    with SqlSession(engine) as stale, SqlSession(engine) as other:
+        loaded = stale.get(SessionModel, session_id)
+        session_repository.update_session_log(other, session_id, BASE_LOG + [{"role": "user", "content": "first"}])
+        other.commit()
+        with pytest.raises(StaleDataError):
+            session_repository.update_session_log(stale, session_id, BASE_LOG + [{"role": "user", "content": "late"}])
+        assert loaded.version == 1
+
+    with SqlSession(engine) as session:
+        updated = session_repository.update_session_with_retry(
+            session,
+            session_id,
+            lambda current: {"log_json": current.log_json + [{"role": "user", "content": "late"}]},
+        )
+        session.commit()
+        assert [entry["content"] for entry in updated.log_json[-2:]] == ["first", "late"]
+        assert updated.version == 3
+
+
+def test_postgres_append_compiles_to_jsonb_concatenation():
+    expression = session_repository.log_append_expression("postgresql", [{"role": "user", "content": "hi"}])
+    compiled = str(expression.compile(dialect=postgresql.dialect()))
+    assert "CAST(sessions.log_json AS JSONB) || CAST(" in compiled
+    assert "AS JSONB) AS JSON)" in compiled
+    assert session_repository.log_append_expression("mysql", []) is None
+
+
+@pytest.fixture()
+def postgres_engine():
+    """Engine on ``TEST_POSTGRES_URL`` with the tables in a throwaway schema; skipped when unset."""
+
+    url = os.getenv("TEST_POSTGRES_URL")
+    if not url:
+        pytest.skip("TEST_POSTGRES_URL is not set")
+    schema = f"partial_json_{uuid.uuid4().hex[:12]}"
+    base = create_engine(url)
+    with base.begin() as connection:
+        connection.execute(text(f'CREATE SCHEMA "{schema}"'))
+    engine = base.execution_options(schema_translate_map={None: schema})
+    SQLModel.metadata.create_all(engine)
+    try:
+        yield engine
+    finally:
+        with base.begin() as connection:
+            connection.execute(text(f'DROP SCHEMA "{schema}" CASCADE'))
+        base.dispose()
+
+
+def _stored(engine, session_id) -> SessionModel:
+    with SqlSession(engine) as session:
+        return session.get(SessionModel, session_id)
+
+
+def test_postgres_partial_updates_execute(postgres_engine):
+    session_id = _insert_session(postgres_engine, meta_data={"turn_count": 1, "safety_version": "v1"})
+    statements = _capture_updates(postgres_engine)
+    appended = BASE_LOG + [{"role": "user", "content": "次の質問"}, {"role": "assistant", "content": "回答"}]
+
+    with SqlSession(postgres_engine) as session:
+        session_repository.update_session(
+            session,
+            session_id,
+            log_json=appended,
+            meta_data={"turn_count": 2, "safety_version": "v1", "tags": ["a"]},
+        )
+        session.commit()
+
+    assert "||" in statements[0][0] and "jsonb_set" in statements[0][0] and "json_typeof" in statements[0][0]
+    stored = _stored(postgres_engine, session_id)
+    assert stored.log_json == appended
+    assert stored.meta_data == {"turn_count": 2, "safety_version": "v1", "tags": ["a"]}
+    assert stored.version == 2
+
+    with SqlSession(postgres_engine) as session:
+        assert session_repository.patch_meta_data(
+            session,
+            session_id,
+            {"report_final_saved_at": "t"},
+            default_keys={"safety_version": "v2", "prompt_hash": "h"},
+        )
+        session.commit()
+
+    stored = _stored(postgres_engine, session_id)
+    assert stored.meta_data == {
+        "turn_count": 2,
+        "safety_version": "v1",
+        "tags": ["a"],
+        "report_final_saved_at": "t",
+        "prompt_hash": "h",
+    }
+    assert stored.version == 3
+
+
+def test_postgres_compressed_log_falls_back(postgres_engine, monkeypatch):
+    monkeypatch.setattr(app_config, "DB_COMPRESSION", "zlib")
+    session_id = _insert_session(postgres_engine)
+    monkeypatch.setattr(app_config, "DB_COMPRESSION", "none")
+    appended = BASE_LOG + [{"role": "user", "content": "more"}]
+
+    with SqlSession(postgres_engine) as session:
+        session_repository.update_session_log(session, session_id, appended)
+        session.commit()
+
+    stored = _stored(postgres_engine, session_id)
+    assert stored.log_json == appended
+    assert stored.version == 2
@@ -8,6 +8,7 @@ from uuid import UUID, uuid4
 import pytest
 from fastapi import FastAPI
 from fastapi.testclient import TestClient
+from sqlalchemy import event
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.pool import StaticPool
 from sqlmodel import SQLModel, Session as SqlSession, create_engine, select
@@ -169,3 +170,37 @@ def test_confirm_goal_unique_violation_returns_409(monkeypatch):
         json={"goal_text": "conflict"},
     )
     assert response.status_code == 409
+
+
+def test_confirm_goal_uses_single_insert_select_round_trip():
+    app, engine = _build_test_app()
+    user_id = _create_user(engine)
+    session_id = _create_phase1_session(engine, user_id)
+    client = TestClient(app)
+    first = client.post(f"/api/v1/phase1/session/{session_id}/confirm", json={"goal_text": "first"})
+    assert first.json()["version"] == 1
+
+    statements: list[str] = []
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _record(_conn, _cursor, statement, *_args):
+        statements.append(" ".join(statement.split()[:3]).upper())
+
+    second = client.post(f"/api/v1/phase1/session/{session_id}/confirm", json={"goal_text": "second"})
+    assert second.status_code == 200
+    assert second.json()["version"] == 2
+    assert second.json()["is_active"] is True
+
+    assert statements == [
+        "SELECT SESSIONS.ID AS",
+        "UPDATE GOALS SET",
+        "INSERT INTO GOALS",
+        "UPDATE SESSIONS SET",
+    ]
+    with SqlSession(engine) as session:
+        goals = session.exec(select(Goal).where(Goal.user_id == user_id).order_by(Goal.version)).all()
+        assert [(goal.content, goal.version, goal.is_active) for goal in goals] == [
+            ("first", 1, False),
+            ("second", 2, True),
+        ]
+        assert session.get(SessionModel, session_id).report_final == "second"
@@ -18,6 +18,7 @@ from app.core.db import get_session
 from app.models.session import Session as SessionModel
 from app.models.user import User
 from app.prompts.prompt_loader import load_prompt
+from app.services import system_prompt_store
 from app.utils.prompt_hash import generate_prompt_hash
 
 
@@ -70,7 +71,7 @@ def test_create_phase1_session_success():
         assert created is not None
         assert isinstance(created.log_json, list)
         assert created.log_json[0]["role"] == "system"
-        assert created.log_json[0]["content"] == prompt_text
+        assert system_prompt_store.extract_system_prompt(session, created.log_json) == prompt_text
 
 
 def test_invalid_user_id_returns_400():
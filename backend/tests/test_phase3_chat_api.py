@@ -84,7 +84,17 @@ def test_append_phase3_turn_success():
         assert updated.log_json[0]["role"] == "system"
         assert updated.log_json[-2]["role"] == "user"
         assert updated.log_json[-1]["role"] == "assistant"
-        assert updated.meta_data == before_meta
+        meta_data = dict(updated.meta_data)
+        usage = meta_data.pop("llm_usage")
+        totals = meta_data.pop("llm_usage_totals")
+        assert meta_data.pop("turn_count") == 1
+        assert meta_data == before_meta
+        assert usage[-1]["pipeline"] == "phase3_turn"
+        assert usage[-1]["turn_index"] == data["turn_index"]
+        assert usage[-1]["usage_source"] == "estimate"
+        assert usage[-1]["prompt_tokens"] > 0
+        assert usage[-1]["completion_tokens"] > 0
+        assert totals[usage[-1]["model_name"]]["calls"] == 1
 
 
 def test_append_phase3_turn_session_not_found():
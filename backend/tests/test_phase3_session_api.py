@@ -18,6 +18,7 @@ from app.core.db import get_session
 from app.models.session import Session as SessionModel
 from app.models.user import User
 from app.repositories import goals_repository
+from app.services import system_prompt_store
 from app.services.phase3_service import DEFAULT_GOAL_TEXT
 
 
@@ -81,7 +82,8 @@ def test_create_phase3_session_with_goal_injected():
         created = session.get(SessionModel, session_id)
         assert created is not None
         assert created.log_json[0]["role"] == "system"
-        assert goal_text in created.log_json[0]["content"]
+        assert "content" not in created.log_json[0]
+        assert goal_text in system_prompt_store.extract_system_prompt(session, created.log_json)
 
 
 def test_create_phase3_session_without_goal():
@@ -99,7 +101,7 @@ def test_create_phase3_session_without_goal():
     with SqlSession(engine) as session:
         created = session.get(SessionModel, session_id)
         assert created is not None
-        assert DEFAULT_GOAL_TEXT in created.log_json[0]["content"]
+        assert DEFAULT_GOAL_TEXT in system_prompt_store.extract_system_prompt(session, created.log_json)
 
 
 def test_meta_data_contains_system_prompt_hash():
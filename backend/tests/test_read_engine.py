@@ -0,0 +1,108 @@
+from __future__ import annotations
+
+import sys
+from datetime import date, datetime, timezone
+from pathlib import Path
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import text
+from sqlalchemy.exc import OperationalError
+from sqlmodel import SQLModel, Session as SqlSession, create_engine
+
+BASE_DIR = Path(__file__).resolve().parents[1]
+if str(BASE_DIR) not in sys.path:
+    sys.path.insert(0, str(BASE_DIR))
+
+from app.api.kpi_router import router as kpi_router
+from app.api.sessions_router import router as sessions_router
+from app.core import db
+from app.core.db import get_session
+from app.models.session import Session as SessionModel
+from app.models.user import User
+
+
+def _build_engines(tmp_path: Path):
+    database_url = f"sqlite:///{tmp_path / 'app.db'}"
+    write_engine = create_engine(database_url, connect_args={"check_same_thread": False})
+    db.enable_sqlite_wal(write_engine)
+    SQLModel.metadata.create_all(write_engine)
+    read_engine = db.build_read_engine(db.read_engine_url(database_url, sqlite_read_pool=True))
+    return write_engine, read_engine
+
+
+def _seed(engine) -> int:
+    with SqlSession(engine) as session:
+        user = User(name="Test User")
+        session.add(user)
+        session.commit()
+        session.refresh(user)
+        session.add(
+            SessionModel(
+                user_id=int(user.id),
+                phase=3,
+                session_date=date(2026, 3, 1),
+                log_json=[{"role": "system", "content": "phase3"}],
+                meta_data={"turn_count": 0},
+                edit_metrics={"ratio": 0.25, "chars_added": 3, "chars_removed": 1},
+                created_at=datetime(2026, 3, 1, 9, 0, tzinfo=timezone.utc),
+            )
+        )
+        session.commit()
+        return int(user.id)
+
+
+def test_read_engine_url_selection(tmp_path):
+    sqlite_url = f"sqlite:///{tmp_path / 'app.db'}"
+    assert db.read_engine_url(sqlite_url) is None
+    assert db.read_engine_url(sqlite_url, "postgresql://replica/app", True) == "postgresql://replica/app"
+    assert db.read_engine_url(sqlite_url, sqlite_read_pool=True) == (
+        f"sqlite:///file:{tmp_path / 'app.db'}?mode=ro&uri=true"
+    )
+    assert db.read_engine_url("sqlite://", sqlite_read_pool=True) is None
+    assert db.read_engine_url("postgresql://primary/app", sqlite_read_pool=True) is None
+
+
+def test_reads_share_get_session_without_a_read_engine():
+    assert db.read_engine is None
+    assert db.get_read_session is get_session
+
+
+def test_read_only_pool_reads_alongside_an_open_write_transaction(tmp_path):
+    write_engine, read_engine = _build_engines(tmp_path)
+    _seed(write_engine)
+
+    with write_engine.connect() as writer, read_engine.connect() as reader:
+        assert writer.execute(text("PRAGMA journal_mode")).scalar() == "wal"
+        writer.execute(text("UPDATE sessions SET phase = 1"))
+        # WAL: the reader sees the last committed state instead of waiting on the writer's lock.
+        assert reader.execute(text("SELECT phase FROM sessions")).scalar() == 3
+        writer.commit()
+        reader.rollback()
+        assert reader.execute(text("SELECT phase FROM sessions")).scalar() == 1
+
+        with pytest.raises(OperationalError, match="readonly"):
+            reader.execute(text("UPDATE sessions SET phase = 3"))
+
+
+def test_kpi_and_listing_routes_run_on_the_read_only_pool(tmp_path, monkeypatch):
+    write_engine, read_engine = _build_engines(tmp_path)
+    user_id = _seed(write_engine)
+    monkeypatch.setattr(db, "read_engine", read_engine)
+
+    app = FastAPI()
+    app.include_router(kpi_router)
+    app.include_router(sessions_router)
+    # get_read_session is get_session in tests; route it through the configured read pool.
+    app.dependency_overrides[get_session] = db._get_read_only_session
+    client = TestClient(app)
+
+    edit_ratio = client.get("/api/v1/kpi/edit-ratio", params={"user_id": user_id})
+    assert edit_ratio.status_code == 200
+    assert edit_ratio.json()["summary"]["avg"] == 0.25
+    assert client.get("/api/v1/kpi/llm-usage", params={"user_id": user_id}).status_code == 200
+    listing = client.get("/api/v1/sessions", params={"user_id": user_id})
+    assert listing.status_code == 200
+    assert len(listing.json()["items"]) == 1
+    assert read_engine.pool.checkedin() >= 1
@@ -0,0 +1,178 @@
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import sys
+from datetime import date
+from pathlib import Path
+from typing import Sequence
+
+import pytest
+from sqlmodel import SQLModel, Session as SqlSession, create_engine, select
+
+BASE_DIR = Path(__file__).resolve().parents[1]
+if str(BASE_DIR) not in sys.path:
+    sys.path.insert(0, str(BASE_DIR))
+
+from app.config.llm_config import LLMResilienceConfig
+from app.llm.base import BaseLLMClient, LLMClientError, LLMRequest, LLMRetryableError
+from app.llm.resilient_client import ResilientLLMClient, ResilienceState, reset_resilience_states
+from app.models.session import Session as SessionModel
+from app.models.user import User
+from app.services import system_prompt_store
+from scripts import redraft_reports
+
+START, END = date(2026, 2, 1), date(2026, 2, 28)
+
+
+class _BatchClient(BaseLLMClient):
+    """Fails prompts containing ``FAIL`` permanently and ``FLAKY`` on their first attempt."""
+
+    def __init__(self, crash_on_batch: int | None = None) -> None:
+        self.batches: list[list[str]] = []
+        self.crash_on_batch = crash_on_batch
+        self._flaked: set[str] = set()
+
+    async def generate(self, system_prompt: str, user_prompt: str, **kwargs) -> str:
+        if "FAIL" in system_prompt:
+            raise LLMClientError("rejected")
+        if "FLAKY" in system_prompt and system_prompt not in self._flaked:
+            self._flaked.add(system_prompt)
+            raise LLMRetryableError("try again")
+        return "redrafted"
+
+    async def generate_many(
+        self,
+        requests: Sequence[LLMRequest],
+        concurrency: int = 4,
+        return_exceptions: bool = False,
+    ) -> list[str | BaseException]:
+        self.batches.append([request.system_prompt for request in requests])
+        if self.crash_on_batch is not None and len(self.batches) == self.crash_on_batch:
+            raise RuntimeError("worker killed")
+        return await super().generate_many(requests, concurrency, return_exceptions)
+
+
+@pytest.fixture(autouse=True)
+def _fast_retries(monkeypatch):
+    monkeypatch.setenv("LLM_BACKOFF_BASE_SECONDS", "0")
+    reset_resilience_states()
+    yield
+    reset_resilience_states()
+
+
+def _seed_db(path: Path, messages: list[str]) -> list[str]:
+    engine = create_engine(f"sqlite:///{path}")
+    SQLModel.metadata.create_all(engine)
+    with SqlSession(engine) as session:
+        user = User(name="redraft")
+        session.add(user)
+        session.flush()
+        prompt_hash = system_prompt_store.store_system_prompt(session, "フェーズ3 プロンプト")
+        rows = [
+            SessionModel(
+                user_id=user.id,
+                session_date=date(2026, 2, day + 1),
+                phase=3,
+                log_json=[
+                    system_prompt_store.system_prompt_entry(prompt_hash),
+                    {"role": "user", "content": message},
+                    {"role": "assistant", "content": "ok"},
+                ],
+                meta_data={},
+            )
+            for day, message in enumerate(messages)
+        ]
+        session.add_all(rows)
+        session.commit()
+        ids = [str(row.id) for row in rows]
+    engine.dispose()
+    return ids
+
+
+def _drafts(path: Path) -> dict[str, str | None]:
+    engine = create_engine(f"sqlite:///{path}")
+    with SqlSession(engine) as session:
+        drafts = {str(row.id): row.report_draft for row in session.exec(select(SessionModel))}
+    engine.dispose()
+    return drafts
+
+
+def _args(tmp_path: Path, start: date = START, end: date = END) -> argparse.Namespace:
+    return argparse.Namespace(
+        db=str(tmp_path / "app.db"),
+        start=start,
+        end=end,
+        checkpoint=str(tmp_path / "checkpoint.json"),
+        batch_size=2,
+        concurrency=2,
+        dry_run=False,
+    )
+
+
+def _use_client(monkeypatch, client: _BatchClient) -> None:
+    monkeypatch.setattr(redraft_reports, "get_llm_client", lambda _config: client)
+
+
+def test_interrupted_run_resumes_from_checkpoint(tmp_path, monkeypatch):
+    ids = _seed_db(tmp_path / "app.db", [f"message {index}" for index in range(5)])
+
+    _use_client(monkeypatch, _BatchClient(crash_on_batch=2))
+    with pytest.raises(RuntimeError):
+        asyncio.run(redraft_reports._run(_args(tmp_path)))
+    checkpoint = json.loads((tmp_path / "checkpoint.json").read_text(encoding="utf-8"))
+    assert checkpoint["processed"] == 2
+    assert (checkpoint["start"], checkpoint["end"]) == (START.isoformat(), END.isoformat())
+
+    resumed = _BatchClient()
+    _use_client(monkeypatch, resumed)
+    summary = asyncio.run(redraft_reports._run(_args(tmp_path)))
+
+    assert sum(len(batch) for batch in resumed.batches) == 3
+    assert summary["sessions_scanned"] == 3
+    assert summary["redrafted_total"] == 5
+    assert summary["failed_total"] == 0
+    assert all(_drafts(tmp_path / "app.db")[session_id] == "redrafted" for session_id in ids)
+
+
+def test_failures_are_recorded_and_transient_errors_retried(tmp_path, monkeypatch):
+    ids = _seed_db(tmp_path / "app.db", ["fine", "FAIL please", "FLAKY once", "fine again"])
+    client = _BatchClient()
+    _use_client(monkeypatch, client)
+
+    summary = asyncio.run(redraft_reports._run(_args(tmp_path)))
+
+    assert summary["redrafted_total"] == 3
+    assert summary["failed_total"] == 1
+    checkpoint = json.loads((tmp_path / "checkpoint.json").read_text(encoding="utf-8"))
+    assert checkpoint["failed"] == [ids[1]]
+    drafts = _drafts(tmp_path / "app.db")
+    assert drafts[ids[1]] is None
+    assert drafts[ids[2]] == "redrafted"
+    # The flaky session is retried alone, through the inner batch call.
+    assert [len(batch) for batch in client.batches] == [2, 2, 1]
+
+
+def test_checkpoint_for_another_range_is_refused(tmp_path, monkeypatch):
+    _seed_db(tmp_path / "app.db", ["message"])
+    _use_client(monkeypatch, _BatchClient())
+    asyncio.run(redraft_reports._run(_args(tmp_path)))
+
+    with pytest.raises(redraft_reports.CheckpointMismatchError):
+        asyncio.run(redraft_reports._run(_args(tmp_path, end=date(2026, 3, 31))))
+
+
+def test_resilient_generate_many_delegates_to_inner_batch():
+    inner = _BatchClient()
+    config = LLMResilienceConfig(backoff_base=0.0, max_attempts=2, breaker_failure_threshold=10)
+    client = ResilientLLMClient(inner, config, state=ResilienceState(config))
+    requests = [LLMRequest(system_prompt=prompt, user_prompt="") for prompt in ("a", "FLAKY b", "FAIL c")]
+
+    results = asyncio.run(client.generate_many(requests, concurrency=3, return_exceptions=True))
+
+    assert results[:2] == ["redrafted", "redrafted"]
+    assert isinstance(results[2], LLMClientError)
+    assert inner.batches == [["a", "FLAKY b", "FAIL c"], ["FLAKY b"]]
+    with pytest.raises(LLMClientError):
+        asyncio.run(client.generate_many(requests[2:]))
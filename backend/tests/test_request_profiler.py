@@ -0,0 +1,148 @@
+from __future__ import annotations
+
+import pstats
+import sys
+import time
+from pathlib import Path
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy.pool import StaticPool
+from sqlmodel import SQLModel, Session as SqlSession, create_engine
+
+BASE_DIR = Path(__file__).resolve().parents[1]
+if str(BASE_DIR) not in sys.path:
+    sys.path.insert(0, str(BASE_DIR))
+
+from app.api.kpi_router import router as kpi_router
+from app.api.profiling_router import get_profiling_config, router as profiling_router
+from app.core.db import get_session
+from app.config.profiling_config import ProfilingConfig
+from app.utils.request_profiler import ProfilingMiddleware
+
+
+def _build_test_app(config: ProfilingConfig, rng=lambda: 1.0):
+    app = FastAPI()
+
+    @app.get("/api/v1/kpi/fast")
+    def fast() -> dict[str, str]:
+        return {"status": "ok"}
+
+    @app.get("/api/v1/kpi/slow")
+    def slow_kpi_endpoint() -> dict[str, str]:
+        time.sleep(0.2)
+        return {"status": "ok"}
+
+    @app.get("/other")
+    def other() -> dict[str, str]:
+        return {"status": "ok"}
+
+    app.add_middleware(ProfilingMiddleware, config=config, rng=rng)
+    app.include_router(profiling_router)
+    app.dependency_overrides[get_profiling_config] = lambda: config
+    return app
+
+
+ADMIN_HEADERS = {"X-Admin-Token": "secret"}
+
+
+def _config(tmp_path, **overrides) -> ProfilingConfig:
+    values = {"enabled": True, "directory": tmp_path, "slow_threshold_ms": 0.0, "admin_token": "secret"}
+    values.update(overrides)
+    return ProfilingConfig(**values)
+
+
+def test_sampled_request_writes_cprofile_and_admin_lists_it(tmp_path):
+    client = TestClient(_build_test_app(_config(tmp_path, sample_rate=1.0), rng=lambda: 0.0))
+
+    assert client.get("/api/v1/kpi/fast").status_code == 200
+
+    listing = client.get("/api/v1/admin/profiles", headers=ADMIN_HEADERS).json()["items"]
+    assert len(listing) == 1
+    assert listing[0]["kind"] == "cprofile"
+    assert "_GET_api_v1_kpi_fast_" in listing[0]["name"]
+
+    download = client.get(f"/api/v1/admin/profiles/{listing[0]['name']}", headers=ADMIN_HEADERS)
+    assert download.status_code == 200
+    downloaded = tmp_path / "downloaded.prof"
+    downloaded.write_bytes(download.content)
+    assert pstats.Stats(str(downloaded)).total_calls > 0
+
+
+def test_unsampled_fast_and_unmatched_requests_are_not_profiled(tmp_path):
+    client = TestClient(_build_test_app(_config(tmp_path, sample_rate=0.5, slow_threshold_ms=500)))
+
+    assert client.get("/api/v1/kpi/fast").status_code == 200
+    assert client.get("/other").status_code == 200
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_slow_request_writes_stack_samples(tmp_path):
+    config = _config(tmp_path, slow_threshold_ms=50, sampler_interval_ms=5)
+    client = TestClient(_build_test_app(config))
+
+    assert client.get("/api/v1/kpi/slow").status_code == 200
+
+    files = list(tmp_path.glob("*.folded"))
+    assert len(files) == 1
+    assert "slow_kpi_endpoint" in files[0].read_text(encoding="utf-8")
+
+
+def test_profile_directory_is_rotated(tmp_path):
+    client = TestClient(_build_test_app(_config(tmp_path, sample_rate=1.0, max_files=2), rng=lambda: 0.0))
+
+    for _ in range(4):
+        assert client.get("/api/v1/kpi/fast").status_code == 200
+
+    assert len(list(tmp_path.glob("*.prof"))) == 2
+
+
+def test_admin_endpoints_require_token_and_reject_bad_names(tmp_path):
+    client = TestClient(_build_test_app(_config(tmp_path)))
+
+    assert client.get("/api/v1/admin/profiles").status_code == 403
+    assert client.get("/api/v1/admin/profiles", headers={"X-Admin-Token": "wrong"}).status_code == 403
+    assert client.get("/api/v1/admin/profiles", headers=ADMIN_HEADERS).status_code == 200
+    missing = client.get("/api/v1/admin/profiles/..%2Fapp.db", headers=ADMIN_HEADERS)
+    assert missing.status_code == 404
+
+
+def test_admin_endpoints_are_closed_without_a_configured_token(tmp_path):
+    name = "20260101T000000000000-0000_GET_api_v1_kpi_fast_1ms.prof"
+    (tmp_path / name).write_bytes(b"")
+    client = TestClient(_build_test_app(_config(tmp_path, admin_token=None)))
+
+    assert client.get("/api/v1/admin/profiles").status_code == 403
+    assert client.get("/api/v1/admin/profiles", headers={"X-Admin-Token": ""}).status_code == 403
+    assert client.get(f"/api/v1/admin/profiles/{name}").status_code == 403
+
+
+def test_admin_router_is_only_mounted_when_profiling_is_enabled():
+    from app import main
+
+    paths = {getattr(route, "path", "") for route in main.app.routes}
+    assert ("/api/v1/admin/profiles" in paths) is main.profiling_config.enabled
+
+
+def test_sampled_sync_route_profile_includes_worker_thread_frames(tmp_path):
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    SQLModel.metadata.create_all(engine)
+    config = _config(tmp_path, sample_rate=1.0)
+    app = FastAPI()
+    app.add_middleware(ProfilingMiddleware, config=config, rng=lambda: 0.0)
+    app.include_router(kpi_router)
+
+    def _override_get_session():
+        with SqlSession(engine) as session:
+            yield session
+
+    app.dependency_overrides[get_session] = _override_get_session
+    client = TestClient(app)
+
+    assert client.get("/api/v1/kpi/edit-ratio", params={"user_id": 1}).status_code == 200
+
+    files = list(tmp_path.glob("*.prof"))
+    assert len(files) == 1
+    profiled_files = {Path(filename).name for filename, _line, _name in pstats.Stats(str(files[0])).stats}
+    assert "kpi_router.py" in profiled_files
+    assert "session_repository.py" in profiled_files
@@ -0,0 +1,134 @@
+from __future__ import annotations
+
+import json
+import sys
+from datetime import datetime, timezone
+from pathlib import Path
+
+import orjson
+from fastapi import FastAPI, Header, Response
+from fastapi.responses import JSONResponse
+from fastapi.testclient import TestClient
+
+BASE_DIR = Path(__file__).resolve().parents[1]
+if str(BASE_DIR) not in sys.path:
+    sys.path.insert(0, str(BASE_DIR))
+
+from app.services.session_log_service import etag_matches
+from app.utils.compression import CompressionMiddleware, accepted_encodings, encoded_etag, identity_etags
+from app.utils.json_response import FastJSONResponse
+from bench.payload_bench import edit_ratio_payload, measure_payload
+
+
+def _build_test_app(minimum_size: int = 500) -> FastAPI:
+    app = FastAPI(default_response_class=FastJSONResponse)
+    app.add_middleware(CompressionMiddleware, minimum_size=minimum_size)
+
+    @app.get("/large")
+    def _large() -> dict:
+        return {"items": [{"index": index, "text": "振り返り"} for index in range(200)]}
+
+    @app.get("/tagged")
+    def _tagged(if_none_match: str | None = Header(default=None)) -> Response:
+        etag = '"v1"'
+        if etag_matches(if_none_match, etag):
+            return Response(status_code=304, headers={"ETag": etag})
+        body = json.dumps({"items": ["振り返り"] * 200}, ensure_ascii=False)
+        return Response(body, media_type="application/json", headers={"ETag": etag})
+
+    @app.get("/small")
+    def _small() -> dict:
+        return {"status": "ok"}
+
+    return app
+
+
+def test_large_responses_are_gzipped_when_accepted():
+    client = TestClient(_build_test_app())
+
+    response = client.get("/large", headers={"Accept-Encoding": "gzip"})
+
+    assert response.status_code == 200
+    assert response.headers["content-encoding"] == "gzip"
+    assert "Accept-Encoding" in response.headers["vary"]
+    assert int(response.headers["content-length"]) < len(response.content)
+    assert response.json()["items"][199] == {"index": 199, "text": "振り返り"}
+
+
+def test_small_or_unaccepted_responses_are_sent_as_is():
+    client = TestClient(_build_test_app())
+
+    small = client.get("/small", headers={"Accept-Encoding": "gzip"})
+    identity = client.get("/large", headers={"Accept-Encoding": "identity"})
+
+    assert "content-encoding" not in small.headers
+    assert "content-encoding" not in identity.headers
+    assert identity.json()["items"][0] == {"index": 0, "text": "振り返り"}
+
+
+def test_brotli_is_preferred_over_gzip():
+    client = TestClient(_build_test_app())
+
+    response = client.get("/large", headers={"Accept-Encoding": "br, gzip"})
+
+    assert response.headers["content-encoding"] == "br"
+    assert response.json()["items"][0] == {"index": 0, "text": "振り返り"}
+
+
+def test_accepted_encodings_ignores_refused_codings():
+    assert accepted_encodings("gzip;q=0, br;q=0.8, deflate") == {"br", "deflate"}
+    assert accepted_encodings("") == set()
+
+
+def test_fast_json_response_renders_with_orjson():
+    # The stdlib encoder rejects datetimes; orjson serialises them natively.
+    content = {"at": datetime(2026, 3, 1, 9, 0, tzinfo=timezone.utc), 1: "int key"}
+
+    assert FastJSONResponse(None).render(content) == orjson.dumps(content, option=orjson.OPT_NON_STR_KEYS)
+    assert json.loads(FastJSONResponse(None).render(content)) == {"at": "2026-03-01T09:00:00+00:00", "1": "int key"}
+
+
+def test_fast_json_response_matches_stdlib_output():
+    content = {"message": "部下の反応", "ratio": 0.25, "items": [1, None, True], "nested": {"a": "b"}}
+
+    assert FastJSONResponse(None).render(content) == JSONResponse(None).render(content)
+    payload = edit_ratio_payload(10)
+    assert json.loads(FastJSONResponse(None).render(payload)) == payload
+
+
+def test_payload_bench_reports_smaller_compressed_bodies():
+    result = measure_payload("kpi.edit_ratio", edit_ratio_payload(50), runs=2)
+
+    assert 0 < result.gzip_bytes < result.raw_bytes
+    assert result.stdlib_us > 0 and result.orjson_us > 0
+
+
+def test_encoded_responses_get_their_own_strong_etag():
+    client = TestClient(_build_test_app())
+
+    identity = client.get("/tagged", headers={"Accept-Encoding": "identity"})
+    gzipped = client.get("/tagged", headers={"Accept-Encoding": "gzip"})
+
+    assert identity.headers["etag"] == '"v1"'
+    assert gzipped.headers["content-encoding"] == "gzip"
+    assert gzipped.headers["etag"] == '"v1-gzip"'
+
+
+def test_encoded_etags_still_revalidate():
+    client = TestClient(_build_test_app())
+
+    gzipped = client.get("/tagged", headers={"Accept-Encoding": "gzip", "If-None-Match": '"v1-gzip"'})
+    identity = client.get("/tagged", headers={"Accept-Encoding": "identity", "If-None-Match": '"v1"'})
+    stale = client.get("/tagged", headers={"Accept-Encoding": "gzip", "If-None-Match": '"v0-gzip"'})
+
+    assert gzipped.status_code == 304
+    assert gzipped.headers["etag"] == '"v1-gzip"'
+    assert identity.status_code == 304
+    assert identity.headers["etag"] == '"v1"'
+    assert stale.status_code == 200
+
+
+def test_etag_helpers_only_rewrite_strong_tags():
+    assert encoded_etag('"abc"', "br") == '"abc-br"'
+    assert encoded_etag('W/"abc"', "gzip") == 'W/"abc"'
+    assert identity_etags('"abc-gzip", W/"def", "ghi-br", *') == '"abc", W/"def", "ghi", *'
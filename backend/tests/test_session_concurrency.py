@@ -0,0 +1,109 @@
+from __future__ import annotations
+
+import asyncio
+import sys
+from pathlib import Path
+
+import pytest
+from sqlalchemy.orm.exc import StaleDataError
+from sqlmodel import SQLModel, Session as SqlSession, create_engine
+
+BASE_DIR = Path(__file__).resolve().parents[1]
+if str(BASE_DIR) not in sys.path:
+    sys.path.insert(0, str(BASE_DIR))
+
+from app.models.session import Session as SessionModel
+from app.models.user import User
+from app.repositories import session_repository
+from app.services import phase3_chat_service, phase3_service
+
+
+def _build_engine(tmp_path: Path):
+    # A file database so every request gets its own connection, as in production.
+    engine = create_engine(f"sqlite:///{tmp_path / 'concurrency.db'}", connect_args={"check_same_thread": False})
+    SQLModel.metadata.create_all(engine)
+    return engine
+
+
+def _create_phase3_session(engine):
+    with SqlSession(engine) as session:
+        user = User(name="Test User")
+        session.add(user)
+        session.commit()
+        session.refresh(user)
+        created, _goal_injected = phase3_service.start_phase3_session(session, int(user.id))
+        return created.id
+
+
+class _InterleavingClient:
+    async def generate(self, _system_prompt: str, message: str) -> str:
+        # Yield so every request reads the row before any of them writes.
+        await asyncio.sleep(0.01)
+        return f"reply to {message}"
+
+
+def test_concurrent_turns_are_all_persisted(tmp_path, monkeypatch):
+    engine = _build_engine(tmp_path)
+    session_id = _create_phase3_session(engine)
+    monkeypatch.setattr(phase3_chat_service, "get_llm_client", lambda *_args, **_kwargs: _InterleavingClient())
+    turns = 5
+    conflicts = 0
+    apply_fields = session_repository._apply_fields
+
+    def _counting_apply_fields(*args, **kwargs):
+        nonlocal conflicts
+        try:
+            return apply_fields(*args, **kwargs)
+        except StaleDataError:
+            conflicts += 1
+            raise
+
+    monkeypatch.setattr(session_repository, "_apply_fields", _counting_apply_fields)
+
+    async def _turn(index: int):
+        with SqlSession(engine) as session:
+            # Bypasses the per-session turn lock of append_phase3_turn so the writes really race
+            # (as they do across worker processes) and exercise the compare-and-swap retry.
+            return await phase3_chat_service._append_phase3_turn(session, session_id, f"message {index}")
+
+    async def _run():
+        return await asyncio.gather(*(_turn(index) for index in range(turns)))
+
+    monkeypatch.setattr(phase3_chat_service.app_config, "SESSION_WRITE_MAX_ATTEMPTS", turns)
+    results = asyncio.run(_run())
+
+    with SqlSession(engine) as session:
+        stored = session.get(SessionModel, session_id)
+        assert stored is not None
+        log = stored.log_json
+        assert len(log) == 1 + 2 * turns
+        user_messages = sorted(entry["content"] for entry in log if entry.get("role") == "user")
+        assert user_messages == sorted(f"message {index}" for index in range(turns))
+        assert stored.meta_data["turn_count"] == turns
+        assert len(stored.meta_data["llm_usage"]) == turns
+        assert stored.version == 1 + turns
+
+    assert sorted(turn_index for _reply, turn_index, _emergency in results) == list(range(2, 2 + 2 * turns, 2))
+    assert conflicts >= 1, "no write conflicted, so the retry path was not exercised"
+
+
+def test_update_session_with_retry_raises_after_exhausting_attempts(tmp_path):
+    engine = _build_engine(tmp_path)
+    session_id = _create_phase3_session(engine)
+
+    with SqlSession(engine) as session, SqlSession(engine) as other:
+
+        def _conflicting_fields(current: SessionModel) -> dict:
+            # Another writer commits between this read and the flush on every attempt.
+            competitor = other.get(SessionModel, session_id)
+            competitor.report_draft = f"draft v{competitor.version}"
+            other.commit()
+            return {"report_final": "final"}
+
+        with pytest.raises(session_repository.SessionConflictError):
+            session_repository.update_session_with_retry(session, session_id, _conflicting_fields, max_attempts=2)
+
+    with SqlSession(engine) as session:
+        stored = session.get(SessionModel, session_id)
+        assert stored.report_final is None
+        assert stored.version == 3
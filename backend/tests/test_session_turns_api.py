@@ -0,0 +1,142 @@
+from __future__ import annotations
+
+import sys
+from pathlib import Path
+from uuid import uuid4
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy.pool import StaticPool
+from sqlmodel import SQLModel, Session as SqlSession, create_engine
+
+BASE_DIR = Path(__file__).resolve().parents[1]
+if str(BASE_DIR) not in sys.path:
+    sys.path.insert(0, str(BASE_DIR))
+
+from app.api.phase1_router import router as phase1_router
+from app.api.phase3_router import router as phase3_router
+from app.core import config as app_config
+from app.core.db import get_session
+from app.models.session import Session as SessionModel
+from app.models.user import User
+from app.services import phase3_service
+
+
+def _build_test_app():
+    engine = create_engine(
+        "sqlite://",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    )
+    SQLModel.metadata.create_all(engine)
+
+    app = FastAPI()
+    app.include_router(phase1_router)
+    app.include_router(phase3_router)
+
+    def _override_get_session():
+        with SqlSession(engine) as session:
+            yield session
+
+    app.dependency_overrides[get_session] = _override_get_session
+    return app, engine
+
+
+def _create_session_with_turns(engine, turns: int):
+    with SqlSession(engine) as session:
+        user = User(name="Test User")
+        session.add(user)
+        session.commit()
+        session.refresh(user)
+        created, _goal_injected = phase3_service.start_phase3_session(session, int(user.id))
+        log_json = list(created.log_json)
+        for turn in range(turns):
+            log_json.append({"role": "user", "content": f"user {turn}"})
+            log_json.append({"role": "assistant", "content": f"assistant {turn}"})
+        created.log_json = log_json
+        session.add(created)
+        session.commit()
+        return created.id
+
+
+def _append_turn(engine, session_id, text: str) -> None:
+    with SqlSession(engine) as session:
+        row = session.get(SessionModel, session_id)
+        row.log_json = [*row.log_json, {"role": "user", "content": text}]
+        session.add(row)
+        session.commit()
+
+
+def test_tail_page_returns_latest_entries():
+    app, engine = _build_test_app()
+    session_id = _create_session_with_turns(engine, turns=5)
+    client = TestClient(app)
+
+    response = client.get(f"/api/v1/phase3/session/{session_id}/turns", params={"limit": 4})
+
+    assert response.status_code == 200
+    data = response.json()
+    assert [item["index"] for item in data["items"]] == [7, 8, 9, 10]
+    assert data["items"][-1] == {"index": 10, "role": "assistant", "content": "assistant 4"}
+    assert data["has_earlier"] is True
+    assert data["has_more"] is False
+    assert response.headers["etag"].startswith('"')
+
+
+def test_after_page_skips_system_prompt_and_reports_more():
+    app, engine = _build_test_app()
+    session_id = _create_session_with_turns(engine, turns=5)
+    client = TestClient(app)
+    url = f"/api/v1/phase3/session/{session_id}/turns"
+
+    first = client.get(url, params={"after": 0, "limit": 3}).json()
+    second = client.get(url, params={"after": 3, "limit": 3}).json()
+    last = client.get(url, params={"after": 9, "limit": 3}).json()
+
+    assert [item["index"] for item in first["items"]] == [1, 2, 3]
+    assert first["items"][0] == {"index": 1, "role": "user", "content": "user 0"}
+    assert first["has_more"] is True and first["has_earlier"] is False
+    assert [item["index"] for item in second["items"]] == [4, 5, 6]
+    assert [item["index"] for item in last["items"]] == [10]
+    assert last["has_more"] is False
+
+
+def test_if_none_match_revalidates_until_the_session_changes():
+    app, engine = _build_test_app()
+    session_id = _create_session_with_turns(engine, turns=2)
+    client = TestClient(app)
+    url = f"/api/v1/phase3/session/{session_id}/turns"
+
+    first = client.get(url)
+    etag = first.headers["etag"]
+    cached = client.get(url, headers={"If-None-Match": etag})
+    _append_turn(engine, session_id, "new message")
+    changed = client.get(url, headers={"If-None-Match": etag})
+
+    assert cached.status_code == 304
+    assert cached.headers["etag"] == etag
+    assert changed.status_code == 200
+    assert changed.headers["etag"] != etag
+    assert changed.json()["items"][-1]["content"] == "new message"
+
+
+def test_compressed_logs_are_sliced_in_python(monkeypatch):
+    monkeypatch.setattr(app_config, "DB_COMPRESSION", "zlib")
+    monkeypatch.setattr(app_config, "DB_COMPRESSION_MIN_BYTES", 0)
+    app, engine = _build_test_app()
+    session_id = _create_session_with_turns(engine, turns=5)
+    client = TestClient(app)
+
+    data = client.get(f"/api/v1/phase3/session/{session_id}/turns", params={"after": 2, "limit": 2}).json()
+
+    assert [item["content"] for item in data["items"]] == ["user 1", "assistant 1"]
+    assert data["has_more"] is True
+
+
+def test_turns_not_found_and_phase_mismatch():
+    app, engine = _build_test_app()
+    session_id = _create_session_with_turns(engine, turns=1)
+    client = TestClient(app)
+
+    assert client.get(f"/api/v1/phase3/session/{uuid4()}/turns").status_code == 404
+    assert client.get(f"/api/v1/phase1/session/{session_id}/turns").status_code == 400
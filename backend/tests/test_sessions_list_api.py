@@ -0,0 +1,164 @@
+from __future__ import annotations
+
+import sys
+from datetime import date, datetime, timedelta
+from pathlib import Path
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import event
+from sqlalchemy.pool import StaticPool
+from sqlmodel import SQLModel, Session as SqlSession, create_engine
+
+BASE_DIR = Path(__file__).resolve().parents[1]
+if str(BASE_DIR) not in sys.path:
+    sys.path.insert(0, str(BASE_DIR))
+
+from app.api.phase1_router import router as phase1_router
+from app.api.sessions_router import router as sessions_router
+from app.core.db import get_session
+from app.models.session import Session as SessionModel
+from app.models.user import User
+
+
+def _build_test_app():
+    engine = create_engine(
+        "sqlite://",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    )
+    SQLModel.metadata.create_all(engine)
+
+    app = FastAPI()
+    app.include_router(phase1_router)
+    app.include_router(sessions_router)
+
+    def _override_get_session():
+        with SqlSession(engine) as session:
+            yield session
+
+    app.dependency_overrides[get_session] = _override_get_session
+    return app, engine
+
+
+def _create_user(engine) -> int:
+    with SqlSession(engine) as session:
+        user = User(name="Test User")
+        session.add(user)
+        session.commit()
+        session.refresh(user)
+        return int(user.id)
+
+
+def _seed_sessions(engine, user_id: int, count: int) -> list[str]:
+    """Insert sessions two per day with legacy logs (no meta turn_count); return ids newest first."""
+
+    base = datetime(2026, 3, 1, 9, 0, 0)
+    created: list[SessionModel] = []
+    with SqlSession(engine) as session:
+        for index in range(count):
+            row = SessionModel(
+                user_id=user_id,
+                phase=3 if index % 2 else 1,
+                session_date=date(2026, 3, 1) + timedelta(days=index // 2),
+                log_json=[{"role": "system", "content": "p"}] + [{"role": "user", "content": "u"}] * (index % 3),
+                report_draft="draft" if index % 2 else None,
+                meta_data={},
+                created_at=base + timedelta(minutes=index),
+            )
+            session.add(row)
+            created.append(row)
+        session.commit()
+        ordered = sorted(created, key=lambda row: (row.session_date, row.created_at, row.id.hex), reverse=True)
+        return [str(row.id) for row in ordered]
+
+
+def test_list_sessions_pages_with_keyset_cursor():
+    app, engine = _build_test_app()
+    user_id = _create_user(engine)
+    other_user_id = _create_user(engine)
+    expected_ids = _seed_sessions(engine, user_id, 7)
+    _seed_sessions(engine, other_user_id, 2)
+    client = TestClient(app)
+
+    seen: list[str] = []
+    cursor = None
+    pages = 0
+    while True:
+        params = {"user_id": user_id, "limit": 3}
+        if cursor:
+            params["cursor"] = cursor
+        response = client.get("/api/v1/sessions", params=params)
+        assert response.status_code == 200
+        data = response.json()
+        seen.extend(item["id"] for item in data["items"])
+        pages += 1
+        cursor = data["next_cursor"]
+        if cursor is None:
+            break
+
+    assert pages == 3
+    assert seen == expected_ids
+
+    first = client.get("/api/v1/sessions", params={"user_id": user_id, "limit": 1}).json()["items"][0]
+    assert set(first) == {"id", "phase", "session_date", "created_at", "has_draft", "has_final", "turn_count"}
+    assert first["phase"] == 1
+    assert first["has_draft"] is False
+    assert first["has_final"] is False
+    assert first["turn_count"] == 0
+
+
+def test_list_sessions_filters_phase_and_uses_meta_turn_count():
+    app, engine = _build_test_app()
+    user_id = _create_user(engine)
+    _seed_sessions(engine, user_id, 4)
+    client = TestClient(app)
+
+    session_id = client.post("/api/v1/phase1/session", json={"user_id": user_id}).json()["session_id"]
+    assert client.post(f"/api/v1/phase1/session/{session_id}/turn", json={"message": "一つ目"}).status_code == 200
+
+    statements: list[str] = []
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _record(_conn, _cursor, statement, *_args):
+        statements.append(statement)
+
+    data = client.get("/api/v1/sessions", params={"user_id": user_id, "phase": 1}).json()
+    assert [item["phase"] for item in data["items"]] == [1, 1, 1]
+    newest = next(item for item in data["items"] if item["id"] == session_id)
+    assert newest["turn_count"] == 1
+
+    statements.clear()
+    data = client.get("/api/v1/sessions", params={"user_id": user_id, "phase": 1, "limit": 1}).json()
+    assert data["items"][0]["id"] == session_id
+    assert len(statements) == 1
+    assert "log_json" not in statements[0]
+
+
+def test_list_sessions_etag_returns_304_until_data_changes():
+    app, engine = _build_test_app()
+    user_id = _create_user(engine)
+    _seed_sessions(engine, user_id, 2)
+    client = TestClient(app)
+
+    first = client.get("/api/v1/sessions", params={"user_id": user_id})
+    etag = first.headers["ETag"]
+    assert etag.startswith('W/"')
+
+    cached = client.get("/api/v1/sessions", params={"user_id": user_id}, headers={"If-None-Match": etag})
+    assert cached.status_code == 304
+    assert cached.content == b""
+
+    client.post("/api/v1/phase1/session", json={"user_id": user_id})
+    changed = client.get("/api/v1/sessions", params={"user_id": user_id}, headers={"If-None-Match": etag})
+    assert changed.status_code == 200
+    assert changed.headers["ETag"] != etag
+
+
+def test_list_sessions_rejects_invalid_cursor():
+    app, engine = _build_test_app()
+    user_id = _create_user(engine)
+    client = TestClient(app)
+
+    response = client.get("/api/v1/sessions", params={"user_id": user_id, "cursor": "not-a-cursor"})
+    assert response.status_code == 400
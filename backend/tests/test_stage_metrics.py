@@ -0,0 +1,143 @@
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import sys
+from pathlib import Path
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy.pool import StaticPool
+from sqlmodel import SQLModel, Session as SqlSession, create_engine
+
+BASE_DIR = Path(__file__).resolve().parents[1]
+if str(BASE_DIR) not in sys.path:
+    sys.path.insert(0, str(BASE_DIR))
+
+from app.api.metrics_router import router as metrics_router
+from app.api.phase1_router import router as phase1_router
+from app.core import config as app_config
+from app.core.db import get_session
+from app.models.session import Session as SessionModel
+from app.models.user import User
+from app.services import phase1_chat_service, phase1_service
+from app.utils.stage_timer import StageHistograms, StageTimer, render_stage_histograms
+
+
+def _build_test_app():
+    engine = create_engine(
+        "sqlite://",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    )
+    SQLModel.metadata.create_all(engine)
+
+    app = FastAPI()
+    app.include_router(phase1_router)
+    app.include_router(metrics_router)
+
+    def _override_get_session():
+        with SqlSession(engine) as session:
+            yield session
+
+    app.dependency_overrides[get_session] = _override_get_session
+    return app, engine
+
+
+def _create_phase1_session(engine):
+    with SqlSession(engine) as session:
+        user = User(name="Test User")
+        session.add(user)
+        session.commit()
+        session.refresh(user)
+        created = phase1_service.start_phase1_session(session, int(user.id))
+        return created.id
+
+
+def test_stage_timer_renders_cumulative_buckets():
+    histograms = StageHistograms()
+    timer = StageTimer("demo", histograms=histograms)
+    timer.record("llm", 0.2)
+    timer.record("llm", 3.0)
+
+    body = render_stage_histograms(histograms)
+
+    assert 't2ai_stage_duration_seconds_bucket{pipeline="demo",stage="llm",le="0.25"} 1' in body
+    assert 't2ai_stage_duration_seconds_bucket{pipeline="demo",stage="llm",le="+Inf"} 2' in body
+    assert 't2ai_stage_duration_seconds_count{pipeline="demo",stage="llm"} 2' in body
+    assert timer.timings_ms() == {"llm": 3200.0}
+
+
+def test_metrics_exposes_phase1_turn_stages():
+    app, engine = _build_test_app()
+    session_id = _create_phase1_session(engine)
+    client = TestClient(app)
+
+    response = client.post(
+        f"/api/v1/phase1/session/{session_id}/turn",
+        json={"message": "今日はチームの目標を整理しました"},
+    )
+    assert response.status_code == 200
+
+    metrics = client.get("/metrics")
+    assert metrics.status_code == 200
+    assert metrics.headers["content-type"].startswith("text/plain")
+    for stage in ("load", "safety", "prompt", "llm", "llm_queue", "commit"):
+        assert f'pipeline="phase1_turn",stage="{stage}"' in metrics.text
+    assert "t2ai_llm_in_flight 0" in metrics.text
+
+
+def test_stage_timings_written_to_meta_when_enabled(monkeypatch):
+    monkeypatch.setattr(app_config, "STAGE_TIMINGS_IN_META", True)
+    monkeypatch.setattr(app_config, "STAGE_TIMINGS_MAX_ENTRIES", 1)
+    app, engine = _build_test_app()
+    session_id = _create_phase1_session(engine)
+    client = TestClient(app)
+
+    for message in ("一つ目", "二つ目"):
+        response = client.post(
+            f"/api/v1/phase1/session/{session_id}/turn",
+            json={"message": message},
+        )
+        assert response.status_code == 200
+
+    with SqlSession(engine) as session:
+        updated = session.get(SessionModel, session_id)
+        assert updated is not None
+        entries = updated.meta_data["stage_timings"]
+
+    assert len(entries) == 1
+    assert entries[0]["pipeline"] == "phase1_turn"
+    assert entries[0]["turn_index"] == response.json()["turn_index"]
+    assert set(entries[0]["stages_ms"]) >= {"load", "safety", "prompt", "llm", "llm_queue"}
+
+
+class _Ticket:
+    wait_seconds = 0.2
+
+    def record_completion(self, _text: str) -> None:
+        pass
+
+
+class _SlowAdmissionScheduler:
+    @contextlib.asynccontextmanager
+    async def slot(self, **_kwargs):
+        await asyncio.sleep(_Ticket.wait_seconds)
+        yield _Ticket()
+
+
+def test_llm_stage_excludes_scheduler_queue_wait(monkeypatch):
+    monkeypatch.setattr(app_config, "STAGE_TIMINGS_IN_META", True)
+    monkeypatch.setattr(phase1_chat_service, "get_llm_scheduler", lambda: _SlowAdmissionScheduler())
+    app, engine = _build_test_app()
+    session_id = _create_phase1_session(engine)
+    client = TestClient(app)
+
+    response = client.post(f"/api/v1/phase1/session/{session_id}/turn", json={"message": "一つ目"})
+    assert response.status_code == 200
+
+    with SqlSession(engine) as session:
+        stages_ms = session.get(SessionModel, session_id).meta_data["stage_timings"][-1]["stages_ms"]
+
+    assert stages_ms["llm_queue"] == 200.0
+    assert stages_ms["llm"] < 100.0
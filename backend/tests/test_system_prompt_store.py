@@ -0,0 +1,131 @@
+from __future__ import annotations
+
+import sys
+from pathlib import Path
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import event
+from sqlalchemy.pool import StaticPool
+from sqlmodel import SQLModel, Session as SqlSession, create_engine, select
+
+BASE_DIR = Path(__file__).resolve().parents[1]
+if str(BASE_DIR) not in sys.path:
+    sys.path.insert(0, str(BASE_DIR))
+
+from app.api.phase3_router import router as phase3_router
+from app.core import config as app_config
+from app.core.db import get_session
+from app.models.session import Session as SessionModel
+from app.models.system_prompt import SystemPrompt
+from app.models.user import User
+from app.services import phase3_chat_service, phase3_service, system_prompt_store
+
+
+def _build_test_app():
+    engine = create_engine(
+        "sqlite://",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    )
+    SQLModel.metadata.create_all(engine)
+
+    app = FastAPI()
+    app.include_router(phase3_router)
+
+    def _override_get_session():
+        with SqlSession(engine) as session:
+            yield session
+
+    app.dependency_overrides[get_session] = _override_get_session
+    return app, engine
+
+
+def _create_user(engine) -> int:
+    with SqlSession(engine) as session:
+        user = User(name="Test User")
+        session.add(user)
+        session.commit()
+        session.refresh(user)
+        return int(user.id)
+
+
+def _record_prompt_selects(engine) -> list[str]:
+    statements: list[str] = []
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _record(_conn, _cursor, statement, *_args):
+        if statement.lstrip().upper().startswith("SELECT") and "FROM system_prompts" in statement:
+            statements.append(statement)
+
+    return statements
+
+
+def test_sessions_share_one_stored_prompt():
+    app, engine = _build_test_app()
+    user_id = _create_user(engine)
+    client = TestClient(app)
+
+    for _ in range(3):
+        assert client.post("/api/v1/phase3/session", json={"user_id": user_id}).status_code == 200
+
+    with SqlSession(engine) as session:
+        prompts = session.exec(select(SystemPrompt)).all()
+        assert len(prompts) == 1
+        for row in session.exec(select(SessionModel)):
+            assert row.log_json == [system_prompt_store.system_prompt_entry(prompts[0].prompt_hash)]
+            assert row.meta_data["prompt_hash"] == prompts[0].prompt_hash
+
+
+def test_turn_resolves_prompt_from_cache(monkeypatch):
+    app, engine = _build_test_app()
+    user_id = _create_user(engine)
+    client = TestClient(app)
+    seen_prompts: list[str] = []
+
+    class _StubClient:
+        async def generate(self, system_prompt: str, _message: str) -> str:
+            seen_prompts.append(system_prompt)
+            return "ok"
+
+    monkeypatch.setattr(phase3_chat_service, "get_llm_client", lambda _config: _StubClient())
+
+    with SqlSession(engine) as session:
+        created, _goal_injected = phase3_service.start_phase3_session(session, user_id)
+        session_id = created.id
+        expected = system_prompt_store.extract_system_prompt(session, created.log_json)
+
+    selects = _record_prompt_selects(engine)
+    for message in ("一つ目", "二つ目"):
+        response = client.post(f"/api/v1/phase3/session/{session_id}/turn", json={"message": message})
+        assert response.status_code == 200
+
+    assert seen_prompts == [expected, expected]
+    assert selects == []
+
+
+def test_prompt_is_loaded_from_database_after_eviction(monkeypatch):
+    monkeypatch.setattr(app_config, "SYSTEM_PROMPT_CACHE_SIZE", 1)
+    _app, engine = _build_test_app()
+    selects = _record_prompt_selects(engine)
+
+    with SqlSession(engine) as session:
+        first = system_prompt_store.store_system_prompt(session, "first prompt")
+        system_prompt_store.store_system_prompt(session, "second prompt")
+        session.commit()
+        assert selects == []
+
+        assert system_prompt_store.resolve_system_prompt(session, first) == "first prompt"
+        assert len(selects) == 1
+        assert system_prompt_store.resolve_system_prompt(session, first) == "first prompt"
+        assert len(selects) == 1
+        assert system_prompt_store.resolve_system_prompt(session, "0" * 64) is None
+
+
+def test_inline_legacy_prompt_is_still_extracted():
+    _app, engine = _build_test_app()
+    with SqlSession(engine) as session:
+        log_json = [{"role": "system", "content": "legacy prompt"}, {"role": "user", "content": "hi"}]
+        assert system_prompt_store.extract_system_prompt(session, log_json) == "legacy prompt"
+        assert system_prompt_store.extract_system_prompt(session, [{"role": "user", "content": "hi"}]) is None
+        assert system_prompt_store.extract_system_prompt(session, []) is None
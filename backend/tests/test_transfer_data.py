@@ -0,0 +1,147 @@
+from __future__ import annotations
+
+import json
+import sys
+from datetime import date
+from pathlib import Path
+
+import pytest
+from sqlmodel import SQLModel, Session as SqlSession, create_engine, select
+
+BASE_DIR = Path(__file__).resolve().parents[1]
+if str(BASE_DIR) not in sys.path:
+    sys.path.insert(0, str(BASE_DIR))
+
+from app.models.goal import Goal
+from app.models.session import Session as SessionModel
+from app.models.user import User
+from app.services import system_prompt_store
+from scripts import transfer_data
+
+
+def _seed_db(path: Path) -> None:
+    engine = create_engine(f"sqlite:///{path}")
+    SQLModel.metadata.create_all(engine)
+    with SqlSession(engine) as session:
+        users = [User(name=f"user-{index}") for index in range(3)]
+        session.add_all(users)
+        session.flush()
+        prompt_hash = system_prompt_store.store_system_prompt(session, "プロンプト")
+        for user in users:
+            session.add(Goal(user_id=user.id, content=f"goal {user.id}", version=1, is_active=True))
+            for day in range(3):
+                session.add(
+                    SessionModel(
+                        user_id=user.id,
+                        session_date=date(2026, 2, day + 1),
+                        phase=3,
+                        log_json=[
+                            system_prompt_store.system_prompt_entry(prompt_hash),
+                            {"role": "user", "content": str(day)},
+                        ],
+                        report_final=None if day else "done",
+                        meta_data={"prompt_hash": "abc", "turn": day},
+                    )
+                )
+        session.commit()
+    engine.dispose()
+
+
+def _dump(path: Path) -> dict:
+    engine = create_engine(f"sqlite:///{path}")
+    with SqlSession(engine) as session:
+        dump = {
+            "users": sorted((user.id, user.name, user.created_at) for user in session.exec(select(User))),
+            "goals": sorted(
+                (goal.id, goal.user_id, goal.content, goal.version, goal.is_active)
+                for goal in session.exec(select(Goal))
+            ),
+            "system_prompts": [
+                system_prompt_store.resolve_system_prompt(session, row.log_json[0]["prompt_hash"])
+                for row in session.exec(select(SessionModel))
+            ],
+            "sessions": sorted(
+                (
+                    str(row.id),
+                    row.user_id,
+                    row.session_date,
+                    json.dumps(row.log_json),
+                    row.report_final,
+                    json.dumps(row.meta_data),
+                )
+                for row in session.exec(select(SessionModel))
+            ),
+        }
+    engine.dispose()
+    return dump
+
+
+@pytest.mark.parametrize("fmt", ["ndjson", "columnar"])
+def test_export_import_round_trip(tmp_path, fmt):
+    source = tmp_path / "source.db"
+    target = tmp_path / "target.db"
+    export_dir = tmp_path / "export"
+    _seed_db(source)
+
+    exported = transfer_data.main(
+        ["export", "--db", str(source), "--out", str(export_dir), "--format", fmt, "--chunk-size", "2"]
+    )
+    assert exported["rows"] == {"users": 3, "goals": 3, "system_prompts": 1, "sessions": 9}
+
+    imported = transfer_data.main(
+        ["import", "--db", str(target), "--input", str(export_dir), "--create-tables", "--chunk-size", "4"]
+    )
+    assert imported["rows"] == {"users": 3, "goals": 3, "system_prompts": 1, "sessions": 9}
+    assert _dump(target) == _dump(source)
+
+
+@pytest.mark.parametrize("fmt", ["ndjson", "columnar"])
+def test_export_resumes_after_interrupted_chunk(tmp_path, fmt):
+    source = tmp_path / "source.db"
+    _seed_db(source)
+    full_dir = tmp_path / "full"
+    transfer_data.main(["export", "--db", str(source), "--out", str(full_dir), "--format", fmt, "--chunk-size", "4"])
+
+    resumed_dir = tmp_path / "resumed"
+    args = ["export", "--db", str(source), "--out", str(resumed_dir), "--format", fmt, "--chunk-size", "4"]
+    transfer_data.main(args + ["--tables", "users,goals"])
+    # Simulate a crash mid-way through sessions: one chunk recorded, garbage after it.
+    transfer_data.main(args)
+    manifest_path = resumed_dir / "manifest.json"
+    manifest = json.loads(manifest_path.read_text(encoding="utf-8"))
+    sessions_file = resumed_dir / manifest["tables"]["sessions"]["file"]
+    first_chunk = list(
+        transfer_data._iter_ndjson(sessions_file, 0, 4)
+        if fmt == "ndjson"
+        else transfer_data._iter_columnar(sessions_file, 0)
+    )[0]
+    rows, offset = first_chunk
+    manifest["tables"]["sessions"].update(
+        {"rows": len(rows), "last_key": rows[-1]["id"], "offset": offset, "done": False}
+    )
+    manifest_path.write_text(json.dumps(manifest), encoding="utf-8")
+    with sessions_file.open("r+b") as handle:
+        handle.truncate(offset)
+        handle.seek(offset)
+        handle.write(b"partial garbage")
+
+    summary = transfer_data.main(args)
+
+    assert summary["rows"]["sessions"] == 9
+    assert sessions_file.read_bytes() == (full_dir / sessions_file.name).read_bytes()
+
+
+def test_import_rerun_skips_already_imported_rows(tmp_path):
+    source = tmp_path / "source.db"
+    target = tmp_path / "target.db"
+    export_dir = tmp_path / "export"
+    _seed_db(source)
+    transfer_data.main(["export", "--db", str(source), "--out", str(export_dir)])
+    import_args = ["import", "--db", str(target), "--input", str(export_dir), "--create-tables"]
+    transfer_data.main(import_args)
+
+    # Losing the checkpoint re-reads everything; conflicts are skipped, not duplicated.
+    (export_dir / "import_checkpoint.json").unlink()
+    transfer_data.main(import_args)
+
+    assert _dump(target) == _dump(source)
@@ -0,0 +1,170 @@
+from __future__ import annotations
+
+import asyncio
+import gc
+import sys
+from pathlib import Path
+from uuid import uuid4
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy.pool import StaticPool
+from sqlmodel import SQLModel, Session as SqlSession, create_engine
+
+BASE_DIR = Path(__file__).resolve().parents[1]
+if str(BASE_DIR) not in sys.path:
+    sys.path.insert(0, str(BASE_DIR))
+
+from app.api.phase3_router import router as phase3_router
+from app.core.db import get_session
+from app.models.session import Session as SessionModel
+from app.models.user import User
+from app.services import phase3_chat_service, phase3_service, turn_coalescer
+
+
+@pytest.fixture(autouse=True)
+def _clear_coalescer():
+    turn_coalescer.clear()
+    yield
+    turn_coalescer.clear()
+
+
+def _build_engine():
+    engine = create_engine(
+        "sqlite://",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    )
+    SQLModel.metadata.create_all(engine)
+    return engine
+
+
+def _create_phase3_session(engine):
+    with SqlSession(engine) as session:
+        user = User(name="Test User")
+        session.add(user)
+        session.commit()
+        session.refresh(user)
+        created, _goal_injected = phase3_service.start_phase3_session(session, int(user.id))
+        return created.id
+
+
+class _CountingClient:
+    def __init__(self) -> None:
+        self.calls = 0
+
+    async def generate(self, _system_prompt: str, message: str) -> str:
+        self.calls += 1
+        await asyncio.sleep(0.01)
+        return f"reply {self.calls} to {message}"
+
+
+def _stored_log(engine, session_id):
+    with SqlSession(engine) as session:
+        return session.get(SessionModel, session_id).log_json
+
+
+def test_concurrent_duplicates_share_one_llm_call(monkeypatch):
+    engine = _build_engine()
+    session_id = _create_phase3_session(engine)
+    client = _CountingClient()
+    monkeypatch.setattr(phase3_chat_service, "get_llm_client", lambda *_args, **_kwargs: client)
+
+    async def _turn():
+        with SqlSession(engine) as session:
+            return await phase3_chat_service.append_phase3_turn(session, session_id, "hello", idempotency_key="k1")
+
+    async def _run():
+        return await asyncio.gather(_turn(), _turn(), _turn())
+
+    results = asyncio.run(_run())
+
+    assert client.calls == 1
+    assert results[0] == results[1] == results[2]
+    assert len(_stored_log(engine, session_id)) == 3
+
+
+def test_retry_after_completion_replays_response(monkeypatch):
+    engine = _build_engine()
+    session_id = _create_phase3_session(engine)
+    client = _CountingClient()
+    monkeypatch.setattr(phase3_chat_service, "get_llm_client", lambda *_args, **_kwargs: client)
+
+    async def _turn(message: str, key: str):
+        with SqlSession(engine) as session:
+            return await phase3_chat_service.append_phase3_turn(session, session_id, message, idempotency_key=key)
+
+    first = asyncio.run(_turn("hello", "k1"))
+    retried = asyncio.run(_turn("hello", "k1"))
+    other = asyncio.run(_turn("hello", "k2"))
+
+    assert retried == first
+    assert other != first
+    assert client.calls == 2
+    assert len(_stored_log(engine, session_id)) == 5
+
+
+def test_failed_turn_is_not_replayed(monkeypatch):
+    engine = _build_engine()
+    session_id = _create_phase3_session(engine)
+
+    class _FlakyClient(_CountingClient):
+        async def generate(self, system_prompt: str, message: str) -> str:
+            reply = await super().generate(system_prompt, message)
+            if self.calls == 1:
+                raise ValueError("boom")
+            return reply
+
+    client = _FlakyClient()
+    monkeypatch.setattr(phase3_chat_service, "get_llm_client", lambda *_args, **_kwargs: client)
+
+    async def _turn():
+        with SqlSession(engine) as session:
+            return await phase3_chat_service.append_phase3_turn(session, session_id, "hello", idempotency_key="k1")
+
+    with pytest.raises(phase3_chat_service.LLMGenerateError):
+        asyncio.run(_turn())
+    assistant_message, _turn_index, _emergency = asyncio.run(_turn())
+
+    assert assistant_message == "reply 2 to hello"
+    assert len(_stored_log(engine, session_id)) == 3
+
+
+def test_session_locks_are_released_when_unused():
+    session_id = uuid4()
+
+    async def _hold():
+        async with turn_coalescer.session_lock(session_id):
+            assert session_id in turn_coalescer._locks
+
+    asyncio.run(_hold())
+    gc.collect()
+
+    assert session_id not in turn_coalescer._locks
+
+
+def test_idempotency_key_reused_for_other_message_returns_422(monkeypatch):
+    engine = _build_engine()
+    session_id = _create_phase3_session(engine)
+    monkeypatch.setattr(phase3_chat_service, "get_llm_client", lambda *_args, **_kwargs: _CountingClient())
+
+    app = FastAPI()
+    app.include_router(phase3_router)
+
+    def _override_get_session():
+        with SqlSession(engine) as session:
+            yield session
+
+    app.dependency_overrides[get_session] = _override_get_session
+    client = TestClient(app)
+    url = f"/api/v1/phase3/session/{session_id}/turn"
+
+    first = client.post(url, json={"message": "hello"}, headers={"Idempotency-Key": "k1"})
+    replay = client.post(url, json={"message": "hello"}, headers={"Idempotency-Key": "k1"})
+    reused = client.post(url, json={"message": "different"}, headers={"Idempotency-Key": "k1"})
+
+    assert first.status_code == 200
+    assert replay.json() == first.json()
+    assert reused.status_code == 422
+    assert len(_stored_log(engine, session_id)) == 3
@@ -3,7 +3,7 @@ import { useEffect, useRef, useState } from "react";
 import RequestErrorBanner from "../common/RequestErrorBanner";
 import RetryCancelBar from "../common/RetryCancelBar";
 import useRequestController from "../../hooks/useRequestController";
-import { sendPhase1Turn, sendPhase3Turn } from "../../services/chatApi";
+import { fetchSessionTurns, sendPhase1Turn, sendPhase3Turn } from "../../services/chatApi";
 import type { ChatTurn, ChatTurnResponse } from "../../types/chat";
 import ChatInput from "./ChatInput";
 import ChatMessageList from "./ChatMessageList";
@@ -17,13 +17,72 @@ type ChatActionType = "chat_turn";
 
 type ChatPayload = {
     message: string;
+    // Reused by retries so the backend replays the original reply instead of running the turn again.
+    idempotencyKey: string;
 };
 
+// History first, then local messages the loaded page does not already contain.
+function mergeHistory(history: ChatTurn[], current: ChatTurn[]): ChatTurn[] {
+    const loaded = new Set(history.map((turn) => turn.index));
+    return [...history, ...current.filter((turn) => turn.index === undefined || !loaded.has(turn.index))];
+}
+
+// Give the pending user message its log index and append the reply, skipping entries already loaded.
+function recordTurn(current: ChatTurn[], pendingId: string | null, data: ChatTurnResponse): ChatTurn[] {
+    const userIndex = data.turn_index - 1;
+    const known = new Set(current.filter((turn) => turn.id !== pendingId).map((turn) => turn.index));
+    const next = current.flatMap((turn) => {
+        if (turn.id !== pendingId) {
+            return [turn];
+        }
+        return known.has(userIndex) ? [] : [{ ...turn, index: userIndex }];
+    });
+    if (!known.has(data.turn_index)) {
+        next.push({
+            id: `assistant-${data.turn_index}`,
+            role: "assistant",
+            content: data.assistant_message,
+            emergency: data.emergency,
+            index: data.turn_index,
+        });
+    }
+    return next;
+}
+
 export default function ChatPanel({ phase, sessionId }: ChatPanelProps) {
     const [messages, setMessages] = useState<ChatTurn[]>([]);
     const [draftText, setDraftText] = useState("");
     const requestController = useRequestController<ChatActionType, ChatPayload>();
     const listRef = useRef<HTMLDivElement | null>(null);
+    const pendingMessageId = useRef<string | null>(null);
+
+    useEffect(() => {
+        let active = true;
+        // A different session must not show the previous one's messages.
+        setMessages([]);
+        pendingMessageId.current = null;
+        // Reopened sessions only load the tail of the conversation.
+        fetchSessionTurns(phase, sessionId, { limit: 50 })
+            .then((page) => {
+                if (!active) {
+                    return;
+                }
+                const history: ChatTurn[] = page.items.map((item) => ({
+                    id: `${item.role}-${item.index}`,
+                    role: item.role,
+                    content: item.content,
+                    index: item.index,
+                }));
+                // Keep anything sent while the history was loading after it, unless the page already has it.
+                setMessages((prev) => mergeHistory(history, prev));
+            })
+            .catch(() => {
+                // The chat still works without history; new turns are appended as usual.
+            });
+        return () => {
+            active = false;
+        };
+    }, [phase, sessionId]);
 
     useEffect(() => {
         if (listRef.current) {
@@ -37,11 +96,13 @@ export default function ChatPanel({ phase, sessionId }: ChatPanelProps) {
         }
 
         const message = draftText.trim();
+        const messageId = `user-${Date.now()}`;
+        pendingMessageId.current = messageId;
 
         setMessages((prev) => [
             ...prev,
             {
-                id: `user-${Date.now()}`,
+                id: messageId,
                 role: "user",
                 content: message,
             },
@@ -49,21 +110,17 @@ export default function ChatPanel({ phase, sessionId }: ChatPanelProps) {
 
         const result = await requestController.run<ChatTurnResponse>({
             actionType: "chat_turn",
-            payload: { message },
+            payload: { message, idempotencyKey: crypto.randomUUID() },
             requestFn: (payload) =>
-                phase === 1 ? sendPhase1Turn(sessionId, payload.message) : sendPhase3Turn(sessionId, payload.message),
+                phase === 1
+                    ? sendPhase1Turn(sessionId, payload.message, payload.idempotencyKey)
+                    : sendPhase3Turn(sessionId, payload.message, payload.idempotencyKey),
         });
 
         if (result.status === "success") {
-            setMessages((prev) => [
-                ...prev,
-                {
-                    id: `assistant-${result.data.turn_index}-${Date.now()}`,
-                    role: "assistant",
-                    content: result.data.assistant_message,
-                    emergency: result.data.emergency,
-                },
-            ]);
+            const pendingId = pendingMessageId.current;
+            pendingMessageId.current = null;
+            setMessages((prev) => recordTurn(prev, pendingId, result.data));
             setDraftText("");
         }
     };
@@ -75,15 +132,9 @@ export default function ChatPanel({ phase, sessionId }: ChatPanelProps) {
 
         const result = await requestController.retry<ChatTurnResponse>();
         if (result.status === "success") {
-            setMessages((prev) => [
-                ...prev,
-                {
-                    id: `assistant-${result.data.turn_index}-${Date.now()}`,
-                    role: "assistant",
-                    content: result.data.assistant_message,
-                    emergency: result.data.emergency,
-                },
-            ]);
+            const pendingId = pendingMessageId.current;
+            pendingMessageId.current = null;
+            setMessages((prev) => recordTurn(prev, pendingId, result.data));
             setDraftText("");
         }
     };
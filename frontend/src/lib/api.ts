@@ -9,11 +9,11 @@ type ApiErrorInfo = {
 
 export async function request<T>(path: string, init?: RequestInit): Promise<T> {
     const response = await fetch(`${baseUrl}${path}`, {
+        ...init,
         headers: {
             "Content-Type": "application/json",
             ...(init?.headers ?? {}),
         },
-        ...init,
     });
 
     if (!response.ok) {
@@ -1,16 +1,43 @@
 import { request } from "../lib/api";
-import type { ChatTurnResponse } from "../types/chat";
+import type { ChatTurnResponse, SessionTurnsResponse } from "../types/chat";
 
-export async function sendPhase1Turn(sessionId: string, message: string): Promise<ChatTurnResponse> {
+export async function sendPhase1Turn(
+    sessionId: string,
+    message: string,
+    idempotencyKey?: string
+): Promise<ChatTurnResponse> {
     return request<ChatTurnResponse>(`/api/v1/phase1/session/${sessionId}/turn`, {
         method: "POST",
+        headers: idempotencyKey ? { "Idempotency-Key": idempotencyKey } : undefined,
         body: JSON.stringify({ message }),
     });
 }
 
-export async function sendPhase3Turn(sessionId: string, message: string): Promise<ChatTurnResponse> {
+export async function sendPhase3Turn(
+    sessionId: string,
+    message: string,
+    idempotencyKey?: string
+): Promise<ChatTurnResponse> {
     return request<ChatTurnResponse>(`/api/v1/phase3/session/${sessionId}/turn`, {
         method: "POST",
+        headers: idempotencyKey ? { "Idempotency-Key": idempotencyKey } : undefined,
         body: JSON.stringify({ message }),
     });
 }
+
+// Without `after` the latest `limit` entries are returned (the tail shown when reopening a session).
+export async function fetchSessionTurns(
+    phase: 1 | 3,
+    sessionId: string,
+    options: { after?: number; limit?: number } = {}
+): Promise<SessionTurnsResponse> {
+    const params = new URLSearchParams();
+    if (options.after !== undefined) {
+        params.set("after", String(options.after));
+    }
+    if (options.limit !== undefined) {
+        params.set("limit", String(options.limit));
+    }
+    const query = params.toString();
+    return request<SessionTurnsResponse>(`/api/v1/phase${phase}/session/${sessionId}/turns${query ? `?${query}` : ""}`);
+}
@@ -1,12 +1,22 @@
 import { request } from "../lib/api";
-import type { SessionCreateResponse, SessionPhase, SessionSummary } from "../types/session";
+import type { SessionCreateResponse, SessionListResponse, SessionPhase, SessionSummary } from "../types/session";
 
 type ListSessionsParams = {
     userId: number;
+    cursor?: string | null;
 };
 
+export async function fetchSessionPage({ userId, cursor }: ListSessionsParams): Promise<SessionListResponse> {
+    const query = new URLSearchParams({ user_id: String(userId) });
+    if (cursor) {
+        query.set("cursor", cursor);
+    }
+    return request<SessionListResponse>(`/api/v1/sessions?${query.toString()}`);
+}
+
 export async function fetchSessions({ userId }: ListSessionsParams): Promise<SessionSummary[]> {
-    return request<SessionSummary[]>(`/api/v1/sessions?user_id=${userId}`);
+    const page = await fetchSessionPage({ userId });
+    return page.items;
 }
 
 export async function createSession(phase: SessionPhase): Promise<SessionCreateResponse> {
@@ -5,6 +5,8 @@ export type ChatTurn = {
     role: ChatRole;
     content: string;
     emergency?: boolean;
+    // Position in the session log once the turn is committed; unset while a message is pending.
+    index?: number;
 };
 
 export type ChatTurnResponse = {
@@ -13,3 +15,17 @@ export type ChatTurnResponse = {
     turn_index: number;
     emergency: boolean;
 };
+
+export type SessionTurnEntry = {
+    index: number;
+    role: ChatRole;
+    content: string;
+};
+
+export type SessionTurnsResponse = {
+    session_id: string;
+    phase: number;
+    items: SessionTurnEntry[];
+    has_more: boolean;
+    has_earlier: boolean;
+};
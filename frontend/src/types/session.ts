@@ -4,6 +4,16 @@ export type SessionSummary = {
     id: string;
     phase: SessionPhase;
     session_date: string;
+    created_at: string;
+    has_draft: boolean;
+    has_final: boolean;
+    turn_count: number;
+};
+
+export type SessionListResponse = {
+    user_id: number;
+    items: SessionSummary[];
+    next_cursor: string | null;
 };
 
 export type SessionCreateResponse = {